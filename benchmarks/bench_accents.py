@@ -0,0 +1,58 @@
+"""
+This file contains a benchmark for remove_accents and remove_non_ascii on large texts.
+
+The per char implementations they used to have are kept here as reference.
+
+Run it from the root of the repository:
+
+>>> python -m benchmarks.bench_accents
+"""
+
+# Importing the required libraries
+import random
+import timeit
+import src.utils.string.process as stpr
+
+REPEAT = 5
+
+def remove_accents_per_char(input_string: str) -> str:
+    """
+    Previous implementation of remove_accents.
+    """
+    return "".join([stpr.ACCENTS_MAP.get(char, char) for char in input_string])
+
+def remove_non_ascii_per_char(input_string: str) -> str:
+    """
+    Previous implementation of remove_non_ascii.
+    """
+    return "".join(i for i in input_string if ord(i) < 128)
+
+WORDS = ('el camión llegó tarde a la estación de autobuses porque había mucho tráfico '
+         'en la ciudad y nadie sabía qué hacer').split()
+
+def build_text(size: int, extra_words: tuple = ()) -> str:
+    """
+    Builds a random spanish text of (about) the given number of chars.
+    """
+    random.seed(size)
+    words = WORDS + list(extra_words)
+    text = ' '.join(random.choice(words) for _ in range(size // 6))
+    return text[:size]
+
+if __name__ == '__main__':
+    texts = {
+        'latin-1 text': build_text(4 * 1024 * 1024),
+        'mixed text': build_text(4 * 1024 * 1024, ('ŝȩp', 'ﬁve', '你好')),
+    }
+    for text_name, text in texts.items():
+        cases = {
+            'remove_accents (per char)': lambda: remove_accents_per_char(text),
+            'remove_accents': lambda: stpr.remove_accents(text),
+            'remove_accents (unicode)': lambda: stpr.remove_accents(text, unicode=True),
+            'remove_non_ascii (per char)': lambda: remove_non_ascii_per_char(text),
+            'remove_non_ascii': lambda: stpr.remove_non_ascii(text),
+        }
+        print('{} ({} chars)'.format(text_name, len(text)))
+        for name, case in cases.items():
+            elapsed = min(timeit.repeat(case, number=1, repeat=REPEAT))
+            print('    {:<30} {:8.4f} s'.format(name, elapsed))
@@ -0,0 +1,55 @@
+"""
+This file contains a benchmark for appending many lines to a file with file.process.append,
+compared with an Appender.
+
+The file is written in a temporary directory, give another directory to test
+a different filesystem or disk:
+
+>>> python -m benchmarks.bench_append
+>>> python -m benchmarks.bench_append /mnt/data
+"""
+
+# Importing the required libraries
+import os
+import sys
+import tempfile
+import time
+import src.utils.file.process as flpr
+
+LINES = 20000
+LINE = '2023-01-01 00:00:00 INFO Something happened in the application\n'
+
+def with_append(path: str) -> None:
+    """
+    Appends the lines calling append for each one.
+    """
+    for _ in range(LINES):
+        flpr.append(path, LINE)
+
+def with_appender(path: str, **kwargs) -> None:
+    """
+    Appends the lines with an Appender.
+    """
+    with flpr.Appender(path, **kwargs) as appender:
+        for _ in range(LINES):
+            appender.write(LINE)
+
+if __name__ == '__main__':
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    with tempfile.TemporaryDirectory(dir=directory) as root:
+        path = os.path.join(root, 'file.log')
+        cases = {
+            'append': lambda: with_append(path),
+            'Appender': lambda: with_appender(path),
+            'Appender (flush every 10 ms)': lambda: with_appender(path, flush_interval=0.01),
+            'Appender (4 KiB buffer)': lambda: with_appender(path, buffer_size=4096),
+            'Appender (fdatasync)': lambda: with_appender(path, durability='fdatasync'),
+        }
+        print('{} lines of {} chars'.format(LINES, len(LINE)))
+        for name, case in cases.items():
+            flpr.create(path)
+            start = time.perf_counter()
+            case()
+            elapsed = time.perf_counter() - start
+            flpr.delete(path)
+            print('    {:<30} {:8.4f} s {:12.0f} lines/s'.format(name, elapsed, LINES / elapsed))
@@ -0,0 +1,77 @@
+"""
+This file contains a benchmark for BusinessCalendar, compared with counting and adding
+business days walking day by day.
+
+Run it from the root of the repository (optionally with the number of date pairs, 1000000 by default):
+
+>>> python -m benchmarks.bench_business_days
+>>> python -m benchmarks.bench_business_days 100000
+"""
+
+# Importing the required libraries
+import random
+import sys
+import time
+from datetime import date, timedelta
+import numpy as np
+from src.utils.datetime.process import BusinessCalendar
+
+COUNT = 1000000
+# The day by day functions only run on the first pairs, their time is scaled to all the pairs
+LOOP_COUNT = 10000
+
+HOLIDAYS = [date(year, month, day) for year in range(2000, 2051)
+            for month, day in ((1, 1), (5, 1), (8, 15), (10, 12), (11, 1), (12, 6), (12, 8), (12, 25))]
+
+def count_loop(start: date, end: date, holidays: set) -> int:
+    """
+    Counts the business days walking from start to end.
+    """
+    count, day = 0, start
+    while day < end:
+        if day.weekday() < 5 and day not in holidays:
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+def add_loop(day: date, days: int, holidays: set) -> date:
+    """
+    Adds business days walking day by day.
+    """
+    while day.weekday() >= 5 or day in holidays:
+        day += timedelta(days=1)
+    while days > 0:
+        day += timedelta(days=1)
+        if day.weekday() < 5 and day not in holidays:
+            days -= 1
+    return day
+
+def timed(name: str, function, scale: float = 1) -> None:
+    """
+    Prints the time of the function.
+    """
+    start = time.perf_counter()
+    function()
+    print('    {:<30} {:8.4f} s'.format(name, (time.perf_counter() - start) * scale))
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    random.seed(count)
+    starts = [date(2000, 1, 1) + timedelta(days=random.randint(0, 40 * 365)) for _ in range(count)]
+    ends = [start + timedelta(days=random.randint(0, 3 * 365)) for start in starts]
+    counts = [random.randint(0, 500) for _ in range(count)]
+    holidays = set(HOLIDAYS)
+    calendar = BusinessCalendar(HOLIDAYS)
+    starts64, ends64 = np.array(starts, dtype='datetime64[D]'), np.array(ends, dtype='datetime64[D]')
+    scale = count / min(count, LOOP_COUNT)
+    print('{} pairs, {} holidays'.format(count, len(HOLIDAYS)))
+    print('count')
+    timed('day by day (scaled)', lambda: [count_loop(start, end, holidays)
+                                          for start, end in zip(starts[:LOOP_COUNT], ends[:LOOP_COUNT])], scale)
+    timed('count', lambda: [calendar.count(start, end) for start, end in zip(starts, ends)])
+    timed('count_many', lambda: calendar.count_many(starts64, ends64))
+    print('add')
+    timed('day by day (scaled)', lambda: [add_loop(start, days, holidays)
+                                          for start, days in zip(starts[:LOOP_COUNT], counts[:LOOP_COUNT])], scale)
+    timed('add', lambda: [calendar.add(start, days) for start, days in zip(starts, counts)])
+    timed('add_many', lambda: calendar.add_many(starts64, counts))
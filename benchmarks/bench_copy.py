@@ -0,0 +1,64 @@
+"""
+This file contains a benchmark for file.process.copy_content, compared with shutil.copy
+that file.process.copy used before, across file sizes.
+
+The files are written in a temporary directory, give another directory to test
+a different filesystem (eg: btrfs or xfs for reflinks), and the largest size to test
+(default 1 GiB, the sizes go from 1 KiB to 10 GiB):
+
+>>> python -m benchmarks.bench_copy
+>>> python -m benchmarks.bench_copy /mnt/btrfs 10G
+"""
+
+# Importing the required libraries
+import os
+import sys
+import shutil
+import tempfile
+import timeit
+import src.utils.file.process as flpr
+
+REPEAT = 3
+
+SIZES = {
+    '1K': 1024,
+    '64K': 64 * 1024,
+    '1M': 1024 ** 2,
+    '16M': 16 * 1024 ** 2,
+    '256M': 256 * 1024 ** 2,
+    '1G': 1024 ** 3,
+    '10G': 10 * 1024 ** 3,
+}
+
+def build_file(path: str, size: int) -> None:
+    """
+    Writes a file of the given size, in blocks of random bytes.
+    """
+    block = os.urandom(min(size, 16 * 1024 ** 2))
+    with open(path, 'wb') as file:
+        for _ in range(size // len(block)):
+            file.write(block)
+        file.write(block[:size % len(block)])
+
+if __name__ == '__main__':
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    max_size = SIZES[sys.argv[2]] if len(sys.argv) > 2 else SIZES['1G']
+    with tempfile.TemporaryDirectory(dir=directory) as root:
+        source = os.path.join(root, 'source.bin')
+        target = os.path.join(root, 'target.bin')
+        for name, size in SIZES.items():
+            if size > max_size:
+                break
+            build_file(source, size)
+            # Fewer runs for large files, always at least one
+            number = max(1, min(100, 64 * 1024 ** 2 // size))
+            print('{} ({} runs)'.format(name, number))
+            cases = {
+                'shutil.copy': lambda: shutil.copy(source, target),
+                'copy_content (no reflink)': lambda: flpr.copy_content(source, target, reflink=False),
+                'copy_content': lambda: flpr.copy_content(source, target),
+            }
+            for case_name, case in cases.items():
+                elapsed = min(timeit.repeat(case, number=number, repeat=REPEAT)) / number
+                print('    {:<30} {:10.6f} s {:10.1f} MiB/s'.format(case_name, elapsed, size / elapsed / 1024 ** 2))
+            os.remove(source)
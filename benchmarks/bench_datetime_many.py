@@ -0,0 +1,58 @@
+"""
+This file contains a benchmark for the batch datetime functions (numpy), compared with calling
+the single datetime functions once per row.
+
+The batch functions take the datetime64 array, the conversion of the list of datetimes
+(about as slow as one call per row) is timed apart.
+
+Run it from the root of the repository (optionally with the number of rows, 1000000 by default):
+
+>>> python -m benchmarks.bench_datetime_many
+>>> python -m benchmarks.bench_datetime_many 100000
+"""
+
+# Importing the required libraries
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+import numpy as np
+import src.utils.datetime.validate as dtvl
+import src.utils.datetime.info as dtin
+
+COUNT = 1000000
+REPEAT = 3
+
+def build_dates(count: int) -> list:
+    """
+    Builds random datetimes between 2000 and 2050.
+    """
+    random.seed(count)
+    start = datetime(2000, 1, 1)
+    return [start + timedelta(seconds=random.randint(0, 50 * 365 * 86400)) for _ in range(count)]
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    dates = build_dates(count)
+    array = np.array(dates, dtype='datetime64[us]')
+    others = np.roll(array, -1)
+    print('{} rows'.format(count))
+    elapsed = min(timeit.repeat(lambda: np.array(dates, dtype='datetime64[us]'), number=1, repeat=REPEAT))
+    print('    {:<30} {:8.4f} s'.format('list to datetime64', elapsed))
+    cases = {
+        'is_future': (lambda: [dtvl.is_future(date) for date in dates], lambda: dtvl.is_future_many(array)),
+        'is_today': (lambda: [dtvl.is_today(date) for date in dates], lambda: dtvl.is_today_many(array)),
+        'is_business_day': (lambda: [dtvl.is_business_day(date) for date in dates],
+                            lambda: dtvl.is_business_day_many(array)),
+        'is_same_week': (lambda: [dtvl.is_same_week(date, other) for date, other in zip(dates, dates[1:] + dates[:1])],
+                         lambda: dtvl.is_same_week_many(array, others)),
+        'get_quarter': (lambda: [dtin.get_quarter(date) for date in dates], lambda: dtin.get_quarter_many(array)),
+        'get_season': (lambda: [dtin.get_season(date) for date in dates], lambda: dtin.get_season_many(array)),
+        'get_day_of_year': (lambda: [dtin.get_day_of_year(date) for date in dates],
+                            lambda: dtin.get_day_of_year_many(array)),
+    }
+    for name, (single, many) in cases.items():
+        print(name)
+        for label, case in (('one call per row', single), ('batch', many)):
+            elapsed = min(timeit.repeat(case, number=1, repeat=REPEAT))
+            print('    {:<30} {:8.4f} s'.format(label, elapsed))
@@ -0,0 +1,40 @@
+"""
+This file contains a benchmark for the cold start time of the package.
+
+Each sample runs a new interpreter, so the regex cache of the "re" module is always empty.
+Lazy: patterns are compiled on first use (what an import of the package costs now).
+Eager: all the patterns are compiled right after the import (what it used to cost).
+
+Run it from the root of the repository:
+
+>>> python -m benchmarks.bench_import
+"""
+
+# Importing the required libraries
+import subprocess
+import sys
+import statistics
+
+SAMPLES = 20
+
+CASES = {
+    'lazy, import _regex': 'import src.utils._regex',
+    'eager, import _regex': 'import src.utils._regex as r; r.compile_all()',
+    'lazy, import + is_path': 'import src.utils.string.validate as v; v.is_path("/tmp/foo")',
+    'eager, import + is_path': ('import src.utils.string.validate as v, src.utils._regex as r; '
+                                'r.compile_all(); v.is_path("/tmp/foo")'),
+}
+
+def measure(statement: str) -> float:
+    """
+    Runs the statement in a new interpreter and returns the time spent on it, in milliseconds.
+    """
+    code = ('import time; start = time.perf_counter(); {}; '
+            'print((time.perf_counter() - start) * 1000)').format(statement)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return float(output.stdout)
+
+if __name__ == '__main__':
+    for name, statement in CASES.items():
+        times = [measure(statement) for _ in range(SAMPLES)]
+        print('{:<28} median {:8.2f} ms   min {:8.2f} ms'.format(name, statistics.median(times), min(times)))
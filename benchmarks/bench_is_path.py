@@ -0,0 +1,61 @@
+"""
+This file contains microbenchmarks for string.validate.is_path and the file system predicates
+that use it, on the paths used by the tests.
+
+The implementation is_path used to have is kept here as reference.
+
+Run it from the root of the repository:
+
+>>> python -m benchmarks.bench_is_path
+"""
+
+# Importing the required libraries
+import os
+import pathlib
+import shutil
+import timeit
+import src.utils.string.validate as stvl
+import src.utils.file.validate as flvl
+import src.utils.directory.validate as drvl
+from src.utils._regex import PATH_RE
+
+NUMBER = 100000
+REPEAT = 5
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests')
+BENCH_DIR = os.path.join(TESTS_DIR, 'bench_dir')
+BENCH_FILE = os.path.join(BENCH_DIR, 'test_file_inside.txt')
+STRINGS = ['C:\\Users\\', 'C:/Users/', 'C:\\Users\\file.txt', 'C:/Users/file.txt', 'file.txt', '']
+
+def is_path_uncached(input_string: str) -> bool:
+    """
+    Previous implementation of is_path.
+    """
+    return stvl.is_full_string(input_string) and PATH_RE.search(input_string) is not None
+
+def timed(name: str, function) -> None:
+    """
+    Prints the time per call of the function.
+    """
+    elapsed = min(timeit.repeat(function, number=NUMBER, repeat=REPEAT)) / NUMBER
+    print('    {:<40} {:8.3f} us/call'.format(name, elapsed * 1e6))
+
+if __name__ == '__main__':
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    with open(BENCH_FILE, 'w') as file:
+        file.write('test')
+    try:
+        entry = next(entry for entry in os.scandir(BENCH_DIR) if entry.name == 'test_file_inside.txt')
+        file_path, dir_path = pathlib.Path(BENCH_FILE), pathlib.Path(BENCH_DIR)
+        print('is_path, {} strings'.format(len(STRINGS) + 2))
+        paths = STRINGS + [BENCH_DIR, BENCH_FILE]
+        timed('is_path (uncached)', lambda: [is_path_uncached(path) for path in paths])
+        timed('is_path', lambda: [stvl.is_path(path) for path in paths])
+        print('file and directory predicates')
+        timed('is_file(str)', lambda: flvl.is_file(BENCH_FILE))
+        timed('is_file(pathlib.Path)', lambda: flvl.is_file(file_path))
+        timed('is_file(os.DirEntry)', lambda: flvl.is_file(entry))
+        timed('is_dir(str)', lambda: drvl.is_dir(BENCH_DIR))
+        timed('is_dir(pathlib.Path)', lambda: drvl.is_dir(dir_path))
+    finally:
+        shutil.rmtree(BENCH_DIR)
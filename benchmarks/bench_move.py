@@ -0,0 +1,65 @@
+"""
+This file contains a benchmark for directory.process.move, compared with the copy and delete
+it used to do, on a tree of many small files.
+
+Run it from the root of the repository, optionally with a directory on another device
+(eg: a tmpfs or a network drive) to also time a move across devices:
+
+>>> python -m benchmarks.bench_move
+>>> python -m benchmarks.bench_move /dev/shm
+"""
+
+# Importing the required libraries
+import os
+import sys
+import shutil
+import tempfile
+import time
+import src.utils.directory.process as drpr
+
+DIRS = 50
+FILES_PER_DIR = 200
+FILE_SIZE = 16 * 1024
+
+def build_tree(path: str) -> None:
+    """
+    Builds a tree of DIRS directories with FILES_PER_DIR files of FILE_SIZE bytes each.
+    """
+    content = os.urandom(FILE_SIZE)
+    for i in range(DIRS):
+        directory = os.path.join(path, 'dir{}'.format(i))
+        os.makedirs(directory)
+        for j in range(FILES_PER_DIR):
+            with open(os.path.join(directory, 'file{}.bin'.format(j)), 'wb') as file:
+                file.write(content)
+
+def copy_and_delete(path: str, new_path: str) -> None:
+    """
+    Previous implementation of move.
+    """
+    shutil.copytree(path, new_path)
+    shutil.rmtree(path)
+
+def timed(name: str, function, path: str, new_path: str) -> None:
+    """
+    Builds the tree, moves it with the given function and prints the time it took.
+    """
+    build_tree(path)
+    start = time.perf_counter()
+    function(path, new_path)
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(new_path)
+    print('    {:<30} {:8.4f} s'.format(name, elapsed))
+
+if __name__ == '__main__':
+    print('{} files of {} KiB'.format(DIRS * FILES_PER_DIR, FILE_SIZE // 1024))
+    with tempfile.TemporaryDirectory() as root:
+        source = os.path.join(root, 'source')
+        print('same device')
+        timed('copy and delete', copy_and_delete, source, os.path.join(root, 'target'))
+        timed('move', drpr.move, source, os.path.join(root, 'target'))
+        if len(sys.argv) > 1:
+            with tempfile.TemporaryDirectory(dir=sys.argv[1]) as other:
+                print('across devices')
+                timed('copy and delete', copy_and_delete, source, os.path.join(other, 'target'))
+                timed('move', drpr.move, source, os.path.join(other, 'target'))
@@ -0,0 +1,52 @@
+"""
+This file contains a benchmark for normalize, compared with calling the functions one after another.
+
+Run it from the root of the repository:
+
+>>> python -m benchmarks.bench_normalize
+"""
+
+# Importing the required libraries
+import random
+import timeit
+import src.utils.string.process as stpr
+
+REPEAT = 5
+
+STEP_SETS = (
+    ('remove_non_printable', 'remove_accents', 'remove_whitespace'),
+    ('remove_non_printable', 'remove_accents', 'remove_whitespace', 'capitalize_words'),
+)
+
+WORDS = ('el camión llegó\x0c tarde a la estación\tde autobuses porque había mucho tráfico '
+         'en la ciudad y nadie sabía qué hacer').split(' ')
+
+def chained(input_string: str, steps: tuple) -> str:
+    """
+    Applies the steps calling the functions one after another.
+    """
+    for step in steps:
+        input_string = getattr(stpr, step)(input_string)
+    return input_string
+
+def build_lines(count: int) -> list:
+    """
+    Builds random lines (eg: csv cells) of 3 to 8 words.
+    """
+    random.seed(count)
+    return [' '.join(random.choice(WORDS) for _ in range(random.randint(3, 8))) for _ in range(count)]
+
+if __name__ == '__main__':
+    lines = build_lines(500000)
+    text = '\n'.join(lines)
+    for steps in STEP_SETS:
+        print('steps: {}'.format(', '.join(steps)))
+        cases = {
+            'chained calls, one text': lambda: chained(text, steps),
+            'normalize, one text': lambda: stpr.normalize(text, steps),
+            'chained calls, many lines': lambda: [chained(line, steps) for line in lines],
+            'normalize_many, many lines': lambda: list(stpr.normalize_many(lines, steps)),
+        }
+        for name, case in cases.items():
+            elapsed = min(timeit.repeat(case, number=1, repeat=REPEAT))
+            print('    {:<30} {:8.4f} s'.format(name, elapsed))
@@ -0,0 +1,75 @@
+"""
+This file contains a benchmark for datetime.validate.parse and parse_column on a column of timestamps,
+95% of them ISO 8601 and the rest with another format, and on a column with a single non ISO format,
+compared with dateutil.
+
+dateutil is timed on the first DATEUTIL_COUNT timestamps only, and its time is scaled to the column.
+
+Run it from the root of the repository (optionally with the number of timestamps, 1000000 by default):
+
+>>> python -m benchmarks.bench_parse
+>>> python -m benchmarks.bench_parse 100000
+"""
+
+# Importing the required libraries
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+import dateutil.parser as dtp
+import src.utils.datetime.validate as dtvl
+
+COUNT = 1000000
+DATEUTIL_COUNT = 100000
+
+FORMATS = ('%Y-%m-%dT%H:%M:%S.%f+02:00', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M:%S')
+OTHER_FORMAT = '%d/%m/%Y %H:%M'
+
+def build_column(count: int, format: str = None) -> list:
+    """
+    Builds random timestamps with the format, or 1 of each 20 with OTHER_FORMAT and the rest ISO.
+    """
+    random.seed(count)
+    start = datetime(2000, 1, 1)
+    column = []
+    for index in range(count):
+        date = start + timedelta(seconds=random.randint(0, 25 * 365 * 86400), microseconds=random.randint(0, 999999))
+        if format is not None:
+            column.append(date.strftime(format))
+        else:
+            column.append(date.strftime(OTHER_FORMAT if index % 20 == 0 else random.choice(FORMATS)))
+    return column
+
+def timed_column(name: str, strings: list) -> None:
+    """
+    Prints the time to parse the strings with parse_column.
+    """
+    start = time.perf_counter()
+    dtvl.parse_column(strings)
+    print('    {:<30} {:8.4f} s'.format(name, time.perf_counter() - start))
+
+def timed(name: str, function, strings: list, scale: float = 1) -> None:
+    """
+    Prints the time to parse the strings with the function.
+    """
+    start = time.perf_counter()
+    for string in strings:
+        function(string)
+    print('    {:<30} {:8.4f} s'.format(name, (time.perf_counter() - start) * scale))
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    column = build_column(count)
+    print('{} timestamps'.format(count))
+    sample = column[:DATEUTIL_COUNT]
+    timed('dateutil (scaled)', dtp.parse, sample, len(column) / len(sample))
+    timed('parse', dtvl.parse, column)
+    dtvl.forget_formats()
+    timed('parse, column', lambda string: dtvl.parse(string, column='timestamp'), column)
+    timed_column('parse_column', column)
+    column = build_column(count, OTHER_FORMAT)
+    print('{} timestamps, {}'.format(count, OTHER_FORMAT))
+    timed('dateutil (scaled)', dtp.parse, column[:DATEUTIL_COUNT], len(column) / len(sample))
+    dtvl.forget_formats()
+    timed('parse, column', lambda string: dtvl.parse(string, column='timestamp'), column)
+    timed_column('parse_column', column)
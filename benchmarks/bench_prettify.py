@@ -0,0 +1,69 @@
+"""
+This file contains a benchmark for prettify and prettify_stream on big documents.
+
+The time per MB should stay flat as the document grows (linear scaling), also for
+link heavy documents, where every url and email is protected from the formatting rules.
+
+Run it from the root of the repository:
+
+>>> python -m benchmarks.bench_prettify
+"""
+
+# Importing the required libraries
+import random
+import time
+import src.utils.string.process as stpr
+
+SIZES_MB = (1, 4, 16)
+
+LINKS = (1000, 5000, 20000)
+
+WORDS = ('lorem ipsum dolor sit amet , consectetur  adipiscing elit . sed do ( eiusmod ) tempor "incididunt" '
+         'ut labore 5 % et dolore magna aliqua ! ut enim ad minim veniam ? quis nostrud Dave\' s 3+4 = 7').split(' ')
+
+def build_document(size_mb: int) -> str:
+    """
+    Builds a random document of (about) the given size, with a blank line every 100 words.
+    """
+    random.seed(size_mb)
+    paragraphs = []
+    size = 0
+    while size < size_mb * 1024 * 1024:
+        paragraph = ' '.join(random.choice(WORDS) for _ in range(100))
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return '\n\n'.join(paragraphs)
+
+def build_link_document(links: int) -> str:
+    """
+    Builds a document with the given number of urls and emails.
+    """
+    return ' '.join('see http://www.site{0}.com/page?id={0} ,or mail info{0}@site.com .'.format(i)
+                    for i in range(links))
+
+def chunked(text: str, chunk_size: int = 64 * 1024):
+    """
+    Splits the text in chunks, as if it was read from a file.
+    """
+    for i in range(0, len(text), chunk_size):
+        yield text[i:i + chunk_size]
+
+def measure(function, *args) -> float:
+    """
+    Returns the time spent running the function, in seconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+if __name__ == '__main__':
+    for size_mb in SIZES_MB:
+        document = build_document(size_mb)
+        elapsed = measure(stpr.prettify, document)
+        print('prettify         {:3d} MB: {:7.3f} s ({:.3f} s/MB)'.format(size_mb, elapsed, elapsed / size_mb))
+        elapsed = measure(lambda text: sum(1 for _ in stpr.prettify_stream(chunked(text))), document)
+        print('prettify_stream  {:3d} MB: {:7.3f} s ({:.3f} s/MB)'.format(size_mb, elapsed, elapsed / size_mb))
+    for links in LINKS:
+        document = build_link_document(links)
+        elapsed = measure(stpr.prettify, document)
+        print('prettify  {:6d} urls + {:6d} emails: {:7.3f} s'.format(links, links, elapsed))
@@ -0,0 +1,49 @@
+"""
+This file contains a benchmark for datetime.info.get_date and get_time, which render through a cache,
+compared with calling strftime for each datetime.
+
+The datetimes are spread over a few thousand days, as the dates of a report.
+
+Run it from the root of the repository (optionally with the number of datetimes, 1000000 by default):
+
+>>> python -m benchmarks.bench_render
+>>> python -m benchmarks.bench_render 100000
+"""
+
+# Importing the required libraries
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+import src.utils.datetime.info as dtin
+
+COUNT = 1000000
+DAYS = 3000
+REPEAT = 3
+
+FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d %B %Y', '%H:%M:%S')
+
+def build_dates(count: int) -> list:
+    """
+    Builds random datetimes over DAYS days.
+    """
+    random.seed(count)
+    start = datetime(2015, 1, 1)
+    return [start + timedelta(days=random.randrange(DAYS), seconds=random.randrange(86400)) for _ in range(count)]
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    dates = build_dates(count)
+    print('{} datetimes over {} days'.format(count, DAYS))
+    for format in FORMATS:
+        print('format: {}'.format(format))
+        function = dtin.get_time if format == '%H:%M:%S' else dtin.get_date
+        cases = {
+            'strftime': lambda: [date.strftime(format) for date in dates],
+            'no cache (fast renderer)': lambda: [dtin._render(date, format) for date in dates],
+            function.__name__: lambda: [function(date, format) for date in dates],
+        }
+        for name, case in cases.items():
+            dtin.render_cache_clear()
+            elapsed = min(timeit.repeat(case, number=1, repeat=REPEAT))
+            print('    {:<30} {:8.4f} s'.format(name, elapsed))
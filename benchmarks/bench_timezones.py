@@ -0,0 +1,50 @@
+"""
+This file contains a benchmark for converting timestamps of many zones with datetime.info,
+compared with datetime.fromtimestamp and a ZoneInfo looked up for each event.
+
+Run it from the root of the repository (optionally with the number of events, 1000000 by default):
+
+>>> python -m benchmarks.bench_timezones
+>>> python -m benchmarks.bench_timezones 100000
+"""
+
+# Importing the required libraries
+import random
+import sys
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+import src.utils.datetime.info as dtin
+
+COUNT = 1000000
+
+ZONES = ('Europe/Madrid', 'Europe/London', 'America/New_York', 'America/Sao_Paulo', 'Asia/Kolkata',
+         'Asia/Tokyo', 'Australia/Sydney', 'Africa/Casablanca', 'Pacific/Auckland', 'UTC')
+
+def timed(name: str, function) -> None:
+    """
+    Prints the time of the function.
+    """
+    start = time.perf_counter()
+    function()
+    print('    {:<30} {:8.4f} s'.format(name, time.perf_counter() - start))
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    random.seed(count)
+    events = [(random.uniform(1.5e9, 1.8e9), random.choice(ZONES)) for _ in range(count)]
+    print('{} events, {} zones'.format(count, len(ZONES)))
+    # the zone years are found once, keep it out of the timings
+    for zone in ZONES:
+        dtin.from_timestamp_many([1.5e9, 1.8e9], zone)
+    timed('fromtimestamp(ZoneInfo(zone))', lambda: [datetime.fromtimestamp(timestamp, ZoneInfo(zone))
+                                                    for timestamp, zone in events])
+    timed('from_timestamp', lambda: [dtin.from_timestamp(timestamp, zone) for timestamp, zone in events])
+    wall = datetime(2023, 10, 29, 2, 30)
+    timed('replace(ZoneInfo).timestamp()', lambda: [int(wall.replace(tzinfo=ZoneInfo(zone)).timestamp())
+                                                    for _, zone in events])
+    timed('get_timestamp (wall time)', lambda: [dtin.get_timestamp(wall, zone) for _, zone in events])
+    by_zone = {zone: np.array([timestamp for timestamp, event_zone in events if event_zone == zone]) for zone in ZONES}
+    timed('from_timestamp_many by zone', lambda: [dtin.from_timestamp_many(timestamps, zone)
+                                                  for zone, timestamps in by_zone.items()])
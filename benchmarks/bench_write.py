@@ -0,0 +1,34 @@
+"""
+This file contains a benchmark for file.process.write and append with each durability level,
+in place and atomic.
+
+The files are written in a temporary directory, give another directory to test
+a different filesystem or disk:
+
+>>> python -m benchmarks.bench_write
+>>> python -m benchmarks.bench_write /mnt/data
+"""
+
+# Importing the required libraries
+import os
+import sys
+import tempfile
+import timeit
+import src.utils.file.process as flpr
+
+NUMBER = 200
+CONTENT = 'x' * 4096
+
+if __name__ == '__main__':
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    with tempfile.TemporaryDirectory(dir=directory) as root:
+        path = os.path.join(root, 'file.txt')
+        flpr.create(path)
+        print('{} calls with {} chars'.format(NUMBER, len(CONTENT)))
+        for function in (flpr.write, flpr.append):
+            for atomic in (False, True):
+                for durability in flpr.DURABILITY_LEVELS:
+                    flpr.write(path, CONTENT)
+                    elapsed = timeit.timeit(lambda: function(path, CONTENT, atomic, durability), number=NUMBER)
+                    name = '{} (atomic={}, durability={})'.format(function.__name__, atomic, durability)
+                    print('    {:<50} {:10.1f} us/call'.format(name, elapsed / NUMBER * 1e6))
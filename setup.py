@@ -16,7 +16,8 @@ setup(
     install_requires=[
         'python-dateutil',
     ],
-    extras_require=[
-        'six',
-    ]
+    extras_require={
+        # batch datetime functions (*_many) and BusinessCalendar.*_many
+        'numpy': ['numpy'],
+    }
 )
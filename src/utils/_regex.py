@@ -1,16 +1,83 @@
 # -*- coding: utf-8 -*-
 
 import re
+import threading
 
 # INTERNAL USE ONLY REGEX!
 
-NUMBER_RE = re.compile(r'^([+\-]?)((\d+)(\,\d+)?(e\d+)?|\,\d+)$')
+# Patterns are compiled on first use, so importing the package only pays for the ones used
 
-PATH_RE = re.compile(r'^([a-zA-Z]:)?[\\/]+(?:[^\\/]+[\\/]+)*[^\\/]+$')
 
-FILENAME_RE = re.compile(r'^[a-zA-Z0-9áéíóúÁÉÍÓÚ\.\,\-\_\ \(\)]+\.[a-zA-Z]{2,}$', re.IGNORECASE)
+class _LazyPattern:
+    """
+    Placeholder for a compiled regex, the pattern is compiled (once, thread-safe) the first
+    time any of its attributes is accessed. After that, the methods of the compiled pattern
+    are regular instance attributes, so there is no extra cost per call.
+    """
 
-HIDDEN_FILENAME_RE = re.compile(r'^\..+$')
+    _lock = threading.Lock()
+
+    def __init__(self, pattern: str, flags: int = 0):
+        """
+        :param pattern: Regex pattern.
+        :param flags: Regex flags (re.IGNORECASE, re.MULTILINE, ...).
+        """
+        self._pattern = pattern
+        self._flags = flags
+        self._compiled = None
+
+    def compile(self) -> re.Pattern:
+        """
+        Compiles the pattern, if not compiled yet.
+
+        :return: The compiled pattern.
+        :rtype: re.Pattern
+        """
+        if self._compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    compiled = re.compile(self._pattern, self._flags)
+                    for name in ('match', 'search', 'fullmatch', 'sub', 'subn', 'split', 'findall', 'finditer'):
+                        setattr(self, name, getattr(compiled, name))
+                    self._compiled = compiled
+        return self._compiled
+
+    def __getattr__(self, name):
+        # only called for attributes not found in the instance (not compiled yet or other attributes)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.compile(), name)
+
+    def __repr__(self):
+        return '_LazyPattern({!r}, {})'.format(self._pattern, self._flags)
+
+
+_PATTERNS = []
+
+
+def _compile(pattern: str, flags: int = 0) -> _LazyPattern:
+    """
+    Registers a pattern to be compiled on first use.
+    """
+    lazy_pattern = _LazyPattern(pattern, flags)
+    _PATTERNS.append(lazy_pattern)
+    return lazy_pattern
+
+
+def compile_all() -> None:
+    """
+    Compiles all the registered patterns (eg: to warm up a long running process before forking).
+    """
+    for lazy_pattern in _PATTERNS:
+        lazy_pattern.compile()
+
+NUMBER_RE = _compile(r'^([+\-]?)((\d+)(\,\d+)?(e\d+)?|\,\d+)$')
+
+PATH_RE = _compile(r'^([a-zA-Z]:)?[\\/]+(?:[^\\/]+[\\/]+)*[^\\/]+$')
+
+FILENAME_RE = _compile(r'^[a-zA-Z0-9áéíóúÁÉÍÓÚ\.\,\-\_\ \(\)]+\.[a-zA-Z]{2,}$', re.IGNORECASE)
+
+HIDDEN_FILENAME_RE = _compile(r'^\..+$')
 
 URLS_RAW_STRING = (
     r'([a-z-]+://)'  # scheme
@@ -24,98 +91,100 @@ URLS_RAW_STRING = (
     r'(#\S*)?'  # hash
 )
 
-URL_RE = re.compile(r'^{}$'.format(URLS_RAW_STRING), re.IGNORECASE)
+URL_RE = _compile(r'^{}$'.format(URLS_RAW_STRING), re.IGNORECASE)
 
-URLS_RE = re.compile(r'({})'.format(URLS_RAW_STRING), re.IGNORECASE)
+URLS_RE = _compile(r'({})'.format(URLS_RAW_STRING), re.IGNORECASE)
 
-HOSTNAME_RE = re.compile(r'^[a-z\d][a-z\d-]{,61}[a-z\d]$', re.IGNORECASE)
+HOSTNAME_RE = _compile(r'^[a-z\d][a-z\d-]{,61}[a-z\d]$', re.IGNORECASE)
 
-DOMAIN_RE = re.compile(r'^[a-z\d][a-z\d-]{,61}[a-z\d](\.[a-z]{2,}){1,2}$', re.IGNORECASE)
+DOMAIN_RE = _compile(r'^[a-z\d][a-z\d-]{,61}[a-z\d](\.[a-z]{2,}){1,2}$', re.IGNORECASE)
 
-ESCAPED_AT_SIGN = re.compile(r'(?!"[^"]*)@+(?=[^"]*")|\\@')
+ESCAPED_AT_SIGN = _compile(r'(?!"[^"]*)@+(?=[^"]*")|\\@')
 
 EMAILS_RAW_STRING = r"[a-zA-Z\d._\+\-'`!%#$&*/=\?\^\{\}\|~\\]+@[a-z\d-]+\.?[a-z\d-]+\.[a-z]{2,4}"
 
-EMAIL_RE = re.compile(r'^{}$'.format(EMAILS_RAW_STRING))
+EMAIL_RE = _compile(r'^{}$'.format(EMAILS_RAW_STRING))
 
-EMAILS_RE = re.compile(r'({})'.format(EMAILS_RAW_STRING))
+EMAILS_RE = _compile(r'({})'.format(EMAILS_RAW_STRING))
 
-PASSWORD_RE = re.compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*[0-9])(?=.{8,})')
+PASSWORD_RE = _compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*[0-9])(?=.{8,})')
 
 # Minimum eight characters, at least one letter and one number:
-# PASSWORD_RE = re.compile(r'^(?=.*[A-Za-z])(?=.*\d)[A-Za-z\d]{8,}$')
+# PASSWORD_RE = _compile(r'^(?=.*[A-Za-z])(?=.*\d)[A-Za-z\d]{8,}$')
 # Minimum eight characters, at least one letter lowercase, one letter uppercase, one number and one special character:
-# PASSWORD_RE = re.compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*#?&])[A-Za-z\d@$!%*#?&]{8,}$')
+# PASSWORD_RE = _compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*#?&])[A-Za-z\d@$!%*#?&]{8,}$')
 # Minimum eight characters, at least one letter lowercase, one letter uppercase, one number and one special character (all characters):
-PASSWORD_RE = re.compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[!@#$%^&*()\-_=+{}[\]|\\:;"\'<>,./?])(?=.{8,})')
+PASSWORD_RE = _compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[!@#$%^&*()\-_=+{}[\]|\\:;"\'<>,./?])(?=.{8,})')
 
-CAMEL_CASE_TEST_RE = re.compile(r'^[a-zA-Z]*([a-z]+[A-Z]+|[A-Z]+[a-z]+)[a-zA-Z\d]*$')
+CAMEL_CASE_TEST_RE = _compile(r'^[a-zA-Z]*([a-z]+[A-Z]+|[A-Z]+[a-z]+)[a-zA-Z\d]*$')
 
-CAMEL_CASE_REPLACE_RE = re.compile(r'([a-z]|[A-Z]+)(?=[A-Z])')
+CAMEL_CASE_REPLACE_RE = _compile(r'([a-z]|[A-Z]+)(?=[A-Z])')
 
-SNAKE_CASE_TEST_RE = re.compile(r'^([a-z]+\d*_[a-z\d_]*|_+[a-z\d]+[a-z\d_]*)$', re.IGNORECASE)
+SNAKE_CASE_TEST_RE = _compile(r'^([a-z]+\d*_[a-z\d_]*|_+[a-z\d]+[a-z\d_]*)$', re.IGNORECASE)
 
-SNAKE_CASE_TEST_DASH_RE = re.compile(r'([a-z]+\d*-[a-z\d-]*|-+[a-z\d]+[a-z\d-]*)$', re.IGNORECASE)
+SNAKE_CASE_TEST_DASH_RE = _compile(r'([a-z]+\d*-[a-z\d-]*|-+[a-z\d]+[a-z\d-]*)$', re.IGNORECASE)
 
-SNAKE_CASE_REPLACE_RE = re.compile(r'(_)([a-z\d])')
+SNAKE_CASE_REPLACE_RE = _compile(r'(_)([a-z\d])')
 
-SNAKE_CASE_REPLACE_DASH_RE = re.compile(r'(-)([a-z\d])')
+SNAKE_CASE_REPLACE_DASH_RE = _compile(r'(-)([a-z\d])')
 
 CREDIT_CARDS = {
-    'VISA': re.compile(r'^4\d{12}(?:\d{3})?$'),
-    'MASTERCARD': re.compile(r'^5[1-5]\d{14}$'),
-    'AMERICAN_EXPRESS': re.compile(r'^3[47]\d{13}$'),
-    'DINERS_CLUB': re.compile(r'^3(?:0[0-5]|[68]\d)\d{11}$'),
-    'DISCOVER': re.compile(r'^6(?:011|5\d{2})\d{12}$'),
-    'JCB': re.compile(r'^(?:2131|1800|35\d{3})\d{11}$')
+    'VISA': _compile(r'^4\d{12}(?:\d{3})?$'),
+    'MASTERCARD': _compile(r'^5[1-5]\d{14}$'),
+    'AMERICAN_EXPRESS': _compile(r'^3[47]\d{13}$'),
+    'DINERS_CLUB': _compile(r'^3(?:0[0-5]|[68]\d)\d{11}$'),
+    'DISCOVER': _compile(r'^6(?:011|5\d{2})\d{12}$'),
+    'JCB': _compile(r'^(?:2131|1800|35\d{3})\d{11}$')
 }
 
-JSON_RE = re.compile(r'^\s*[\[{]\s*(.*)\s*[\}\]]\s*$', re.MULTILINE | re.DOTALL)
+JSON_RE = _compile(r'^\s*[\[{]\s*(.*)\s*[\}\]]\s*$', re.MULTILINE | re.DOTALL)
 
-CSV_RE = re.compile(r'^\s*([^,]+)(?:\s*,\s*([^,]+))*\s*$', re.MULTILINE | re.DOTALL)
+CSV_RE = _compile(r'^\s*([^,]+)(?:\s*,\s*([^,]+))*\s*$', re.MULTILINE | re.DOTALL)
 
-XML_RE = re.compile(r'^\s*<([^>]+)>(.*)</\1>\s*$', re.MULTILINE | re.DOTALL)
+XML_RE = _compile(r'^\s*<([^>]+)>(.*)</\1>\s*$', re.MULTILINE | re.DOTALL)
 
-UUID_RE = re.compile(r'^[a-f\d]{8}-[a-f\d]{4}-[a-f\d]{4}-[a-f\d]{4}-[a-f\d]{12}$', re.IGNORECASE)
+UUID_RE = _compile(r'^[a-f\d]{8}-[a-f\d]{4}-[a-f\d]{4}-[a-f\d]{4}-[a-f\d]{12}$', re.IGNORECASE)
 
-UUID_HEX_OK_RE = re.compile(r'^[a-f\d]{8}-?[a-f\d]{4}-?[a-f\d]{4}-?[a-f\d]{4}-?[a-f\d]{12}$', re.IGNORECASE)
+UUID_HEX_OK_RE = _compile(r'^[a-f\d]{8}-?[a-f\d]{4}-?[a-f\d]{4}-?[a-f\d]{4}-?[a-f\d]{12}$', re.IGNORECASE)
 
-IP_V4_RE = re.compile(r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$')
+IP_V4_RE = _compile(r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$')
 
-IP_V6_RE = re.compile(r'^([a-z\d]{0,4}:){7}[a-z\d]{0,4}$', re.IGNORECASE)
+IP_V6_RE = _compile(r'^([a-z\d]{0,4}:){7}[a-z\d]{0,4}$', re.IGNORECASE)
 
-WORDS_COUNT_RE = re.compile(r'\W*[^\W_]+\W*', re.IGNORECASE | re.MULTILINE | re.UNICODE)
+WORDS_COUNT_RE = _compile(r'\W*[^\W_]+\W*', re.IGNORECASE | re.MULTILINE | re.UNICODE)
 
-HTML_RE = re.compile(
+HTML_RE = _compile(
     r'((<([a-z]+:)?[a-z]+[^>]*/?>)(.*?(</([a-z]+:)?[a-z]+>))?|<!--.*-->|<!doctype.*>)',
     re.IGNORECASE | re.MULTILINE | re.DOTALL
 )
 
-HTML_TAG_ONLY_RE = re.compile(
+HTML_TAG_ONLY_RE = _compile(
     r'(<([a-z]+:)?[a-z]+[^>]*/?>|</([a-z]+:)?[a-z]+>|<!--.*-->|<!doctype.*>)',
     re.IGNORECASE | re.MULTILINE | re.DOTALL
 )
 
-XML_RE = re.compile(
+XML_RE = _compile(
     r'(<([a-z]+:)?[a-z]+[^>]*/?>)(.*?(</([a-z]+:)?[a-z]+>))?|<!--.*-->|<!doctype.*>',
     re.IGNORECASE | re.MULTILINE | re.DOTALL
 )
 
-SPACES_RE = re.compile(r'\s')
+SPACES_RE = _compile(r'\s')
 
-NON_PRINTABLE_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]')
+NON_PRINTABLE_RE = _compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]')
 
 PRETTIFY_RE = {
-    # match repetitions of signs that should not be repeated (like multiple spaces or duplicated quotes)
-    'DUPLICATES': re.compile(
-        r'(\({2,}|\){2,}|\[{2,}|\]{2,}|{{2,}|\}{2,}|:{2,}|,{2,}|;{2,}|\+{2,}|-{2,}|\s{2,}|%{2,}|={2,}|"{2,}|\'{2,})',
+    # match repetitions of signs that should not be repeated (like multiple spaces or duplicated quotes),
+    # the sign is captured in group 1 (or the first space in group 2) so it can be replaced with r'\1\2'
+    'DUPLICATES': _compile(
+        r'([()\[\]{}:,;+\-%="\'])\1+|(\s)\s+',
         re.MULTILINE
     ),
 
     # check that a sign cannot have a space before or missing a space after,
     # unless it is a dot or a comma, where numbers may follow (5.5 or 5,5 is ok)
-    'RIGHT_SPACE': re.compile(
-        r'('
+    # (the leading lookahead of this and the next rules only discards early positions where no match can start)
+    'RIGHT_SPACE': _compile(
+        r'(?=[\s\d,.;:!?])('
         r'(?<=[^\s\d]),(?=[^\s\d])|\s,\s|\s,(?=[^\s\d])|\s,(?!.)|'  # comma (,)
         r'(?<=[^\s\d.])\.+(?=[^\s\d.])|\s\.+\s|\s\.+(?=[^\s\d])|\s\.+(?!\.)|'  # dot (.)
         r'(?<=\S);(?=\S)|\s;\s|\s;(?=\S)|\s;(?!.)|'  # semicolon (;)
@@ -127,8 +196,8 @@ PRETTIFY_RE = {
         re.MULTILINE | re.DOTALL
     ),
 
-    'LEFT_SPACE': re.compile(
-        r'('
+    'LEFT_SPACE': _compile(
+        r'(?=[\s"(])('
 
         # quoted text ("hello world")
         r'\s"[^"]+"(?=[?.:!,;])|(?<=\S)"[^"]+"\s|(?<=\S)"[^"]+"(?=[?.:!,;])|'
@@ -141,13 +210,13 @@ PRETTIFY_RE = {
     ),
 
     # finds the first char in the string (therefore this must not be MULTILINE)
-    'UPPERCASE_FIRST_LETTER': re.compile(r'^\s*\w', re.UNICODE),
+    'UPPERCASE_FIRST_LETTER': _compile(r'^\s*\w', re.UNICODE),
 
     # match chars that must be followed by uppercase letters (like ".", "?"...)
-    'UPPERCASE_AFTER_SIGN': re.compile(r'([.?!]\s\w)', re.MULTILINE | re.UNICODE),
+    'UPPERCASE_AFTER_SIGN': _compile(r'([.?!]\s\w)', re.MULTILINE | re.UNICODE),
 
-    'SPACES_AROUND': re.compile(
-        r'('
+    'SPACES_AROUND': _compile(
+        r'(?=[\s+\-/*="(])('
         r'(?<=\S)\+(?=\S)|(?<=\S)\+\s|\s\+(?=\S)|'  # plus (+)
         r'(?<=\S)-(?=\S)|(?<=\S)-\s|\s-(?=\S)|'  # minus (-)
         r'(?<=\S)/(?=\S)|(?<=\S)/\s|\s/(?=\S)|'  # division (/)
@@ -164,7 +233,7 @@ PRETTIFY_RE = {
         re.MULTILINE | re.DOTALL
     ),
 
-    'SPACES_INSIDE': re.compile(
+    'SPACES_INSIDE': _compile(
         r'('
         r'(?<=")[^"]+(?=")|'  # quoted text ("hello world")
         r'(?<=\()[^)]+(?=\))'  # text in round brackets
@@ -172,18 +241,30 @@ PRETTIFY_RE = {
         re.MULTILINE | re.DOTALL
     ),
 
-    'SAXON_GENITIVE': re.compile(
-        r'('
+    'SAXON_GENITIVE': _compile(
+        r'(?=[\s\'])('
         r'(?<=\w)\'\ss\s|(?<=\w)\s\'s(?=\w)|(?<=\w)\s\'s\s(?=\w)'
         r')',
         re.MULTILINE | re.UNICODE
     )
 }
 
-NO_LETTERS_OR_NUMBERS_RE = re.compile(r'[^\w\d]+|_+', re.IGNORECASE | re.UNICODE)
+# blank lines between paragraphs
+PARAGRAPH_SEPARATOR_RE = _compile(r'\n[^\S\n]*\n\s*')
+
+NO_LETTERS_OR_NUMBERS_RE = _compile(r'[^\w\d]+|_+', re.IGNORECASE | re.UNICODE)
+
+MARGIN_RE = _compile(r'^[^\S\r\n]+')
 
-MARGIN_RE = re.compile(r'^[^\S\r\n]+')
+LOCALE_RE = _compile(r'^[a-z]{2}_[A-Z]{2}$')
 
-LOCALE_RE = re.compile(r'^[a-z]{2}_[A-Z]{2}$')
+INSENSITIVE_LOCALE_RE = _compile(r'^[a-z]{2}_[a-z]{2}$', re.IGNORECASE)
+
+# strict ISO 8601 / RFC 3339 datetime (extended format): date, optional time with seconds, fraction and offset
+ISO_DATETIME_RE = _compile(
+    r'^(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d+))?)?(?:(Z)|([+-])(\d{2}):?(\d{2}))?)?$'
+)
 
-INSENSITIVE_LOCALE_RE = re.compile(r'^[a-z]{2}_[a-z]{2}$', re.IGNORECASE)
+# strftime directive, with the optional glibc flag (eg: %Y, %-d)
+STRFTIME_DIRECTIVE_RE = _compile(r'%[-_0^#]?(.)', re.DOTALL)
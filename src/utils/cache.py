@@ -0,0 +1,173 @@
+"""
+This file contains a cache of the file system metadata (stat and access checks),
+shared by the validate and info functions of files and directories.
+
+The cache is disabled unless a stat_cache block is active in the current thread,
+then repeated checks of the same path (eg: is_file, then is_readonly, then get_size)
+only reach the file system once. The process functions invalidate it when they
+change a path, so the checks after a change see it.
+"""
+
+# Importing the required libraries
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Caches of the current thread, the last one is the active one
+_local = threading.local()
+
+class StatCache:
+    """
+    Cache of stat and access results by path, with counters of the calls made and saved.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        :param ttl: Seconds a result is valid, None to keep it until the cache is closed or invalidated.
+        :type ttl: float
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def get(self, key: tuple, function, *args):
+        """
+        Returns the cached result for the key, or calls the function and caches its result.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and (self.ttl is None or time.monotonic() - entry[1] < self.ttl):
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        result = function(*args)
+        self._entries[key] = (result, time.monotonic())
+        return result
+
+    def invalidate(self, *paths: str) -> None:
+        """
+        Drops the results of the given paths and the paths inside them, or all the results if no path is given.
+        """
+        if not paths:
+            self._entries.clear()
+            return
+        paths = {_key(path) for path in paths}
+        prefixes = tuple(os.path.join(path, '') for path in paths)
+        for key in [key for key in self._entries if key[1] in paths or key[1].startswith(prefixes)]:
+            del self._entries[key]
+
+    @property
+    def saved(self) -> int:
+        """
+        Number of system calls saved.
+        """
+        return self.hits
+
+    def __repr__(self) -> str:
+        return 'StatCache(ttl={}, hits={}, misses={}, entries={})'.format(
+            self.ttl, self.hits, self.misses, len(self._entries))
+
+@contextmanager
+def stat_cache(ttl: Optional[float] = None) -> Iterator[StatCache]:
+    """
+    Caches the stat and access checks made in the current thread inside the with block.
+
+    *Examples:*
+
+    >>> with stat_cache() as cache:
+    ...     delete('C:\\Users\\User\\Desktop\\file.txt') # checks the file once
+    ...     cache.saved # returns the number of system calls saved
+
+    :param ttl: Seconds a result is valid, None to keep it until the end of the block.
+    :type ttl: float
+    :return: A context manager giving the cache.
+    :rtype: Iterator[StatCache]
+    """
+    cache = StatCache(ttl)
+    caches = _local.__dict__.setdefault('caches', [])
+    caches.append(cache)
+    try:
+        yield cache
+    finally:
+        caches.remove(cache)
+
+def get_active() -> Optional[StatCache]:
+    """
+    Gets the stat cache active in the current thread, None if there is none.
+    """
+    caches = getattr(_local, 'caches', None)
+    return caches[-1] if caches else None
+
+def _key(path) -> str:
+    """
+    Gets the key of a path in the cache, its absolute normalized path,
+    so the different spellings of a path ('a/b', './a/b', 'a//b') share their results.
+    """
+    return os.path.normpath(os.path.abspath(os.fspath(path)))
+
+def _stat(path) -> Optional[os.stat_result]:
+    """
+    Calls os.stat, or the stat cached by a DirEntry, returns None if the path does not exist or is not valid.
+    """
+    try:
+        if isinstance(path, os.DirEntry):
+            return path.stat()
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+def stat(path) -> Optional[os.stat_result]:
+    """
+    Gets the stat of a path following symlinks, through the active cache.
+
+    *Examples:*
+
+    >>> stat('C:\\Users\\User\\Desktop\\file.txt') # returns os.stat_result(st_mode=33206, ...)
+    >>> stat('C:\\Users\\User\\Desktop\\missing.txt') # returns None
+
+    :param path: The path to the file or directory.
+    :type path: str
+    :return: The stat of the path, None if it does not exist.
+    :rtype: os.stat_result
+    """
+    cache = get_active()
+    if cache is None:
+        return _stat(path)
+    return cache.get(('stat', _key(path)), _stat, path)
+
+def access(path, mode: int) -> bool:
+    """
+    Checks the access to a path with os.access, through the active cache.
+
+    *Examples:*
+
+    >>> access('C:\\Users\\User\\Desktop\\file.txt', os.W_OK) # returns True if the file is writable
+
+    :param path: The path to the file or directory.
+    :type path: str
+    :param mode: The access to check, os.R_OK, os.W_OK or os.X_OK.
+    :type mode: int
+    :return: True if the access is allowed, False otherwise.
+    :rtype: bool
+    """
+    cache = get_active()
+    if cache is None:
+        return os.access(path, mode)
+    return cache.get(('access', _key(path), mode), os.access, path, mode)
+
+def invalidate(*paths) -> None:
+    """
+    Drops the cached results of the given paths and the paths inside them,
+    or all the results if no path is given, from all the caches of the current thread.
+
+    *Examples:*
+
+    >>> invalidate('C:\\Users\\User\\Desktop\\file.txt') # the next check of the file reaches the file system
+
+    :param paths: The paths changed.
+    :type paths: str
+    """
+    for cache in getattr(_local, 'caches', ()):
+        cache.invalidate(*paths)
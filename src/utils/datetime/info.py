@@ -4,28 +4,299 @@ Inspired by
 """
 
 # Importing the required libraries
-from datetime import datetime
-from .validate import is_datetime
+from bisect import bisect_right
+from datetime import date as dt_date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Union
+from src.utils._regex import STRFTIME_DIRECTIVE_RE
+from .validate import is_datetime, _to_datetime64
 
 DEFAULT_TIME_FORMAT = '%H:%M:%S'
 DEFAULT_DATE_FORMAT = '%Y-%m-%d'
 
+# Rendered strings kept by date (or time) and format
+RENDER_CACHE_SIZE = 4096
+
+# strftime directives that only depend on the date or on the time ('%', 'n' and 't' are literals)
+DATE_DIRECTIVES = frozenset('aAbBCdDeFgGhjmuUVwWxyY%nt')
+TIME_DIRECTIVES = frozenset('HIklMpPrRSTfX%nt')
+
+# Renderers of common formats, same output as strftime for years from 1000 (strftime does not pad smaller years)
+FAST_RENDERERS = {
+    '%Y-%m-%d': lambda value: f'{value.year}-{value.month:02d}-{value.day:02d}',
+    '%Y%m%d': lambda value: f'{value.year}{value.month:02d}{value.day:02d}',
+    '%Y/%m/%d': lambda value: f'{value.year}/{value.month:02d}/{value.day:02d}',
+    '%d/%m/%Y': lambda value: f'{value.day:02d}/{value.month:02d}/{value.year}',
+    '%d-%m-%Y': lambda value: f'{value.day:02d}-{value.month:02d}-{value.year}',
+    '%m/%d/%Y': lambda value: f'{value.month:02d}/{value.day:02d}/{value.year}',
+    '%H:%M:%S': lambda value: f'{value.hour:02d}:{value.minute:02d}:{value.second:02d}',
+    '%H:%M': lambda value: f'{value.hour:02d}:{value.minute:02d}',
+    '%H:%M:%S.%f': lambda value: f'{value.hour:02d}:{value.minute:02d}:{value.second:02d}.{value.microsecond:06d}',
+    '%Y-%m-%dT%H:%M:%S': lambda value: f'{value.year}-{value.month:02d}-{value.day:02d}T'
+                                       f'{value.hour:02d}:{value.minute:02d}:{value.second:02d}',
+    '%Y-%m-%d %H:%M:%S': lambda value: f'{value.year}-{value.month:02d}-{value.day:02d} '
+                                       f'{value.hour:02d}:{value.minute:02d}:{value.second:02d}',
+}
+
+# Seconds between the offset checks made to find the transitions of a zone (shorter than any period between them)
+TRANSITION_SCAN_STEP = 6 * 3600
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+# Types
+
+class ZoneYear(NamedTuple):
+    """
+    UTC offsets of a zone during a year (and a day around it), segments sorted by their start.
+    """
+    starts: List[float]     # UTC timestamp where each segment starts, the first one is -inf
+    offsets: List[int]      # UTC offset of each segment, in seconds
+    names: List[str]        # tzname of each segment
+    walls: List[float]      # wall time (as a UTC timestamp) where each segment starts, for fold=0
+    walls_fold: List[float] # wall time where each segment starts, for fold=1
+
+# Rendering
+
+@lru_cache(maxsize=None)
+def _get_component(format: str) -> Optional[str]:
+    """
+    Gets the part of a datetime a format depends on: 'date', 'time' or None if both (or the timezone).
+    """
+    directives = set(STRFTIME_DIRECTIVE_RE.findall(format))
+    if directives <= DATE_DIRECTIVES:
+        return 'date'
+    if directives <= TIME_DIRECTIVES:
+        return 'time'
+    return None
+
+def _render(value: Union[dt_date, time], format: str) -> str:
+    """
+    Renders a date, time or datetime with a format, without strftime if it is a common format.
+    """
+    renderer = FAST_RENDERERS.get(format)
+    if renderer is not None and (isinstance(value, time) or value.year >= 1000):
+        return renderer(value)
+    return value.strftime(format)
+
+_render_cached = lru_cache(maxsize=RENDER_CACHE_SIZE)(_render)
+
+def render(date: datetime, format: str) -> str:
+    """
+    Renders a datetime with a strftime format, through a cache of the rendered strings.
+
+    Formats with only date directives (or only time directives) are cached by the date
+    (or the time) of the datetime, so all the datetimes of a day share the rendered date.
+    Common formats (eg: '%Y-%m-%d', '%H:%M:%S') are rendered without strftime.
+    The cache keeps RENDER_CACHE_SIZE strings; names of days and months are cached in the
+    locale of the first rendering, clear the cache (render_cache_clear) after changing it.
+
+    *Examples:*
+
+    >>> render(dt.datetime(2020, 1, 1, 10, 30), '%d/%m/%Y') # returns '01/01/2020'
+    >>> render(dt.datetime(2020, 1, 1, 10, 30), '%H:%M') # returns '10:30'
+
+    :param date: The datetime to render.
+    :type date: dt.datetime
+    :param format: The strftime format.
+    :type format: str
+    :return: The rendered datetime.
+    :rtype: str
+    """
+    component = _get_component(format)
+    if component == 'date':
+        return _render_cached(date.date(), format)
+    if component == 'time':
+        return _render_cached(date.time(), format)
+    return _render(date, format)
+
+def render_cache_clear() -> None:
+    """
+    Clears the cache of the rendered strings.
+    """
+    _render_cached.cache_clear()
+
+SEASONS = ('winter', 'spring', 'summer', 'autumn')
+
+# Timezones
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> tzinfo:
+    """
+    Gets a timezone by its IANA name, from a registry of the zones already loaded.
+    It needs zoneinfo (python 3.9 or later).
+
+    *Examples:*
+
+    >>> get_zone('Europe/Madrid') # returns zoneinfo.ZoneInfo(key='Europe/Madrid')
+
+    :param name: The IANA name of the zone.
+    :type name: str
+    :return: The timezone.
+    :rtype: zoneinfo.ZoneInfo
+    """
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(name)
+
+@lru_cache(maxsize=None)
+def _get_year_starts() -> List[int]:
+    """
+    Gets the UTC timestamp where each year (from 1) starts.
+    """
+    return [(dt_date(year, 1, 1).toordinal() - EPOCH_ORDINAL) * 86400 for year in range(1, 10000)]
+
+def _get_year(timestamp: float) -> int:
+    """
+    Gets the UTC year of a timestamp.
+    """
+    return bisect_right(_get_year_starts(), timestamp)
+
+def _get_offset(zone: tzinfo, timestamp: int) -> tuple:
+    """
+    Gets the UTC offset (seconds) and the tzname of a zone at a timestamp.
+    """
+    local = (EPOCH + timedelta(seconds=timestamp)).replace(tzinfo=timezone.utc).astimezone(zone)
+    return int(local.utcoffset().total_seconds()), local.tzname()
+
+@lru_cache(maxsize=None)
+def get_zone_year(name: str, year: int) -> ZoneYear:
+    """
+    Gets the UTC offsets of a zone during a year, finding its transitions once.
+
+    *Examples:*
+
+    >>> get_zone_year('Europe/Madrid', 2023).offsets # returns [3600, 7200, 3600]
+    >>> get_zone_year('Europe/Madrid', 2023).names # returns ['CET', 'CEST', 'CET']
+
+    :param name: The IANA name of the zone.
+    :type name: str
+    :param year: The year.
+    :type year: int
+    :return: The segments of the year with the same offset.
+    :rtype: ZoneYear
+    """
+    zone = get_zone(name)
+    # a day before and after the year, but inside the range of datetime in any zone
+    year_starts = _get_year_starts()
+    previous = max(year_starts[year - 1] - 86400, year_starts[0] + 86400)
+    end = year_starts[year] + 86400 if year < len(year_starts) else year_starts[-1] + 364 * 86400
+    offset, tzname = _get_offset(zone, previous)
+    starts, offsets, names = [float('-inf')], [offset], [tzname]
+    while previous < end:
+        current = min(previous + TRANSITION_SCAN_STEP, end)
+        if _get_offset(zone, current) != (offsets[-1], names[-1]):
+            # the transition is the first second with the new offset
+            low, high = previous, current
+            while high - low > 1:
+                middle = (low + high) // 2
+                if _get_offset(zone, middle) == (offsets[-1], names[-1]):
+                    low = middle
+                else:
+                    high = middle
+            offset, tzname = _get_offset(zone, high)
+            starts.append(high)
+            offsets.append(offset)
+            names.append(tzname)
+        previous = current
+    # a wall time repeated (or skipped) by a transition uses the offset before it with fold=0, after it with fold=1
+    walls = [starts[0]] + [start + max(before, after) for start, before, after in zip(starts[1:], offsets, offsets[1:])]
+    walls_fold = [starts[0]] + [start + min(before, after) for start, before, after in zip(starts[1:], offsets, offsets[1:])]
+    return ZoneYear(starts, offsets, names, walls, walls_fold)
+
+def _get_wall_segment(date: datetime, name: str) -> tuple:
+    """
+    Gets the segment of the zone year of a naive datetime read as a wall time of the zone,
+    and the wall time as a timestamp.
+    """
+    zone_year = get_zone_year(name, date.year)
+    wall = ((date.toordinal() - EPOCH_ORDINAL) * 86400 + date.hour * 3600 + date.minute * 60 + date.second
+            + date.microsecond / 1e6)
+    index = bisect_right(zone_year.walls_fold if date.fold else zone_year.walls, wall) - 1
+    return zone_year, index, wall
+
+def from_timestamp(timestamp: float, zone: str) -> datetime:
+    """
+    Converts a timestamp into an aware datetime of a zone, with the zone from the registry.
+    The C conversion of zoneinfo is faster than a table lookup in Python for a single timestamp,
+    the zone year tables are used by from_timestamp_many.
+
+    *Examples:*
+
+    >>> from_timestamp(1698541200, 'Europe/Madrid') # returns datetime(2023, 10, 29, 2, 0, fold=1, tzinfo=zoneinfo.ZoneInfo(key='Europe/Madrid'))
+
+    :param timestamp: The UTC timestamp.
+    :type timestamp: float
+    :param zone: The IANA name of the zone.
+    :type zone: str
+    :return: The datetime in the zone.
+    :rtype: dt.datetime
+    """
+    return datetime.fromtimestamp(timestamp, get_zone(zone))
+
+def from_timestamp_many(timestamps: Iterable[float], zone: str):
+    """
+    Converts timestamps into the wall times of a zone, looking up the offsets of the zone years in bulk.
+
+    *Examples:*
+
+    >>> from_timestamp_many([1688169600, 1704067200], 'Europe/Madrid') # returns array(['2023-07-01T02:00:00.000000', '2024-01-01T01:00:00.000000'], dtype='datetime64[us]')
+
+    :param timestamps: The UTC timestamps.
+    :type timestamps: Iterable[float]
+    :param zone: The IANA name of the zone.
+    :type zone: str
+    :return: The naive wall times in the zone.
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if timestamps.size == 0:
+        return np.array([], dtype='datetime64[us]')
+    starts, offsets = [], []
+    year_starts = _get_year_starts()
+    for year in range(_get_year(timestamps.min()), _get_year(timestamps.max()) + 1):
+        zone_year = get_zone_year(zone, year)
+        first, last = year_starts[year - 1], year_starts[year] if year < len(year_starts) else float('inf')
+        # the segment in force when the year starts, then the transitions of the year
+        index = bisect_right(zone_year.starts, first) - 1
+        starts.append(first)
+        offsets.append(zone_year.offsets[index])
+        for start, offset in zip(zone_year.starts[index + 1:], zone_year.offsets[index + 1:]):
+            if start < last:
+                starts.append(start)
+                offsets.append(offset)
+    indexes = np.searchsorted(np.array(starts, dtype=np.float64), timestamps, side='right') - 1
+    # whole seconds and microseconds apart, rounded as datetime.fromtimestamp
+    seconds = np.floor(timestamps)
+    microseconds = np.round((timestamps - seconds) * 1e6).astype(np.int64)
+    walls = seconds.astype(np.int64) + np.array(offsets, dtype=np.int64)[np.maximum(indexes, 0)]
+    return (walls * 1000000 + microseconds).astype('datetime64[us]')
+
 # Get information about a datetime
 
-def get_timestamp(date: datetime) -> int:
+def get_timestamp(date: datetime, zone: Optional[str] = None) -> int:
     """
     Gets the timestamp of a datetime.
+    A naive datetime is a local time, or a wall time of the zone if given (fold picks the
+    first or the second of a repeated wall time, as in datetime).
 
     *Examples:*
 
     >>> get_timestamp(dt.datetime(2020, 1, 1)) # returns 1577836800
+    >>> get_timestamp(dt.datetime(2020, 1, 1), 'Europe/Madrid') # returns 1577833200
+    >>> get_timestamp(dt.datetime(2023, 10, 29, 2, 30, fold=1), 'Europe/Madrid') # returns 1698543000
 
     :param date: The datetime to get the timestamp of.
     :type date: dt.datetime
+    :param zone: The IANA name of the zone of a naive datetime, None for the local time.
+    :type zone: str
     :return: The timestamp of the datetime.
     :rtype: int
     """
     if is_datetime(date):
+        if zone is not None and date.tzinfo is None:
+            zone_year, index, wall = _get_wall_segment(date, zone)
+            return int(wall - zone_year.offsets[index])
         return int(date.timestamp())
     else:
         return None
@@ -37,14 +308,17 @@ def get_time(date: datetime, format=DEFAULT_TIME_FORMAT) -> str:
     *Examples:*
 
     >>> get_time(dt.datetime(2020, 1, 1)) # returns '00:00:00'
+    >>> get_time(dt.datetime(2020, 1, 1, 10, 30), '%H:%M') # returns '10:30'
 
     :param date: The datetime to get the time of.
     :type date: dt.datetime
+    :param format: The strftime format of the time.
+    :type format: str
     :return: The time of the datetime.
     :rtype: str
     """
     if is_datetime(date):
-        return date.strftime('%H:%M:%S')
+        return render(date, format)
     else:
         return None
     
@@ -55,32 +329,48 @@ def get_date(date: datetime, format=DEFAULT_DATE_FORMAT) -> str:
     *Examples:*
 
     >>> get_date(dt.datetime(2020, 1, 1)) # returns '2020-01-01'
+    >>> get_date(dt.datetime(2020, 1, 1), '%d/%m/%Y') # returns '01/01/2020'
 
     :param date: The datetime to get the date of.
     :type date: dt.datetime
+    :param format: The strftime format of the date.
+    :type format: str
     :return: The date of the datetime.
     :rtype: str
     """
     if is_datetime(date):
-        return date.strftime('%Y-%m-%d')
+        return render(date, format)
     else:
         return None
 
-def get_timezone(date: datetime) -> str:
+def get_timezone(date: datetime, zone: Optional[str] = None) -> str:
     """
     Gets the timezone of a datetime.
+    With a zone, gets the name the zone gives to the datetime (a naive datetime is a wall time of the zone).
 
     *Examples:*
 
-    >>> get_timezone(dt.datetime(2020, 1, 1)) # returns 'UTC'
+    >>> get_timezone(dt.datetime(2020, 1, 1)) # returns None
+    >>> get_timezone(dt.datetime(2020, 1, 1, tzinfo=dt.timezone.utc)) # returns 'UTC'
+    >>> get_timezone(dt.datetime(2020, 7, 1), 'Europe/Madrid') # returns 'CEST'
+    >>> get_timezone(dt.datetime(2020, 7, 1, tzinfo=dt.timezone.utc), 'America/New_York') # returns 'EDT'
 
     :param date: The datetime to get the timezone of.
     :type date: dt.datetime
+    :param zone: The IANA name of the zone, None for the timezone of the datetime.
+    :type zone: str
     :return: The timezone of the datetime.
     :rtype: str
     """
     if is_datetime(date):
-        return date.tzname()
+        if zone is None:
+            return date.tzname()
+        if date.tzinfo is None:
+            zone_year, index, _ = _get_wall_segment(date, zone)
+            return zone_year.names[index]
+        timestamp = date.timestamp()
+        zone_year = get_zone_year(zone, _get_year(timestamp))
+        return zone_year.names[bisect_right(zone_year.starts, timestamp) - 1]
     else:
         return None
 
@@ -125,6 +415,27 @@ def get_season(date: datetime) -> str:
         elif date.month in (9, 10, 11):
             return 'autumn'
 
+def get_season_many(dates: Iterable):
+    """
+    Gets the season of each datetime.
+
+    *Examples:*
+
+    >>> get_season_many([dt.datetime(2020, 1, 1), dt.datetime(2020, 7, 1)]) # returns array(['winter', 'summer'], dtype=object)
+
+    :param dates: The datetimes to get the season of.
+    :type dates: Iterable
+    :return: The season of each datetime, None for NaT.
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+    months = _to_datetime64(dates, 'M')
+    seasons = np.array(SEASONS + (None,), dtype=object)
+    # december, january and february are winter, then every three months
+    indexes = (months.astype(np.int64) + 1) % 12 // 3
+    indexes[np.isnat(months)] = len(SEASONS)
+    return seasons[indexes]
+
 def get_quarter(date: datetime) -> int:
     """
     Calculates the quarter of a given date.
@@ -143,6 +454,24 @@ def get_quarter(date: datetime) -> int:
     else:
         return 0
     
+def get_quarter_many(dates: Iterable):
+    """
+    Calculates the quarter of each datetime.
+
+    *Examples*:
+
+    >>> get_quarter_many([datetime(2000, 12, 31, 23, 59, 59), datetime(2090, 5, 31)]) # returns array([4, 2])
+
+    :param dates: datetimes
+    :return: quarter of each datetime, 0 for NaT
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+    months = _to_datetime64(dates, 'M')
+    quarters = months.astype(np.int64) % 12 // 3 + 1
+    quarters[np.isnat(months)] = 0
+    return quarters
+
 def get_day_of_year(date: datetime) -> int:
     """
     Calculates the day of the year of a given date.
@@ -160,3 +489,21 @@ def get_day_of_year(date: datetime) -> int:
         return date.timetuple().tm_yday
     else:
         return 0
+
+def get_day_of_year_many(dates: Iterable):
+    """
+    Calculates the day of the year of each datetime.
+
+    *Examples*:
+
+    >>> get_day_of_year_many([datetime(2000, 12, 31, 23, 59, 59), datetime(2090, 12, 31, 23, 59, 59)]) # returns array([366, 365])
+
+    :param dates: datetimes
+    :return: day of the year of each datetime, 0 for NaT
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+    days = _to_datetime64(dates, 'D')
+    days_of_year = (days - days.astype('datetime64[Y]')).astype(np.int64) + 1
+    days_of_year[np.isnat(days)] = 0
+    return days_of_year
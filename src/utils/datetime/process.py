@@ -0,0 +1,245 @@
+"""
+This file contains functions for processing datetimes.
+"""
+
+# Importing the required libraries
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Iterable, Union
+from .validate import _to_datetime64
+
+# Constants
+BUSINESS_WEEKDAYS = (0, 1, 2, 3, 4)
+
+class BusinessCalendar:
+    """
+    Business day arithmetic against a set of holidays.
+
+    Business days are the days of the week in weekdays (monday to friday by default) that are
+    not holidays. The calendar keeps the number of business days before each day of the week
+    and the sorted holidays, so counting the business days between two dates is O(log holidays),
+    and adding business days is too, whatever the distance between the dates.
+
+    The days can be dates or datetimes, a datetime keeps its time. The batch functions
+    (count_many, add_many, is_business_day_many) need numpy.
+
+    *Examples:*
+
+    >>> calendar = BusinessCalendar([date(2023, 8, 15), date(2023, 12, 25)])
+    >>> calendar.count(date(2023, 8, 14), date(2023, 8, 21)) # returns 4
+    >>> calendar.add(date(2023, 8, 14), 1) # returns date(2023, 8, 16)
+    >>> calendar.next_business_day(date(2023, 8, 18)) # returns date(2023, 8, 21)
+    >>> calendar.previous_business_day(date(2023, 8, 16)) # returns date(2023, 8, 14)
+    """
+
+    def __init__(self, holidays: Iterable[date] = (), weekdays: Iterable[int] = BUSINESS_WEEKDAYS):
+        """
+        :param holidays: The holidays, dates or datetimes.
+        :type holidays: Iterable[date]
+        :param weekdays: The days of the week that are business days, 0 is monday and 6 is sunday.
+        :type weekdays: Iterable[int]
+        """
+        self.weekdays = tuple(sorted(set(weekdays)))
+        if not self.weekdays or not all(0 <= weekday <= 6 for weekday in self.weekdays):
+            raise ValueError('weekdays must be between 0 (monday) and 6 (sunday)')
+        # Business days of the week before each day of the week
+        self._week_before = [sum(1 for weekday in self.weekdays if weekday < day) for day in range(8)]
+        # Holidays on business days of the week, as days since 0001-01-01 (a monday)
+        self.holidays = tuple(sorted({_to_date(holiday) for holiday in holidays
+                                      if holiday.weekday() in self.weekdays}))
+        self._holidays = [holiday.toordinal() - 1 for holiday in self.holidays]
+        self._holiday_set = frozenset(self._holidays)
+        self._busdaycalendar = None
+
+    def _index(self, day: int) -> int:
+        """
+        Counts the business days before a day (days since 0001-01-01).
+        """
+        weeks, weekday = divmod(day, 7)
+        return weeks * len(self.weekdays) + self._week_before[weekday] - bisect_left(self._holidays, day)
+
+    def _day(self, index: int) -> int:
+        """
+        Gets the business day (days since 0001-01-01) with index business days before it.
+        """
+        holidays = 0
+        while True:
+            # the (index + holidays)th business day of the week, then skip the holidays up to it
+            weeks, weekday = divmod(index + holidays, len(self.weekdays))
+            day = weeks * 7 + self.weekdays[weekday]
+            found = bisect_right(self._holidays, day)
+            if found == holidays:
+                return day
+            holidays = found
+
+    def is_business_day(self, day: Union[date, datetime]) -> bool:
+        """
+        Checks if a day is a business day.
+
+        *Examples:*
+
+        >>> BusinessCalendar([date(2023, 8, 15)]).is_business_day(date(2023, 8, 14)) # returns True
+        >>> BusinessCalendar([date(2023, 8, 15)]).is_business_day(date(2023, 8, 15)) # returns False
+
+        :param day: The day to check.
+        :type day: date
+        :return: True if the day is a business day, False otherwise.
+        :rtype: bool
+        """
+        return day.weekday() in self.weekdays and day.toordinal() - 1 not in self._holiday_set
+
+    def count(self, start: Union[date, datetime], end: Union[date, datetime]) -> int:
+        """
+        Counts the business days from start (included) to end (excluded),
+        negative if end is before start.
+
+        *Examples:*
+
+        >>> BusinessCalendar([date(2023, 8, 15)]).count(date(2023, 8, 14), date(2023, 8, 21)) # returns 4
+        >>> BusinessCalendar([date(2023, 8, 15)]).count(date(2023, 8, 21), date(2023, 8, 14)) # returns -4
+
+        :param start: The first day.
+        :type start: date
+        :param end: The day after the last day.
+        :type end: date
+        :return: The number of business days.
+        :rtype: int
+        """
+        return self._index(end.toordinal() - 1) - self._index(start.toordinal() - 1)
+
+    def add(self, day: Union[date, datetime], days: int) -> Union[date, datetime]:
+        """
+        Adds business days to a day (or subtracts them if days is negative).
+        A day that is not a business day moves to the next business day first.
+
+        *Examples:*
+
+        >>> BusinessCalendar([date(2023, 8, 15)]).add(date(2023, 8, 14), 1) # returns date(2023, 8, 16)
+        >>> BusinessCalendar([date(2023, 8, 15)]).add(date(2023, 8, 19), 0) # returns date(2023, 8, 21)
+        >>> BusinessCalendar([date(2023, 8, 15)]).add(date(2023, 8, 19), -1) # returns date(2023, 8, 18)
+
+        :param day: The day to start from.
+        :type day: date
+        :param days: The number of business days to add.
+        :type days: int
+        :return: The business day reached, with the time of day if it is a datetime.
+        :rtype: date
+        """
+        ordinal = day.toordinal() - 1
+        return day + timedelta(days=self._day(self._index(ordinal) + days) - ordinal)
+
+    def next_business_day(self, day: Union[date, datetime]) -> Union[date, datetime]:
+        """
+        Gets the first business day after a day.
+
+        *Examples:*
+
+        >>> BusinessCalendar().next_business_day(date(2023, 8, 18)) # returns date(2023, 8, 21)
+
+        :param day: The day.
+        :type day: date
+        :return: The next business day.
+        :rtype: date
+        """
+        return self.add(day + timedelta(days=1), 0)
+
+    def previous_business_day(self, day: Union[date, datetime]) -> Union[date, datetime]:
+        """
+        Gets the last business day before a day.
+
+        *Examples:*
+
+        >>> BusinessCalendar().previous_business_day(date(2023, 8, 21)) # returns date(2023, 8, 18)
+
+        :param day: The day.
+        :type day: date
+        :return: The previous business day.
+        :rtype: date
+        """
+        return self.add(day, -1)
+
+    def get_busdaycalendar(self):
+        """
+        Gets the calendar as a numpy.busdaycalendar, to use with the numpy business day functions.
+
+        :return: The numpy calendar.
+        :rtype: numpy.busdaycalendar
+        """
+        if self._busdaycalendar is None:
+            import numpy as np
+            self._busdaycalendar = np.busdaycalendar(weekmask=[day in self.weekdays for day in range(7)],
+                                                     holidays=_to_datetime64(self.holidays, 'D'))
+        return self._busdaycalendar
+
+    def is_business_day_many(self, days: Iterable):
+        """
+        Checks which days are business days.
+
+        *Examples:*
+
+        >>> BusinessCalendar([date(2023, 8, 15)]).is_business_day_many([date(2023, 8, 14), date(2023, 8, 15)]) # returns array([ True, False])
+
+        :param days: The days to check, a datetime64 array or a list of dates.
+        :type days: Iterable
+        :return: True for each business day, False otherwise (or NaT).
+        :rtype: numpy.ndarray
+        """
+        import numpy as np
+        days = _to_datetime64(days, 'D')
+        valid = ~np.isnat(days)
+        result = np.zeros(days.shape, dtype=bool)
+        result[valid] = np.is_busday(days[valid], busdaycal=self.get_busdaycalendar())
+        return result
+
+    def count_many(self, starts: Iterable, ends: Iterable):
+        """
+        Counts the business days between each pair of days, as count.
+
+        *Examples:*
+
+        >>> BusinessCalendar([date(2023, 8, 15)]).count_many([date(2023, 8, 14)], [date(2023, 8, 21)]) # returns array([4])
+
+        :param starts: The first days, a datetime64 array or a list of dates.
+        :type starts: Iterable
+        :param ends: The days after the last days.
+        :type ends: Iterable
+        :return: The number of business days of each pair.
+        :rtype: numpy.ndarray
+        """
+        import numpy as np
+        starts, ends = _to_datetime64(starts, 'D'), _to_datetime64(ends, 'D')
+        # numpy counts (end, start] when end is before start, count gives minus the count from end to start
+        counts = np.busday_count(np.minimum(starts, ends), np.maximum(starts, ends), busdaycal=self.get_busdaycalendar())
+        return np.where(ends < starts, -counts, counts)
+
+    def add_many(self, days: Iterable, counts: Union[int, Iterable[int]]):
+        """
+        Adds business days to each day, as add. The days keep their time of day, if they have it.
+
+        *Examples:*
+
+        >>> BusinessCalendar([date(2023, 8, 15)]).add_many([date(2023, 8, 14), date(2023, 8, 19)], 1) # returns array(['2023-08-16', '2023-08-22'], dtype='datetime64[D]')
+        >>> BusinessCalendar().add_many([datetime(2023, 8, 19, 10, 30)], 1) # returns array(['2023-08-22T10:30:00.000000'], dtype='datetime64[us]')
+
+        :param days: The days to start from, a datetime64 array or a list of dates.
+        :type days: Iterable
+        :param counts: The number of business days to add, to all the days or to each one.
+        :type counts: Union[int, Iterable[int]]
+        :return: The business days reached, with the unit of days (datetime64[D] for dates).
+        :rtype: numpy.ndarray
+        """
+        import numpy as np
+        days = _to_datetime64(days, None)
+        dates = days.astype('datetime64[D]')
+        result = np.busday_offset(dates, counts, roll='forward', busdaycal=self.get_busdaycalendar())
+        # add the time of day back
+        return result if days.dtype == dates.dtype else result + (days - dates)
+
+    def __repr__(self) -> str:
+        return 'BusinessCalendar(holidays={}, weekdays={})'.format(len(self.holidays), self.weekdays)
+
+def _to_date(day: Union[date, datetime]) -> date:
+    """
+    Gets the date of a date or datetime.
+    """
+    return day.date() if isinstance(day, datetime) else day
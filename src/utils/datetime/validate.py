@@ -6,15 +6,127 @@ https://dateutil.readthedocs.io/en/stable/examples.html#parse-examples
 """
 
 # Importing the required libraries
+import re
 import dateutil.parser as dtp
-from datetime import datetime
+import dateutil.tz as dttz
+from collections import Counter
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, Hashable, Iterable, List, NamedTuple, Optional
+from src.utils._regex import ISO_DATETIME_RE, STRFTIME_DIRECTIVE_RE
 from src.utils.string.validate import is_string
 
+# Number of strings of a column used to infer its format
+PARSE_SAMPLE_SIZE = 100
+# Format given by parse_column to columns of ISO 8601 / RFC 3339 strings (of any precision)
+ISO_FORMAT = 'ISO 8601'
+# Regex groups of the directives of the formats parse_column turns into a dedicated parser
+FORMAT_GROUPS = {'Y': r'(\d{4})', 'm': r'(\d{1,2})', 'd': r'(\d{1,2})', 'H': r'(\d{1,2})',
+                 'M': r'(\d{1,2})', 'S': r'(\d{1,2})', 'f': r'(\d{1,6})'}
+
+# Formats tried (in order) to find the format of a column, the first one giving the same
+# datetime as dateutil is remembered
+DATETIME_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M', '%Y-%m-%dT%H', '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M',
+    '%Y%m%dT%H%M%S.%f%z', '%Y%m%dT%H%M%S%z', '%Y%m%dT%H%M%S.%f', '%Y%m%dT%H%M%S', '%Y%m%dT%H%M',
+    '%Y%m%dT%H', '%Y%m%d%H%M%S', '%Y%m%d%H%M', '%Y%m%d',
+    '%Y/%m/%d %H:%M:%S', '%Y/%m/%d %H:%M', '%Y/%m/%d', '%Y.%m.%d',
+    '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M', '%m/%d/%Y', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y',
+    '%m-%d-%Y', '%d-%m-%Y', '%d.%m.%Y %H:%M:%S', '%d.%m.%Y', '%m/%d/%y', '%d/%m/%y', '%m-%d-%y',
+    '%Y-%b-%d', '%d-%b-%Y', '%b-%d-%Y', '%Y %b %d', '%d %b %Y', '%b %d %Y', '%d %B %Y', '%B %d %Y',
+    '%B %d, %Y', '%b %d, %Y', '%a, %d %b %Y %H:%M:%S %z', '%a %b %d %H:%M:%S %Y',
+)
+
+# Last format that parsed each column
+_column_formats = {}
+
+# Types
+
+class ParsedColumn(NamedTuple):
+    """
+    Result of parse_column.
+    """
+    values: List[Optional[datetime]]   # None where the string could not be parsed
+    errors: List[bool]                 # True where the string could not be parsed
+    format: Optional[str]              # strptime format (or ISO_FORMAT) inferred, None if none was found
+
+def _get_tzinfo(seconds: int) -> dttz.tzoffset:
+    """
+    Gets the tzinfo dateutil gives to a UTC offset.
+    """
+    return dttz.UTC if seconds == 0 else dttz.tzoffset(None, seconds)
+
+def _parse_iso(input_string: str) -> Optional[datetime]:
+    """
+    Parses a strict ISO 8601 / RFC 3339 string building the datetime directly,
+    returns None if the string has another format or is not a valid date.
+    """
+    match = ISO_DATETIME_RE.match(input_string)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction, utc, sign, offset_hours, offset_minutes = match.groups()
+    if utc is not None:
+        tzinfo = dttz.UTC
+    elif sign is not None:
+        offset = int(offset_hours) * 3600 + int(offset_minutes) * 60
+        tzinfo = _get_tzinfo(-offset if sign == '-' else offset)
+    else:
+        tzinfo = None
+    try:
+        return datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0),
+                        int(fraction[:6].ljust(6, '0')) if fraction else 0, tzinfo)
+    except ValueError:
+        return None
+
+def _parse_format(input_string: str, format: str) -> Optional[datetime]:
+    """
+    Parses a string with a strptime format, with the tzinfo dateutil would give,
+    returns None if the string does not match the format.
+    """
+    try:
+        dt_object = datetime.strptime(input_string, format)
+    except ValueError:
+        return None
+    if dt_object.tzinfo is not None:
+        dt_object = dt_object.replace(tzinfo=_get_tzinfo(int(dt_object.utcoffset().total_seconds())))
+    return dt_object
+
+def _infer_format(input_string: str, dt_object: datetime) -> Optional[str]:
+    """
+    Finds the first format of DATETIME_FORMATS that parses the string into the same datetime.
+    """
+    for format in DATETIME_FORMATS:
+        if _parse_format(input_string, format) == dt_object:
+            return format
+    return None
+
+def forget_formats(column: Optional[Hashable] = None) -> None:
+    """
+    Forgets the format remembered for a column, or for all the columns.
+
+    *Examples*:
+
+    >>> forget_formats('created_at') # the next parse of the column infers the format again
+    >>> forget_formats() # forgets all the columns
+
+    :param column: Column to forget, None to forget all.
+    :type column: Hashable
+    """
+    if column is None:
+        _column_formats.clear()
+    else:
+        _column_formats.pop(column, None)
 
-def parse(input_string: str) -> datetime:
+def parse(input_string: str, column: Optional[Hashable] = None) -> datetime:
     """
     Parses a string into a datetime object.
 
+    Strict ISO 8601 / RFC 3339 strings are parsed directly. With a column, the format
+    that parsed the last string of the column is tried next, and when dateutil parses
+    a string, its format is inferred and remembered for the column.
+    Any other string is parsed by dateutil.
+
     *Examples*:
 
     ISO format, without separators:
@@ -78,12 +190,32 @@ def parse(input_string: str) -> datetime:
     >>> parse("2003-09-25T10Z") # returns datetime.datetime(2003, 9, 25, 10, 0, tzinfo=tzutc())
     >>> parse("2003-09-25Z") # returns datetime.datetime(2003, 9, 25, 0, 0, tzinfo=tzutc())
 
+    Strings of a column (eg: a csv column) usually share a format:
+
+    >>> parse("25/09/2003 10:49", column="created_at") # parsed by dateutil, remembers '%d/%m/%Y %H:%M'
+    >>> parse("26/09/2003 08:15", column="created_at") # parsed with the remembered format
+
     :param input_string: String to parse
+    :param column: Key of the column of the string, None to not remember the format.
     :return: datetime object
     """
-    return dtp.parse(input_string)
-
-def is_parseable(input_string: str) -> bool:
+    dt_object = _parse_iso(input_string)
+    if dt_object is not None:
+        return dt_object
+    if column is None:
+        return dtp.parse(input_string)
+    format = _column_formats.get(column)
+    if format is not None:
+        dt_object = _parse_format(input_string, format)
+        if dt_object is not None:
+            return dt_object
+    dt_object = dtp.parse(input_string)
+    format = _infer_format(input_string, dt_object)
+    if format is not None:
+        _column_formats[column] = format
+    return dt_object
+
+def is_parseable(input_string: str, column: Optional[Hashable] = None) -> bool:
     """
     Checks if a string is parseable into a datetime object.
     If it is not parseable, it returns False.
@@ -95,17 +227,18 @@ def is_parseable(input_string: str) -> bool:
     >>> is_parseable("20030925T104941-0300") # returns True
 
     :param input_string: String to parse
+    :param column: Key of the column of the string, None to not remember the format.
     :return: True if the string is parseable, False otherwise.
     :rtype: bool
     """
     try:
-        dt_object = parse(input_string)
+        dt_object = parse(input_string, column)
         return isinstance(dt_object, datetime)
     except ValueError as e:
         print(e)
         return False
 
-def str_to_datetime(input_string) -> datetime:
+def str_to_datetime(input_string, column: Optional[Hashable] = None) -> datetime:
     """
     Converts a string into a datetime object.
     If it is not parseable, it returns None.
@@ -118,12 +251,13 @@ def str_to_datetime(input_string) -> datetime:
     >>> str_to_datetime("20030925T1049") # returns datetime.datetime(2003, 9, 25, 10, 49)
 
     :param input_string: String to parse
+    :param column: Key of the column of the string, None to not remember the format.
     :return: datetime object
     :rtype: datetime
     """
     if is_string(input_string):
         try:
-            dt_object = parse(input_string)
+            dt_object = parse(input_string, column)
             if isinstance(dt_object, datetime):
                 return dt_object
             else:
@@ -132,6 +266,108 @@ def str_to_datetime(input_string) -> datetime:
             print(e)
             return None
 
+@lru_cache(maxsize=None)
+def _compile_format(format: str) -> Callable[[str], Optional[datetime]]:
+    """
+    Compiles a strptime format into a parser of strings giving None on mismatch.
+    Numeric formats (year, month, day, hour, minute, second, fraction) get a regex building
+    the datetime directly, the other formats use strptime.
+    """
+    if format == ISO_FORMAT:
+        return _parse_iso
+    pattern, fields, position = [], [], 0
+    for match in STRFTIME_DIRECTIVE_RE.finditer(format):
+        directive = match.group(1)
+        if len(match.group(0)) != 2 or directive not in FORMAT_GROUPS or directive in fields:
+            return lambda input_string: _parse_format(input_string, format)
+        pattern.append(re.escape(format[position:match.start()]))
+        pattern.append(FORMAT_GROUPS[directive])
+        fields.append(directive)
+        position = match.end()
+    pattern.append(re.escape(format[position:]))
+    if not {'Y', 'm', 'd'} <= set(fields):
+        return lambda input_string: _parse_format(input_string, format)
+    match_format = re.compile(''.join(pattern)).fullmatch
+    indexes = [fields.index(directive) if directive in fields else None for directive in 'YmdHMSf']
+
+    def parse_format(input_string: str) -> Optional[datetime]:
+        match = match_format(input_string)
+        if match is None:
+            return None
+        groups = match.groups()
+        values = [0 if index is None else groups[index] for index in indexes]
+        if values[6]:
+            values[6] = values[6].ljust(6, '0')
+        try:
+            return datetime(*map(int, values))
+        except ValueError:
+            return None
+
+    return parse_format
+
+def _infer_column_format(sample: List[str]) -> Optional[str]:
+    """
+    Infers the format of a column from a sample of its strings: of the formats that give the same
+    datetime as dateutil for some string, the one parsing most of the sample (ISO_FORMAT first).
+    """
+    agreeing = Counter()
+    for input_string in sample:
+        if _parse_iso(input_string) is not None:
+            agreeing[ISO_FORMAT] += 1
+            continue
+        try:
+            format = _infer_format(input_string, dtp.parse(input_string))
+        except (ValueError, OverflowError):
+            continue
+        if format is not None:
+            agreeing[format] += 1
+    if not agreeing:
+        return None
+    candidates = [ISO_FORMAT] + [format for format in DATETIME_FORMATS if format in agreeing]
+    parsed = {format: sum(1 for input_string in sample if _compile_format(format)(input_string) is not None)
+              for format in candidates if format in agreeing}
+    return max(parsed, key=lambda format: (parsed[format], agreeing[format]))
+
+def parse_column(strings: Iterable[str], sample_size: int = PARSE_SAMPLE_SIZE) -> ParsedColumn:
+    """
+    Parses a column of strings (eg: a csv column) sharing a format into datetime objects.
+
+    The format is inferred from the first sample_size strings, and compiled into a parser that is
+    applied to the whole column. Only the strings it does not match are parsed one by one, as parse does
+    (remembering the format of the last one).
+    The strings that can not be parsed are reported in the errors mask instead of printed.
+
+    *Examples*:
+
+    >>> parse_column(["25/09/2003 10:49", "10/09/2003 08:15", "invalid"]) # returns ParsedColumn(values=[datetime.datetime(2003, 9, 25, 10, 49), datetime.datetime(2003, 9, 10, 8, 15), None], errors=[False, False, True], format='%d/%m/%Y %H:%M')
+    >>> parse_column(["2003-09-25T10:49:41Z", "2003-09-25"]).format # returns 'ISO 8601'
+
+    :param strings: Strings to parse
+    :param sample_size: Number of strings used to infer the format
+    :return: The datetime objects, the errors mask and the format inferred
+    :rtype: ParsedColumn
+    """
+    strings = strings if isinstance(strings, list) else list(strings)
+    sample = [input_string for input_string in strings[:sample_size] if is_string(input_string)]
+    format = _infer_column_format(sample)
+    parse_format = _compile_format(format) if format is not None else lambda input_string: None
+    values, errors = [], []
+    # the mismatches remember their own format, in case they share one
+    mismatches = object()
+    try:
+        for input_string in strings:
+            dt_object = parse_format(input_string) if is_string(input_string) else None
+            if dt_object is None and is_string(input_string):
+                try:
+                    dt_object = parse(input_string, mismatches)
+                except (ValueError, OverflowError):
+                    pass
+            values.append(dt_object)
+            errors.append(dt_object is None)
+    finally:
+        forget_formats(mismatches)
+    return ParsedColumn(values, errors, format)
+
 def is_datetime(object) -> bool:
     """
     Checks if an object is a datetime object.
@@ -152,6 +388,38 @@ def is_datetime(object) -> bool:
         print(e)
         return False
 
+# Batch functions: they take a datetime64 array (or a list of datetimes or ISO strings,
+# converting it costs about as much as one call per item) and return a numpy array,
+# numpy is only needed to call them (pip install pyutils[numpy])
+
+def _to_naive_utc(date):
+    """
+    Converts an aware datetime to a naive one in UTC, as numpy datetime64 has no timezone.
+    Other values are returned as they are.
+    """
+    if isinstance(date, datetime) and date.tzinfo is not None:
+        return date.astimezone(timezone.utc).replace(tzinfo=None)
+    return date
+
+def _to_datetime64(dates: Iterable, unit: Optional[str] = 'us'):
+    """
+    Converts dates into a numpy datetime64 array, None values become NaT and
+    aware datetimes are converted to UTC.
+    With unit None, numpy picks it: days for dates, microseconds for datetimes.
+    """
+    import numpy as np
+    dtype = 'datetime64' if unit is None else 'datetime64[{}]'.format(unit)
+    if not isinstance(dates, np.ndarray):
+        dates = [_to_naive_utc(date) for date in dates]
+    return np.asarray(dates, dtype=dtype)
+
+def _now64(now: Optional[datetime] = None):
+    """
+    Captures the current datetime (or the given one, in UTC if it is aware) once, as a numpy datetime64.
+    """
+    import numpy as np
+    return np.datetime64(datetime.now() if now is None else _to_naive_utc(now), 'us')
+
 def is_future(date: datetime) -> bool:
     """
     Checks if a datetime object is in the future.
@@ -170,6 +438,21 @@ def is_future(date: datetime) -> bool:
     else:
         return False
 
+def is_future_many(dates: Iterable, now: Optional[datetime] = None):
+    """
+    Checks which datetimes are in the future, all of them compared with the same now.
+
+    *Examples*:
+
+    >>> is_future_many([datetime(2090, 12, 31, 23, 59, 59), datetime(2000, 12, 31, 23, 59, 59)]) # returns array([ True, False])
+
+    :param dates: datetimes to check
+    :param now: datetime to compare with, the current one if None
+    :return: True for each date in the future, False otherwise (or NaT).
+    :rtype: numpy.ndarray
+    """
+    return _to_datetime64(dates) > _now64(now)
+
 def is_past(date: datetime) -> bool:
     """
     Checks if a datetime object is in the past.
@@ -188,6 +471,21 @@ def is_past(date: datetime) -> bool:
     else:
         return False
 
+def is_past_many(dates: Iterable, now: Optional[datetime] = None):
+    """
+    Checks which datetimes are in the past, all of them compared with the same now.
+
+    *Examples*:
+
+    >>> is_past_many([datetime(2090, 12, 31, 23, 59, 59), datetime(2000, 12, 31, 23, 59, 59)]) # returns array([False,  True])
+
+    :param dates: datetimes to check
+    :param now: datetime to compare with, the current one if None
+    :return: True for each date in the past, False otherwise (or NaT).
+    :rtype: numpy.ndarray
+    """
+    return _to_datetime64(dates) < _now64(now)
+
 def is_today(date: datetime) -> bool:
     """
     Checks if a string is parseable into a datetime object.
@@ -209,7 +507,22 @@ def is_today(date: datetime) -> bool:
     else:
         return False
 
-def is_business_day(date: datetime) -> bool:
+def is_today_many(dates: Iterable, now: Optional[datetime] = None):
+    """
+    Checks which datetimes are today, all of them compared with the same now.
+
+    *Examples*:
+
+    >>> is_today_many([datetime(2000, 12, 31, 23, 59, 59), datetime.now()]) # returns array([False,  True])
+
+    :param dates: datetimes to check
+    :param now: datetime to compare with, the current one if None
+    :return: True for each date that is today, False otherwise (or NaT).
+    :rtype: numpy.ndarray
+    """
+    return _to_datetime64(dates, 'D') == _now64(now).astype('datetime64[D]')
+
+def is_business_day(date: datetime, calendar=None) -> bool:
     """
     Checks if a datetime object is a business day.
     A business day is a weekday that is not a holiday.
@@ -219,16 +532,44 @@ def is_business_day(date: datetime) -> bool:
     >>> is_business_day(datetime(2090, 12, 31, 23, 59, 59)) # returns True
     >>> is_business_day(datetime(2000, 12, 31, 23, 59, 59)) # returns True
     >>> is_business_day(datetime.now()) # returns True
+    >>> is_business_day(datetime(2023, 8, 15), BusinessCalendar([date(2023, 8, 15)])) # returns False
 
     :param date: datetime object
+    :param calendar: BusinessCalendar with the holidays, None for monday to friday without holidays
     :return: True if the date is a business day, False otherwise.
     :rtype: bool
     """
     if is_datetime(date):
+        if calendar is not None:
+            return calendar.is_business_day(date)
         return date.weekday() < 5
     else:
         return False
 
+def is_business_day_many(dates: Iterable, calendar=None):
+    """
+    Checks which datetimes are business days (weekdays).
+
+    *Examples*:
+
+    >>> is_business_day_many([datetime(2090, 12, 31, 23, 59, 59), datetime(2000, 12, 31, 23, 59, 59)]) # returns array([False, False])
+    >>> is_business_day_many([datetime(2023, 8, 4), datetime(2023, 8, 5)]) # returns array([ True, False])
+    >>> is_business_day_many([datetime(2023, 8, 14), datetime(2023, 8, 15)], BusinessCalendar([date(2023, 8, 15)])) # returns array([ True, False])
+
+    :param dates: datetimes to check
+    :param calendar: BusinessCalendar with the holidays, None for monday to friday without holidays
+    :return: True for each date that is a business day, False otherwise (or NaT).
+    :rtype: numpy.ndarray
+    """
+    if calendar is not None:
+        return calendar.is_business_day_many(dates)
+    import numpy as np
+    days = _to_datetime64(dates, 'D')
+    valid = ~np.isnat(days)
+    result = np.zeros(days.shape, dtype=bool)
+    result[valid] = np.is_busday(days[valid])
+    return result
+
 def is_same_day(date1: datetime, date2: datetime) -> bool:
     """
     Checks if two datetime objects are the same day.
@@ -269,6 +610,34 @@ def is_same_week(date1: datetime, date2: datetime) -> bool:
     else:
         return False
 
+def _iso_week64(days):
+    """
+    Gets the ISO week number of each day of a datetime64[D] array (0 for NaT).
+    """
+    import numpy as np
+    # 1970-01-01 was a thursday, the thursday of a week gives its ISO year
+    thursdays = days - (days.astype(np.int64) + 3) % 7 + 3
+    weeks = (thursdays - thursdays.astype('datetime64[Y]')).astype(np.int64) // 7 + 1
+    weeks[np.isnat(days)] = 0
+    return weeks
+
+def is_same_week_many(dates1: Iterable, dates2: Iterable):
+    """
+    Checks which pairs of datetimes are in the same week (same ISO week number, as is_same_week).
+
+    *Examples*:
+
+    >>> is_same_week_many([datetime(2023, 8, 7), datetime(2023, 8, 7)], [datetime(2023, 8, 13), datetime(2023, 8, 14)]) # returns array([ True, False])
+
+    :param dates1: datetimes to check
+    :param dates2: datetimes to check, as many as dates1
+    :return: True for each pair in the same week, False otherwise (or NaT).
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+    days1, days2 = _to_datetime64(dates1, 'D'), _to_datetime64(dates2, 'D')
+    return (_iso_week64(days1) == _iso_week64(days2)) & ~np.isnat(days1) & ~np.isnat(days2)
+
 def is_same_month(date1: datetime, date2: datetime) -> bool:
     """
     Checks if two datetime objects are the same month.
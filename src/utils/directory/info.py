@@ -4,29 +4,130 @@ This file contains functions for obtaining information about a directory.
 
 # Importing the required libraries
 import os
+import re
 import sys
+import fnmatch
 import datetime as dt
+from itertools import repeat
+from typing import Callable, Iterator, NamedTuple, Optional, Pattern, Union
+import src.utils.cache as cache
 import src.utils.file.info as fil
 from src.utils.file.validate import is_file
 from .validate import is_dir, is_hidden  # , is_writable
 
+# Types
+
+class ContentEntry(NamedTuple):
+    """
+    Entry of a directory given by iter_contents.
+    """
+    path: str
+    type: str               # 'dir', 'file' or 'other'
+    size: Optional[int]     # None if the entry can not be stat'ed, eg: a broken symlink
+    mtime: Optional[float]
+
 # Get information about a directory
 
-def get_size(path: str) -> int:
+def _walk_size(path: str, follow_symlinks: bool, hard_links_once: bool, allocated: bool,
+               ancestors: frozenset = frozenset(), descend: bool = True) -> tuple:
     """
-    Gets the size of a directory in bytes.
+    Sums the size of the files below a directory with os.scandir, using the stat cached by each entry.
+
+    Returns the total of the files, the files with several hard links by (device, inode),
+    so they can be counted once after merging several walks, and the (path, ancestors)
+    of the subdirectories not walked when descend is False.
+    The ancestors are the (device, inode) of the parent directories, used to stop symlink loops.
+    """
+    total = 0
+    linked = {}
+    pending = []
+    stack = [(path, ancestors)]
+    while stack:
+        current, ancestors = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if follow_symlinks:
+                            stat = entry.stat()
+                            inode = (stat.st_dev, stat.st_ino)
+                            if inode in ancestors:
+                                continue
+                            subdir = (entry.path, ancestors | {inode})
+                        else:
+                            subdir = (entry.path, ancestors)
+                        (stack if descend else pending).append(subdir)
+                    elif entry.is_file(follow_symlinks=follow_symlinks):
+                        stat = entry.stat(follow_symlinks=follow_symlinks)
+                        # st_blocks is not available on Windows
+                        size = stat.st_blocks * 512 if allocated and hasattr(stat, 'st_blocks') else stat.st_size
+                        if hard_links_once and stat.st_nlink > 1:
+                            linked[(stat.st_dev, stat.st_ino)] = size
+                        else:
+                            total += size
+                except OSError:
+                    continue
+    return total, linked, pending
+
+def get_size(path: str, follow_symlinks: bool = False, hard_links_once: bool = True,
+             allocated: bool = False, workers: Optional[int] = None) -> int:
+    """
+    Gets the size of a directory in bytes, adding the size of all the files inside it and its subdirectories.
+
+    When workers is given, the subdirectories are walked concurrently on a pool of threads,
+    which helps on network drives and fast SSDs where a single walk waits on each request.
 
     *Examples:*
 
     >>> get_size('C:\\Users\\User\\Desktop\\') # returns 1024
+    >>> get_size('C:\\Users\\User\\Desktop\\', allocated=True) # returns 4096, the space used on disk
+    >>> get_size('C:\\Users\\User\\Desktop\\', workers=8) # returns 1024, walking with 8 threads
 
     :param path: The path to the directory.
     :type path: str
+    :param follow_symlinks: Whether to add the size of the files and directories the symlinks point to.
+    :type follow_symlinks: bool
+    :param hard_links_once: Whether to count a file with several hard links only once.
+    :type hard_links_once: bool
+    :param allocated: Whether to get the space allocated on disk instead of the apparent size of the files.
+    :type allocated: bool
+    :param workers: Number of threads to use, None or 1 to walk in the current thread.
+    :type workers: int
     :return: The size of the directory in bytes.
     :rtype: int
     """
     if is_dir(path):
-        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+        ancestors = frozenset()
+        if follow_symlinks:
+            stat = os.stat(path)
+            ancestors = frozenset({(stat.st_dev, stat.st_ino)})
+
+        if not workers or workers < 2:
+            total, linked, _ = _walk_size(path, follow_symlinks, hard_links_once, allocated, ancestors)
+            return total + sum(linked.values())
+
+        from concurrent.futures import ThreadPoolExecutor
+        # Go down level by level until there are enough subtrees to keep the workers busy
+        total, linked, pending = 0, {}, [(path, ancestors)]
+        while pending and len(pending) < workers:
+            level, pending = pending, []
+            for subdir, ancestors in level:
+                partial, partial_linked, partial_pending = _walk_size(
+                    subdir, follow_symlinks, hard_links_once, allocated, ancestors, descend=False)
+                total += partial
+                linked.update(partial_linked)
+                pending += partial_pending
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            subdirs, ancestors = zip(*pending) if pending else ((), ())
+            for partial, partial_linked, _ in executor.map(_walk_size, subdirs, repeat(follow_symlinks),
+                                                           repeat(hard_links_once), repeat(allocated), ancestors):
+                total += partial
+                linked.update(partial_linked)
+        return total + sum(linked.values())
 
 def get_name(path: str) -> str:
     """
@@ -106,7 +207,7 @@ def get_creation_datetime(path: str) -> dt.datetime:
     :rtype: dt.datetime
     """
     if is_dir(path):
-        return dt.datetime.fromtimestamp(os.path.getctime(path))
+        return dt.datetime.fromtimestamp(cache.stat(path).st_ctime)
 
 def get_modification_datetime(path: str) -> dt.datetime:
     """
@@ -122,7 +223,7 @@ def get_modification_datetime(path: str) -> dt.datetime:
     :rtype: dt.datetime
     """
     if is_dir(path):
-        return dt.datetime.fromtimestamp(os.path.getmtime(path))
+        return dt.datetime.fromtimestamp(cache.stat(path).st_mtime)
 
 def get_access_datetime(path: str) -> dt.datetime:
     """
@@ -138,7 +239,7 @@ def get_access_datetime(path: str) -> dt.datetime:
     :rtype: dt.datetime
     """
     if is_dir(path):
-        return dt.datetime.fromtimestamp(os.path.getatime(path))
+        return dt.datetime.fromtimestamp(cache.stat(path).st_atime)
 
 def get_owner(path: str) -> str:
     """
@@ -158,7 +259,7 @@ def get_owner(path: str) -> str:
     if is_dir(path):
         if sys.platform.startswith('linux') or sys.platform.startswith('darwin'):
             import pwd
-            return pwd.getpwuid(os.stat(path).st_uid).pw_name
+            return pwd.getpwuid(cache.stat(path).st_uid).pw_name
         elif sys.platform.startswith('win'):
             import win32security
             sd = win32security.GetFileSecurity(path, win32security.OWNER_SECURITY_INFORMATION)
@@ -187,7 +288,7 @@ def get_group(path: str) -> str:
         # os.getgrouplist() returns a list of group ids for a user
         if sys.platform.startswith('linux') or sys.platform.startswith('darwin'):
             import grp
-            return grp.getgrgid(os.stat(path).st_gid).gr_name
+            return grp.getgrgid(cache.stat(path).st_gid).gr_name
         elif sys.platform.startswith('win'):
             import win32security
             # Get the owner of a directory first with get_owner()
@@ -196,11 +297,107 @@ def get_group(path: str) -> str:
             # Get all the groups of that user.
             name, domain, type = win32security.LookupAccountSid(None, owner_sid)
 
+def _walk(directory: str, hidden: bool, max_depth: Optional[int],
+          prune: Optional[Callable[[os.DirEntry, str], bool]] = None) -> Iterator[tuple]:
+    """
+    Walks a directory tree with os.scandir in the same order as os.walk, top-down.
+
+    Yields (relative parent, DirEntry, is_directory) for each entry: the directories of
+    a parent first, then the rest of its entries, then the contents of each directory.
+    Symlinks to directories are given as directories but not walked, like os.walk does.
+    prune gets the DirEntry and the relative parent of each directory, its contents
+    are skipped if it returns True.
+    """
+    stack = [('', 1)]
+    while stack:
+        parent, depth = stack.pop()
+        try:
+            with os.scandir(os.path.join(directory, parent)) as entries:
+                dirs, files = [], []
+                for entry in entries:
+                    if not hidden and entry.name.startswith('.'):
+                        continue
+                    try:
+                        is_directory = entry.is_dir()
+                    except OSError:
+                        is_directory = False
+                    (dirs if is_directory else files).append(entry)
+        except OSError:
+            continue
+        for entry in dirs:
+            yield parent, entry, True
+        for entry in files:
+            yield parent, entry, False
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for entry in reversed(dirs):
+            if entry.is_symlink() or (prune is not None and prune(entry, parent)):
+                continue
+            stack.append((os.path.join(parent, entry.name), depth + 1))
+
+def iter_contents(directory: str, hidden: bool = False, max_depth: Optional[int] = None,
+                  pattern: Optional[str] = None, regex: Optional[Union[str, Pattern]] = None,
+                  prune: Optional[Callable[[ContentEntry], bool]] = None) -> Iterator[ContentEntry]:
+    """
+    Iterates over the contents of a directory and its subdirectories, lazily.
+
+    The entries come in the same order as get_contents, with the path (joined to the given directory),
+    the type, the size and the modification time taken from the stat cached by os.scandir.
+    The filters only choose which entries are given, the directories are walked anyway,
+    use prune to skip the contents of a directory.
+
+    *Examples:*
+
+    >>> for entry in iter_contents('C:\\Users\\User\\Desktop\\'): # yields ContentEntry(path='C:\\Users\\User\\Desktop\\file.txt', type='file', size=1024, mtime=1612345678.0), ...
+    >>> iter_contents('C:\\Users\\User\\Desktop\\', max_depth=1) # yields only the entries directly inside the directory
+    >>> iter_contents('C:\\Users\\User\\Desktop\\', pattern='*.txt') # yields only the entries with the txt extension
+    >>> iter_contents('C:\\Users\\User\\Desktop\\', regex=r'^2023') # yields only the entries whose relative path starts with 2023
+    >>> iter_contents('C:\\Users\\User\\Desktop\\', prune=lambda entry: entry.path.endswith('.git')) # skips the contents of .git directories
+
+    :param directory: The path to the directory.
+    :type directory: str
+    :param hidden: Whether to include hidden files and directories or not.
+    :type hidden: bool
+    :param max_depth: Maximum depth to walk, 1 for the entries directly inside the directory, None for no limit.
+    :type max_depth: int
+    :param pattern: Glob pattern the name of the entries must match.
+    :type pattern: str
+    :param regex: Regular expression searched in the path of the entries relative to the directory.
+    :type regex: Union[str, Pattern]
+    :param prune: Function called with each directory entry, its contents are skipped if it returns True.
+    :type prune: Callable[[ContentEntry], bool]
+    :return: The entries of the directory.
+    :rtype: Iterator[ContentEntry]
+    """
+    if isinstance(regex, str):
+        regex = re.compile(regex)
+
+    def entry_of(dir_entry: os.DirEntry, is_directory: bool) -> ContentEntry:
+        try:
+            stat = dir_entry.stat()
+            size, mtime = stat.st_size, stat.st_mtime
+        except OSError:
+            size = mtime = None
+        kind = 'dir' if is_directory else 'file' if size is not None and dir_entry.is_file() else 'other'
+        return ContentEntry(dir_entry.path, kind, size, mtime)
+
+    walk_prune = None
+    if prune is not None:
+        walk_prune = lambda dir_entry, parent: prune(entry_of(dir_entry, True))
+
+    for parent, dir_entry, is_directory in _walk(directory, hidden, max_depth, walk_prune):
+        if pattern is not None and not fnmatch.fnmatch(dir_entry.name, pattern):
+            continue
+        if regex is not None and regex.search(os.path.join(parent, dir_entry.name)) is None:
+            continue
+        yield entry_of(dir_entry, is_directory)
+
 def get_contents(directory, hidden=False):
     """
     Gets the contents of a directory.
     Recursively gets the contents of the subdirectories.
     Returns a list with the relative paths of directories and files.
+    Use iter_contents to walk large trees without building the whole list.
 
     *Examples:*
 
@@ -220,12 +417,12 @@ def get_contents(directory, hidden=False):
     :rtype: list
     """
     contents = []
-    for root, dirs, files in os.walk(directory):
-        if not hidden:
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            files = [f for f in files if not f.startswith('.')]
-        for dir in dirs:
-            contents.append(os.path.join(os.path.relpath(root), dir))
-        for file in files:
-            contents.append(os.path.join(os.path.relpath(root), file))
+    # The relative path of the directory is computed once, then once for each parent
+    base = os.path.relpath(directory)
+    current_parent, prefix = None, base
+    for parent, entry, _ in _walk(directory, hidden, None):
+        if parent != current_parent:
+            current_parent = parent
+            prefix = os.path.normpath(os.path.join(base, parent))
+        contents.append(os.path.join(prefix, entry.name))
     return contents
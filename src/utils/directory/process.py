@@ -5,15 +5,29 @@ This file contains functions for processing directories.
 # Importing the required libraries
 import os
 import sys
+import errno
 import shutil
+from typing import Callable, NamedTuple, Optional
+import src.utils.cache as cache
 import src.utils.string.validate as str
+from src.utils.file.process import copy_content, _get_free_path
 from .validate import is_dir, is_empty, is_hidden, is_visible  # , is_readonly, is_writable
-from .info import get_absolute_path, get_parent_dir, get_name
-from stat import S_IREAD, S_IWRITE
+from .info import get_absolute_path, get_parent_dir, get_name, _walk
+from stat import S_IFMT, S_IREAD, S_IWRITE, S_ISREG
 
 # Constants
 DEFAULT_TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S"
 
+# Types
+
+class CopyReport(NamedTuple):
+    """
+    Result of copy_tree.
+    """
+    files: int      # Files and symlinks copied
+    bytes: int      # Bytes of the files copied
+    dirs: int       # Directories created, including the root
+
 # Operations about existence / content
 
 def create(path: str) -> bool:
@@ -31,6 +45,7 @@ def create(path: str) -> bool:
     """
     if str.is_path(path) and not is_dir(path):
         os.mkdir(path)
+        cache.invalidate(path)
         return is_dir(path)
     return False
 
@@ -54,6 +69,7 @@ def delete(path: str) -> bool:
             shutil.rmtree(path, onerror=lambda func, path, _: (os.chmod(path, S_IWRITE), func(path)))
         except Exception as e:
             pass
+        cache.invalidate(path)
         return not is_dir(path)
     return False
 
@@ -84,6 +100,7 @@ def empty(path: str) -> bool:
                     shutil.rmtree(item_path)
         except Exception as e:
             pass
+        cache.invalidate(path)
         return is_empty(path)
     return False
 
@@ -107,13 +124,16 @@ def rename(path: str, new_path: str) -> str:
         if is_dir(new_path):
             new_path = get_duplicated_path(new_path)
         os.rename(path, new_path)
+        cache.invalidate(path, new_path)
         if is_dir(new_path):
             return new_path
 
-def copy(path: str, new_path: str) -> str:
+def copy(path: str, new_path: str, workers: Optional[int] = None,
+         progress: Optional[Callable[[int, int], None]] = None) -> str:
     """
     Method to copy dir, return True if success
     If copied dir exists rename it with timestamp
+    The files are copied in parallel, see copy_tree
 
     *Examples:*
 
@@ -123,6 +143,10 @@ def copy(path: str, new_path: str) -> str:
     :type path: str
     :param new_path: The new path to the directory.
     :type overwrite: bool
+    :param workers: Number of threads to use, None for the default, 1 to copy in the current thread.
+    :type workers: int
+    :param progress: Function called with the number of files and bytes copied so far, after each file.
+    :type progress: Callable[[int, int], None]
     :return: The path to the copied directory, if success. None otherwise.
     :rtype: str
     """
@@ -130,10 +154,113 @@ def copy(path: str, new_path: str) -> str:
     if is_dir(path):
         if is_dir(new_path):
             new_path = get_duplicated_path(new_path)
-        shutil.copytree(path, new_path)
+        copy_tree(path, new_path, workers, progress)
         if is_dir(new_path):
             return new_path
 
+def _copy_file(path: str, new_path: str) -> int:
+    """
+    Copies a file with its metadata, returns the number of bytes copied.
+    """
+    copied = copy_content(path, new_path)
+    shutil.copystat(path, new_path)
+    return copied
+
+def copy_tree(path: str, new_path: str, workers: Optional[int] = None,
+              progress: Optional[Callable[[int, int], None]] = None, symlinks: bool = False) -> CopyReport:
+    """
+    Copies a directory tree to a new path, that must not exist or be an empty directory
+    (eg: reserved with get_duplicated_path).
+
+    The tree is walked once to create all the directories, then the files are copied
+    on a pool of threads, so the time waiting on each file is overlapped. The data
+    is copied by the kernel when possible, see file.process.copy_content.
+    Symlinks are followed and their content copied, as shutil.copytree does, unless symlinks
+    is True, then they are copied as symlinks. A symlink to one of its parent directories is
+    always copied as a symlink, following it would never end. The metadata of files and
+    directories is kept. Special files (named pipes, sockets, devices) raise shutil.SpecialFileError.
+
+    *Examples:*
+
+    >>> copy_tree('C:\\Users\\User\\Desktop\\directory', 'C:\\Users\\User\\Desktop\\new_directory') # returns CopyReport(files=10, bytes=1024, dirs=3)
+    >>> copy_tree('C:\\Users\\User\\Desktop\\directory', 'D:\\directory', workers=16, progress=print) # prints the files and bytes copied so far after each file
+
+    :param path: The path to the directory.
+    :type path: str
+    :param new_path: The path to the copy of the directory.
+    :type new_path: str
+    :param workers: Number of threads to use, None for the default of ThreadPoolExecutor, 1 to copy in the current thread.
+    :type workers: int
+    :param progress: Function called with the number of files and bytes copied so far, after each file.
+    :type progress: Callable[[int, int], None]
+    :param symlinks: True to copy the symlinks as symlinks, False to copy their content (default).
+    :type symlinks: bool
+    :return: The number of files, bytes and directories copied.
+    :rtype: CopyReport
+    """
+    os.makedirs(new_path, exist_ok=True)
+    if os.listdir(new_path):
+        raise FileExistsError(errno.EEXIST, 'The directory is not empty', new_path)
+    # Create the skeleton while walking, the parents come before their contents
+    dirs = [(path, new_path)]
+    sources, targets = [], []
+    links = 0
+    # The trees to walk: the directory and the directories behind the symlinks followed,
+    # with the real paths of their parents to find the symlinks that loop
+    trees = [(path, new_path, ())]
+    while trees:
+        root, new_root, ancestors = trees.pop()
+        real_root = os.path.realpath(root)
+        for parent, entry, is_directory in _walk(root, True, None):
+            target = os.path.join(new_root, parent, entry.name)
+            if entry.is_symlink() and is_directory and not symlinks:
+                real = os.path.realpath(entry.path)
+                parents = ancestors + (os.path.join(real_root, parent),)
+                if not any(directory == real or directory.startswith(real + os.sep) for directory in parents):
+                    os.mkdir(target)
+                    dirs.append((entry.path, target))
+                    trees.append((entry.path, target, parents))
+                    continue
+            if entry.is_symlink() and (symlinks or is_directory):
+                os.symlink(os.readlink(entry.path), target, target_is_directory=is_directory)
+                links += 1
+            elif is_directory:
+                os.mkdir(target)
+                dirs.append((entry.path, target))
+            elif not S_ISREG(entry.stat().st_mode):
+                # Reading a named pipe would block forever, as shutil.copyfile does not copy them
+                raise shutil.SpecialFileError('`{}` is not a regular file'.format(entry.path))
+            else:
+                sources.append(entry.path)
+                targets.append(target)
+
+    files, copied = links, 0
+    if workers == 1:
+        results = map(_copy_file, sources, targets)
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = [executor.submit(_copy_file, source, target) for source, target in zip(sources, targets)]
+        results = (future.result() for future in futures)
+    try:
+        for size in results:
+            files += 1
+            copied += size
+            if progress is not None:
+                progress(files, copied)
+    finally:
+        if workers != 1:
+            # on error, the files not started yet are not copied
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
+
+    # Copy the metadata of the directories once their contents are written, children first
+    for source, target in reversed(dirs):
+        shutil.copystat(source, target)
+    cache.invalidate(new_path)
+    return CopyReport(files, copied, len(dirs))
+
 def duplicate(path: str) -> str:
     """
     Method to duplicate dir, return new path if success
@@ -141,7 +268,7 @@ def duplicate(path: str) -> str:
 
     *Examples:*
 
-    >>> duplicate('C:\\Users\\User\\Desktop\\directory') # returns 'C:\\Users\\User\\Desktop\\directory_20201231-235959'
+    >>> duplicate('C:\\Users\\User\\Desktop\\directory') # returns 'C:\\Users\\User\\Desktop\\directory (1)'
 
     :param path: The path to the directory.
     :type path: str
@@ -149,21 +276,40 @@ def duplicate(path: str) -> str:
     :rtype: str
     """
     if is_dir(path):
-        new_path = get_duplicated_path(path)
-        if copy(path, new_path) and is_dir(new_path):
+        # Reserve the new path, so concurrent duplicates don't take the same one
+        new_path = get_duplicated_path(path, reserve=True)
+        try:
+            copy_tree(path, new_path)
+        except Exception:
+            delete(new_path)
+            raise
+        if is_dir(new_path):
             return new_path
 
-def get_duplicated_path(path) -> str:
+def _create_dir(path: str) -> None:
+    """
+    Creates an empty directory, raises FileExistsError if it exists.
+    """
+    os.mkdir(path)
+    cache.invalidate(path)
+
+def get_duplicated_path(path, reserve: bool = False) -> str:
     """
     Method to get a duplicated path
     If the path is duplicated add a sequential number to the original name, in a Windows style (1), (2), etc.
+    The parent directory is listed once to find the first free number.
+    With reserve, an empty directory is created atomically at the new path,
+    so concurrent calls never get the same path.
 
     *Examples:*
 
     >>> get_duplicated_path('C:\\Users\\User\\Desktop\\directory') # returns 'C:\\Users\\User\\Desktop\\directory (1)'
+    >>> get_duplicated_path('C:\\Users\\User\\Desktop\\directory', reserve=True) # returns 'C:\\Users\\User\\Desktop\\directory (1)', created empty
 
     :param path: The path to an existing directory.
     :type path: str
+    :param reserve: Whether to create the new directory, empty, to reserve its path.
+    :type reserve: bool
     :return: The path to be used as new_path for duplicating the directory.
     :rtype: str
     """
@@ -175,18 +321,42 @@ def get_duplicated_path(path) -> str:
         # Split parts of the new_path
         path = os.path.dirname(path1)
         name = os.path.basename(path1)
-        sequential_number = 1
-        # If new_path exists, add a sequential number, in a Windows style (1), (2), etc.
-        while os.path.exists(os.path.join(path, name + f" ({sequential_number})")):
-            sequential_number += 1
-        # Add sequential number to the name
-        new_path = os.path.join(path, name + f" ({sequential_number})")
-        return new_path
+        # Add the first free sequential number to the name, in a Windows style (1), (2), etc.
+        return _get_free_path(path, name, "", _create_dir if reserve else None)
 
-def move(path, new_path: str) -> bool:
+def _same_device(path: str, new_path: str) -> bool:
+    """
+    Checks if a directory and the place where new_path would be created are on the same device,
+    comparing the st_dev of the directory and of the closest existing parent of new_path.
+    """
+    parent = os.path.dirname(os.path.abspath(new_path))
+    while not os.path.exists(parent) and os.path.dirname(parent) != parent:
+        parent = os.path.dirname(parent)
+    return os.stat(path).st_dev == os.stat(parent).st_dev
+
+def _is_copied(path: str, new_path: str) -> bool:
+    """
+    Checks that every entry of a directory tree exists in its copy, with the same type and size.
+    """
+    for parent, entry, is_directory in _walk(path, True, None):
+        try:
+            stat = os.lstat(os.path.join(new_path, parent, entry.name))
+            source_stat = entry.stat(follow_symlinks=False)
+        except OSError:
+            return False
+        if S_IFMT(stat.st_mode) != S_IFMT(source_stat.st_mode):
+            return False
+        if not is_directory and not entry.is_symlink() and stat.st_size != source_stat.st_size:
+            return False
+    return True
+
+def move(path, new_path: str, workers: Optional[int] = None) -> bool:
     """
     Method to move dir, return new path if success
     If moved dir exists rename it with timestamp
+    On the same device the directory is just renamed. Across devices it is copied
+    in parallel with copy_tree, symlinks as symlinks, and deleted once the copy is checked.
+    If the copy fails or is not complete, it is removed and the original is kept.
 
     *Examples:*
 
@@ -196,15 +366,35 @@ def move(path, new_path: str) -> bool:
     :type path: str
     :param new_path: The new dir path to the directory.
     :type new_path: str
+    :param workers: Number of threads to copy across devices, None for the default, 1 to copy in the current thread.
+    :type workers: int
     :return: True if the directory was moved successfully. False otherwise.
     :rtype: bool
     """
     # if (is_dir(path) and is_writable(path)
     if (is_dir(path)
             and not is_dir(new_path)):
-        if copy(path, new_path):
+        if _same_device(path, new_path):
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(new_path)), exist_ok=True)
+                os.rename(path, new_path)
+                cache.invalidate(path, new_path)
+                return is_dir(new_path)
+            except OSError as e:
+                # Same st_dev but different mount points (eg: bind mounts)
+                if e.errno != errno.EXDEV:
+                    raise
+        # Symlinks are moved as symlinks, as shutil.move does
+        try:
+            copy_tree(path, new_path, workers, symlinks=True)
+        except Exception:
+            delete(new_path)
+            raise
+        # Keep the original if anything is missing in the copy, and drop the copy
+        if _is_copied(path, new_path):
             delete(path)
             return is_dir(new_path)
+        delete(new_path)
     return False
 
 def set_hidden(path: str) -> bool:
@@ -230,6 +420,7 @@ def set_hidden(path: str) -> bool:
             else:                                 # linux
                 # fusionate dir path + . + dir name
                 os.rename(path, get_parent_dir(path) + "/." + get_name(path))
+            cache.invalidate(get_parent_dir(path))
         return is_hidden(path)
     return False
 
@@ -256,5 +447,6 @@ def set_visible(path: str) -> bool:
             else:                                 # linux
                 # fusionate dir path + . + dir name
                 os.rename(path, get_parent_dir(path) + "/" + get_name(path)[1:])
+            cache.invalidate(get_parent_dir(path))
         return is_visible(path)
     return False
@@ -5,26 +5,33 @@ This file contains functions for validate directories.
 # Importing the required libraries
 import os
 import sys
+import stat
+from typing import Union
+import src.utils.cache as cache
 from src.utils.string.validate import is_path as str_is_path
 from .._regex import *
 
 # Validations about existence / content
 
-def exists(path: str) -> bool:
+def exists(path: Union[str, os.PathLike]) -> bool:
     """
     Method to check if the given directory path points to an existing directory
+    The shape of string paths is validated, path objects (pathlib.Path, os.DirEntry, ...) are used as they are.
 
     *Examples:*
 
     >>> exists('C:\\Users\\User\\Desktop\\') # returns true if the directory exists
+    >>> exists(pathlib.Path('C:\\Users\\User\\Desktop\\')) # returns true if the directory exists
 
     :param path: The path to the directory.
-    :type path: str
+    :type path: Union[str, os.PathLike]
     :return: True if the directory exists, False otherwise.
     """
-    return str_is_path(path) and os.path.exists(path)
+    if isinstance(path, os.PathLike):
+        return cache.stat(path) is not None
+    return str_is_path(path) and cache.stat(path) is not None
 
-def is_dir(path) -> str:
+def is_dir(path) -> bool:
     """
     Method to check if directory exists
 
@@ -35,7 +42,11 @@ def is_dir(path) -> str:
     :return: 
     :rtype: bool
     """
-    return exists(path) and os.path.isdir(path)
+    # a single stat, the path may disappear between two of them
+    if not isinstance(path, os.PathLike) and not str_is_path(path):
+        return False
+    path_stat = cache.stat(path)
+    return path_stat is not None and stat.S_ISDIR(path_stat.st_mode)
 
 def is_empty(path: str) -> bool:
     """
@@ -68,7 +79,7 @@ def is_hidden(path: str) -> bool:
     # check if directory is hidden for windows
     if sys.platform.startswith('win'):
         try:
-            attrs = os.stat(path).st_file_attributes
+            attrs = cache.stat(path).st_file_attributes
             assert attrs != -1
             result = bool(attrs & 2)
         except (AttributeError, AssertionError):
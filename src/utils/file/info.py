@@ -5,10 +5,27 @@ This file contains functions for file manipulation.
 # Importing the required libraries
 import os
 import sys
+import codecs
 import chardet
 import datetime as dt
+from functools import lru_cache
+import src.utils.cache as cache
 from src.utils.file.validate import is_file
 
+# Constants
+ENCODING_SAMPLE_SIZE = 1024 * 1024
+ENCODING_CHUNK_SIZE = 64 * 1024
+
+# Byte order marks and the encoding name chardet gives for them,
+# UTF-32 goes first because its little endian BOM starts with the UTF-16 one
+BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'UTF-32'),
+    (codecs.BOM_UTF32_BE, 'UTF-32'),
+    (codecs.BOM_UTF8, 'UTF-8-SIG'),
+    (codecs.BOM_UTF16_LE, 'UTF-16'),
+    (codecs.BOM_UTF16_BE, 'UTF-16'),
+)
+
 # Get information about a file
 
 def get_size(path: str) -> int:
@@ -25,7 +42,7 @@ def get_size(path: str) -> int:
     :rtype: int
     """
     if is_file(path):
-        return os.path.getsize(path)
+        return cache.stat(path).st_size
 
 def get_filename(path: str) -> str:
     """
@@ -131,7 +148,7 @@ def get_creation_datetime(path: str) -> dt.datetime:
     """
     # return creation time in datetime format
     if is_file(path):
-        return dt.datetime.fromtimestamp(os.path.getctime(path))
+        return dt.datetime.fromtimestamp(cache.stat(path).st_ctime)
 
 def get_modification_datetime(path: str) -> dt.datetime:
     """
@@ -147,7 +164,7 @@ def get_modification_datetime(path: str) -> dt.datetime:
     :rtype: dt.datetime
     """
     if is_file(path):
-        return dt.datetime.fromtimestamp(os.path.getmtime(path))
+        return dt.datetime.fromtimestamp(cache.stat(path).st_mtime)
 
 def get_access_datetime(path: str) -> dt.datetime:
     """
@@ -163,7 +180,7 @@ def get_access_datetime(path: str) -> dt.datetime:
     :rtype: dt.datetime
     """
     if is_file(path):
-        return dt.datetime.fromtimestamp(os.path.getatime(path))
+        return dt.datetime.fromtimestamp(cache.stat(path).st_atime)
 
 def get_owner(path: str) -> str:
     """
@@ -183,7 +200,7 @@ def get_owner(path: str) -> str:
     if is_file(path):
         if sys.platform.startswith('linux') or sys.platform.startswith('darwin'):
             import pwd
-            return pwd.getpwuid(os.stat(path).st_uid).pw_name
+            return pwd.getpwuid(cache.stat(path).st_uid).pw_name
         elif sys.platform.startswith('win'):
             import win32security
             sd = win32security.GetFileSecurity(path, win32security.OWNER_SECURITY_INFORMATION)
@@ -211,7 +228,7 @@ def get_group(path: str) -> str:
     if is_file(path):
         if sys.platform.startswith('linux') or sys.platform.startswith('darwin'):
             import grp
-            return grp.getgrgid(os.stat(path).st_gid).gr_name
+            return grp.getgrgid(cache.stat(path).st_gid).gr_name
         elif sys.platform.startswith('win'):
             import win32security
             sd = win32security.GetFileSecurity(path, win32security.OWNER_SECURITY_INFORMATION)
@@ -219,21 +236,51 @@ def get_group(path: str) -> str:
             name, domain, type = win32security.LookupAccountSid(None, owner_sid)
             return name
 
-def get_encoding(path: str) -> str:
+@lru_cache(maxsize=1024)
+def _detect_encoding(path: str, size: int, mtime: int, max_bytes: int) -> str:
+    """
+    Detects the encoding of a file reading at most max_bytes of it.
+    The size and the modification time are part of the cache key,
+    so a cached result is not used once the file changes.
+    """
+    with open(path, 'rb') as file:
+        head = file.read(min(4, max_bytes))
+        for bom, encoding in BOM_ENCODINGS:
+            if head.startswith(bom):
+                return encoding
+        detector = chardet.UniversalDetector()
+        detector.feed(head)
+        remaining = max_bytes - len(head)
+        while remaining > 0 and not detector.done:
+            chunk = file.read(min(ENCODING_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            detector.feed(chunk)
+            remaining -= len(chunk)
+    detector.close()
+    return detector.result['encoding']
+
+def get_encoding(path: str, max_bytes: int = ENCODING_SAMPLE_SIZE) -> str:
     """
     Gets the encoding of a file.
-    @TODO: Doesn't work as expected. Fix this function.
+
+    A byte order mark gives the encoding right away, otherwise the raw bytes are fed
+    in chunks to chardet until it is confident or max_bytes have been read.
+    The result is cached until the size or the modification time of the file change.
 
     *Examples:*
 
     >>> get_encoding('C:\\Users\\User\\Desktop\\file.txt') # returns 'utf-8'
+    >>> get_encoding('C:\\Users\\User\\Desktop\\file.txt', 4096) # returns 'utf-8' reading at most 4 KiB
 
     :param path: The path to the file.
     :type path: str
+    :param max_bytes: The maximum number of bytes to read.
+    :type max_bytes: int
     :return: The encoding of the file.
     :rtype: str
     """
     if is_file(path):
-        return chardet.detect(open(path, 'r', encoding='utf-8').read().encode())['encoding']
-
-
+        stat = cache.stat(path)
+        path = os.path.abspath(path)
+        return _detect_encoding(path, stat.st_size, stat.st_mtime_ns, max_bytes)
@@ -4,9 +4,17 @@ This file contains functions for processing files.
 
 # Importing the required libraries
 import os
+import re
 import sys
+import mmap
+import errno
 import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Union
 import datetime as dt
+import src.utils.cache as cache
 import src.utils.string.validate as stvl
 from src.utils.file.validate import is_file, is_hidden, is_readonly  # , is_readonly, is_writable
 from src.utils.file.info import get_parent_dir, get_filename, get_absolute_path
@@ -17,6 +25,11 @@ from stat import S_IREAD
 # Constants
 DEFAULT_ENCODING = "utf-8"
 DEFAULT_TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S"
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+COPY_BLOCK_SIZE = 8 * 1024 * 1024
+DURABILITY_LEVELS = ("none", "fdatasync", "full")
+APPENDER_BUFFER_SIZE = 64 * 1024
+FICLONE = 0x40049409    # Linux ioctl to reflink a file, fcntl.FICLONE in Python 3.12+
 
 # Operations about existence / content
 
@@ -35,6 +48,7 @@ def create(path: str) -> bool:
     """
     if not is_file(path):
         open(path, 'w+', encoding="UTF-8").close()
+        cache.invalidate(path)
         return True
     return False
 
@@ -55,6 +69,7 @@ def delete(path: str) -> bool:
     # if is_file(path) and not is_readonly(path) and is_writable(path):
     if is_file(path) and not is_readonly(path):
         os.remove(path)
+        cache.invalidate(path)
         return True
     return False
 
@@ -74,49 +89,386 @@ def read(path: str) -> str:
     path = get_absolute_path(path)
     # if is_file(path) and is_readable(path):
     if is_file(path):
-        return open(path, 'r+', encoding="utf-8").read()
+        with open(path, 'r+', encoding="utf-8") as file:
+            return file.read()
     return False
 
-def write(path: str, content: str) -> bool:
+def read_lines(path: str, binary: bool = False, encoding: str = DEFAULT_ENCODING) -> Iterator[Union[str, bytes]]:
+    """
+    Reads a file line by line, without loading the whole content in memory.
+
+    The lines keep their line ending, as when iterating over a file object.
+    The file is closed when the iteration ends or the iterator is closed.
+
+    *Examples:*
+
+    >>> for line in read_lines('C:\\Users\\User\\Desktop\\file.txt'): # yields the lines of the file as strings
+    >>> for line in read_lines('C:\\Users\\User\\Desktop\\file.txt', binary=True): # yields the lines of the file as bytes
+
+    :param path: The path to the file.
+    :type path: str
+    :param binary: If True, yield the raw bytes instead of decoded text.
+    :type binary: bool
+    :param encoding: The encoding used to decode the file in text mode.
+    :type encoding: str
+    :return: An iterator over the lines of the file, nothing if the file does not exist.
+    :rtype: Iterator[Union[str, bytes]]
+    """
+    path = get_absolute_path(path)
+    if is_file(path):
+        if binary:
+            with open(path, 'rb') as file:
+                yield from file
+        else:
+            with open(path, 'r', encoding=encoding) as file:
+                yield from file
+
+def read_chunks(path: str, size: int = DEFAULT_CHUNK_SIZE, binary: bool = False,
+                encoding: str = DEFAULT_ENCODING) -> Iterator[Union[str, bytes]]:
+    """
+    Reads a file in chunks of a fixed size, without loading the whole content in memory.
+
+    In text mode the size is a number of characters, and multibyte characters
+    are never split between two chunks. In binary mode the size is a number of bytes.
+    The file is closed when the iteration ends or the iterator is closed.
+
+    *Examples:*
+
+    >>> for chunk in read_chunks('C:\\Users\\User\\Desktop\\file.txt', 4096): # yields the content of the file in chunks of 4096 characters
+    >>> for chunk in read_chunks('C:\\Users\\User\\Desktop\\file.txt', 4096, binary=True): # yields the content of the file in chunks of 4096 bytes
+
+    :param path: The path to the file.
+    :type path: str
+    :param size: The size of each chunk, the last one can be smaller.
+    :type size: int
+    :param binary: If True, yield the raw bytes instead of decoded text.
+    :type binary: bool
+    :param encoding: The encoding used to decode the file in text mode.
+    :type encoding: str
+    :return: An iterator over the chunks of the file, nothing if the file does not exist.
+    :rtype: Iterator[Union[str, bytes]]
+    """
+    if size <= 0:
+        raise ValueError("size must be a positive integer")
+    path = get_absolute_path(path)
+    if is_file(path):
+        if binary:
+            with open(path, 'rb') as file:
+                yield from iter(lambda: file.read(size), b'')
+        else:
+            with open(path, 'r', encoding=encoding) as file:
+                yield from iter(lambda: file.read(size), '')
+
+@contextmanager
+def read_mmap(path: str) -> Iterator[Optional[Union[mmap.mmap, bytes]]]:
+    """
+    Maps a file in memory as read-only bytes, the OS loads the pages on demand.
+
+    The map supports slicing, find() and bytes regular expressions, so it can be used
+    to search a large file without reading it. Use it in a with statement, the map
+    and the file are closed when leaving it. An empty file can not be mapped, b''
+    is given instead. None is given if the file does not exist.
+
+    *Examples:*
+
+    >>> with read_mmap('C:\\Users\\User\\Desktop\\file.txt') as content:
+    ...     content[:4] # returns the first 4 bytes of the file
+    ...     content.find(b'error') # returns the position of the first 'error' in the file
+
+    :param path: The path to the file.
+    :type path: str
+    :return: A context manager giving the read-only map of the file.
+    :rtype: Iterator[Optional[Union[mmap.mmap, bytes]]]
+    """
+    path = get_absolute_path(path)
+    if not is_file(path):
+        yield None
+        return
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            yield content
+
+def _sync(file, durability: str) -> None:
+    """
+    Flushes a file and, depending on the durability, waits until its data (fdatasync)
+    or its data and metadata (full) are stored on disk.
+    """
+    file.flush()
+    if durability == "fdatasync":
+        # fdatasync is not available on Windows and macOS
+        getattr(os, "fdatasync", os.fsync)(file.fileno())
+    elif durability == "full":
+        os.fsync(file.fileno())
+
+def _sync_dir(path: str) -> None:
+    """
+    Waits until the entries of a directory are stored on disk, so a renamed file survives a crash.
+    Windows can not open directories, there the rename is stored with the file.
+    """
+    if os.name == "posix":
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def _replace(path: str, content: str, durability: str, append: bool = False) -> None:
+    """
+    Writes the content (after the current one if append) in a temporary file
+    in the same directory, then renames it to the path in a single step,
+    so the file is either the old one or the new one, never a partial one.
+    A symlink is followed, the file replaced is its target, as in a plain write.
+    """
+    link, path = path, os.path.realpath(path)
+    directory, name = os.path.split(path)
+    fd, temp_path = tempfile.mkstemp(prefix="." + name + ".", suffix=".tmp", dir=directory)
+    try:
+        with open(fd, "w", encoding=DEFAULT_ENCODING) as file:
+            if append:
+                with open(path, "rb") as source:
+                    if not _reflink(source.fileno(), fd):
+                        _copy_fd(source.fileno(), fd, os.fstat(source.fileno()).st_size)
+                    else:
+                        os.lseek(fd, 0, os.SEEK_END)
+            file.write(content)
+            _sync(file, durability)
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+        cache.invalidate(link, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if durability == "full":
+        _sync_dir(directory)
+
+def write(path: str, content: str, atomic: bool = False, durability: str = "none") -> bool:
     """
     Writes content to a file.
 
+    With atomic, the content is written in a temporary file that replaces the original one,
+    so a crash or a concurrent reader never see a partial content.
+    The durability sets what is waited for before returning: "none" (the OS stores the data later),
+    "fdatasync" (the data is on disk) or "full" (the data, the metadata and, if atomic, the rename are on disk).
+
     *Examples:*
 
     >>> write('C:\\Users\\User\\Desktop\\file.txt') # writes the content to the file
+    >>> write('C:\\Users\\User\\Desktop\\file.txt', 'content', atomic=True, durability='full') # replaces the file, waiting until it is on disk
 
     :param path: The path to the file.
     :type path: str
+    :param content: The content to write.
+    :type content: str
+    :param atomic: Whether to replace the file in a single step.
+    :type atomic: bool
+    :param durability: One of "none", "fdatasync" or "full".
+    :type durability: str
     :return: True if the content was written to the file, False otherwise.
     :rtype: bool
     """
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError('Unknown durability "{}"'.format(durability))
     path = get_absolute_path(path)
     # if is_file(path) and not is_readonly(path) and is_writable(path):
     if is_file(path) and not is_readonly(path):
-        open(path, 'w+', encoding="utf-8").write(content)
+        if atomic:
+            _replace(path, content, durability)
+        else:
+            with open(path, 'w+', encoding="utf-8") as file:
+                file.write(content)
+                _sync(file, durability)
+            cache.invalidate(path)
         return True
     return False
 
-def append(path: str, content: str) -> bool:
+def append(path: str, content: str, atomic: bool = False, durability: str = "none") -> bool:
     """
     Appends content to a file.
 
+    With atomic, the file is copied (sharing its blocks when the filesystem allows it)
+    with the content appended, and the copy replaces the original one, so a crash or
+    a concurrent reader never see a partial content. The durability works as in write.
+
     *Examples:*
 
     >>> append('C:\\Users\\User\\Desktop\\file.txt') # appends the content to the end of the file
+    >>> append('C:\\Users\\User\\Desktop\\file.txt', 'content', durability='fdatasync') # appends the content, waiting until it is on disk
 
     :param path: The path to the file.
     :type path: str
+    :param content: The content to append.
+    :type content: str
+    :param atomic: Whether to replace the file in a single step.
+    :type atomic: bool
+    :param durability: One of "none", "fdatasync" or "full".
+    :type durability: str
     :return: True if the content was appended to the file, False otherwise.
     :rtype: bool
     """
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError('Unknown durability "{}"'.format(durability))
     path = get_absolute_path(path)
     # if is_file(path) and not is_readonly(path) and is_writable(path):
     if is_file(path) and not is_readonly(path):
-        open(path, 'a+', encoding="utf-8").write(content)
+        if atomic:
+            _replace(path, content, durability, append=True)
+        else:
+            with open(path, 'a+', encoding="utf-8") as file:
+                file.write(content)
+                _sync(file, durability)
+            cache.invalidate(path)
         return True
     return False
 
+class Appender:
+    """
+    Appends content to a file many times, as append does, but checking the file once and keeping it open.
+
+    The content is kept in a buffer and written when it reaches buffer_size chars, when flush is called,
+    every flush_interval seconds if given (from a background thread) and when the appender is closed.
+    The file is opened in append mode, so other processes can append to it at the same time.
+
+    *Examples:*
+
+    >>> with Appender('C:\\Users\\User\\Desktop\\file.log') as appender:
+    ...     appender.write('line\\n') # appends the line to the file, when the buffer is full or the appender is closed
+    >>> with Appender('C:\\Users\\User\\Desktop\\file.log', flush_interval=1.0) as appender:
+    ...     appender.write('line\\n') # appends the line to the file, at most 1 second later
+    """
+
+    def __init__(self, path: str, buffer_size: int = APPENDER_BUFFER_SIZE, flush_interval: Optional[float] = None,
+                 durability: str = "none", encoding: str = DEFAULT_ENCODING):
+        """
+        :param path: The path to the file, that must exist and not be readonly.
+        :type path: str
+        :param buffer_size: Number of chars kept in memory before writing them.
+        :type buffer_size: int
+        :param flush_interval: Seconds between flushes from a background thread, None to flush only when needed.
+        :type flush_interval: float
+        :param durability: One of "none", "fdatasync" or "full", applied on each flush, see write.
+        :type durability: str
+        :param encoding: The encoding used to write the content.
+        :type encoding: str
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError('Unknown durability "{}"'.format(durability))
+        self.path = get_absolute_path(path)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.encoding = encoding
+        self._fd = None
+        self._buffer = []
+        self._size = 0
+        self._unwritten = b""
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = None
+        self._error = None
+
+    def open(self) -> "Appender":
+        """
+        Checks the file and opens it, starting the background flush if needed.
+        Called when entering the with statement.
+        """
+        if not is_file(self.path):
+            raise FileNotFoundError('File "{}" not found'.format(self.path))
+        if is_readonly(self.path):
+            raise PermissionError('File "{}" is readonly'.format(self.path))
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | getattr(os, "O_BINARY", 0))
+        self._closed.clear()
+        if self.flush_interval:
+            self._thread = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._thread.start()
+        return self
+
+    def write(self, content: str) -> None:
+        """
+        Appends content to the file, through the buffer.
+        """
+        with self._lock:
+            if self._fd is None:
+                raise ValueError("Appender is closed")
+            self._buffer.append(content)
+            self._size += len(content)
+            if self._size >= self.buffer_size:
+                self._flush()
+
+    def flush(self) -> None:
+        """
+        Writes the content in the buffer to the file.
+        """
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """
+        Stops the background flush, writes the content in the buffer and closes the file.
+        Called when leaving the with statement.
+        """
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            if self._fd is not None:
+                try:
+                    self._flush()
+                finally:
+                    os.close(self._fd)
+                    self._fd = None
+
+    def _flush(self) -> None:
+        """
+        Writes the buffer to the file, the lock must be held.
+        If the write fails, the data not written is kept and written first on the next call.
+        An error in the background flush is raised here, on the next call, after writing the buffer.
+        """
+        error, self._error = self._error, None
+        if (self._buffer or self._unwritten) and self._fd is not None:
+            content = "".join(self._buffer)
+            self._buffer.clear()
+            self._size = 0
+            # Same new lines as a file opened in text mode
+            if os.linesep != "\n":
+                content = content.replace("\n", os.linesep)
+            data = memoryview(self._unwritten + content.encode(self.encoding))
+            self._unwritten = b""
+            try:
+                while data:
+                    data = data[os.write(self._fd, data):]
+            except BaseException:
+                self._unwritten = bytes(data)
+                raise
+            if self.durability == "fdatasync":
+                getattr(os, "fdatasync", os.fsync)(self._fd)
+            elif self.durability == "full":
+                os.fsync(self._fd)
+            cache.invalidate(self.path)
+        if error is not None:
+            raise error
+
+    def _flush_periodically(self) -> None:
+        """
+        Flushes the buffer every flush_interval seconds until the appender is closed.
+        """
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                try:
+                    self._flush()
+                except Exception as e:
+                    self._error = e
+
+    def __enter__(self) -> "Appender":
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
 def empty(path: str) -> bool:
     """
     Empties a file.
@@ -134,6 +486,7 @@ def empty(path: str) -> bool:
     # if is_file(path) and not is_readonly(path) and is_writable(path):
     if is_file(path) and not is_readonly(path):
         open(path, 'w+', encoding="utf-8").close()
+        cache.invalidate(path)
         return True
     return False
 
@@ -161,12 +514,14 @@ def rename(path: str, new_path: str) -> str:
     if (is_file(path) and not is_readonly(path)
             and stvl.is_path(new_path) and not is_file(new_path)):
         os.rename(path, new_path)
+        cache.invalidate(path, new_path)
     if is_file(new_path):
         return new_path
 
 def copy(path: str, new_path: str) -> str:
     """
     Method to copy file, return new path if success
+    If new_path is a directory, the file is copied into it with the same name
 
     *Examples:*
 
@@ -174,15 +529,19 @@ def copy(path: str, new_path: str) -> str:
         # returns 'C:\\Users\\User\\Desktop\\file2.txt' if the destination file does not exist
     >>> copy('C:\\Users\\User\\Desktop\\file.txt', 'C:\\Users\\User\\Desktop\\file2.txt')
         # returns 'C:\\Users\\User\\Desktop\\file2 (1).txt' if the destination file exists
+    >>> copy('C:\\Users\\User\\Desktop\\file.txt', 'C:\\Users\\User\\Documents')
+        # returns 'C:\\Users\\User\\Documents\\file.txt'
 
     :param path: The path to the file to copy.
     :type path: str
-    :param new_path: The path to the new file.
+    :param new_path: The path to the new file, or to the directory to copy it into.
     :type new_path: str
     :return: The path to the copied file.
     :rtype: str
     """
     path = get_absolute_path(path)
+    if is_dir(new_path):
+        new_path = os.path.join(new_path, os.path.basename(path))
     if is_file(new_path):
         new_path = get_duplicated_path(new_path)
     else:
@@ -190,10 +549,96 @@ def copy(path: str, new_path: str) -> str:
     if (is_file(path)
         and stvl.is_path(new_path)
             and not is_file(new_path)):
-        shutil.copy(path, new_path)
+        copy_content(path, new_path)
+        shutil.copymode(path, new_path)
+        cache.invalidate(new_path)
     if is_file(new_path):
         return new_path
 
+def _copy_fd(source: int, target: int, size: int) -> int:
+    """
+    Copies the content of a file descriptor to another one, from their current positions.
+
+    The kernel copies the data when possible (copy_file_range, then sendfile),
+    without moving it through user space. If a method is not supported by the OS or
+    the filesystems it falls back to the next one, continuing where the last one stopped.
+    Returns the number of bytes copied.
+    """
+    block_size = min(max(size, COPY_BLOCK_SIZE), 2 ** 30)
+    copied = 0
+    for method in ('copy_file_range', 'sendfile'):
+        if not hasattr(os, method):
+            continue
+        try:
+            while True:
+                if method == 'copy_file_range':
+                    sent = os.copy_file_range(source, target, block_size)
+                else:
+                    sent = os.sendfile(target, source, None, block_size)
+                if sent == 0:
+                    return copied
+                copied += sent
+        except OSError as e:
+            # Not supported: between filesystems, by the filesystem, or by the OS
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                               errno.ENOTSUP, errno.EBADF, errno.ENOTSOCK):
+                raise
+    while True:
+        chunk = os.read(source, block_size)
+        if not chunk:
+            return copied
+        view = memoryview(chunk)
+        while view:
+            written = os.write(target, view)
+            view = view[written:]
+        copied += len(chunk)
+
+def _reflink(source: int, target: int) -> bool:
+    """
+    Makes the target file share the blocks of the source one (copy on write),
+    on filesystems that support it (btrfs, xfs, ...). Returns True if it worked.
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+    try:
+        fcntl.ioctl(target, getattr(fcntl, 'FICLONE', FICLONE), source)
+        return True
+    except OSError as e:
+        # Not supported: between filesystems, by the filesystem, or by the kernel
+        if e.errno not in (errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP,
+                           errno.ENOTTY, errno.EBADF, errno.EPERM):
+            raise
+        return False
+
+def copy_content(path: str, new_path: str, reflink: bool = True) -> int:
+    """
+    Copies the content of a file to another one, overwriting it, without the metadata.
+
+    The fastest way the OS and the filesystems allow is used, falling back to the next one:
+    a reflink (the copy shares the blocks of the original until they change),
+    a copy by the kernel (copy_file_range, sendfile) and a buffered copy.
+
+    *Examples:*
+
+    >>> copy_content('C:\\Users\\User\\Desktop\\file.txt', 'C:\\Users\\User\\Desktop\\file2.txt') # returns 1024
+    >>> copy_content('C:\\Users\\User\\Desktop\\file.txt', 'C:\\Users\\User\\Desktop\\file2.txt', reflink=False) # returns 1024, copying the blocks
+
+    :param path: The path to the file to copy.
+    :type path: str
+    :param new_path: The path to the new file.
+    :type new_path: str
+    :param reflink: Whether to try to share the blocks of the file instead of copying them.
+    :type reflink: bool
+    :return: The number of bytes copied.
+    :rtype: int
+    """
+    with open(path, 'rb') as source, open(new_path, 'wb') as target:
+        size = os.fstat(source.fileno()).st_size
+        if reflink and size > 0 and _reflink(source.fileno(), target.fileno()):
+            return size
+        return _copy_fd(source.fileno(), target.fileno(), size)
+
 def duplicate(path: str) -> str:
     """
     Method to duplicate file, return new path if success
@@ -209,27 +654,72 @@ def duplicate(path: str) -> str:
     :rtype: str
     """
     path = get_absolute_path(path)
-    new_path = get_duplicated_path(path)
-    if is_file(path) and not is_file(new_path):
-        new_path = get_duplicated_path(path)
-        shutil.copy(path, new_path)
-    if is_file(new_path):
-        return new_path
+    if is_file(path):
+        # Reserve the new path, so concurrent duplicates don't take the same one
+        new_path = get_duplicated_path(path, reserve=True)
+        copy_content(path, new_path)
+        shutil.copymode(path, new_path)
+        cache.invalidate(new_path)
+        if is_file(new_path):
+            return new_path
+
+def _get_free_path(parent: str, name: str, extension: str,
+                   create: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Gets the path "name (n)extension" in the parent directory with the smallest free sequential number,
+    listing the parent once instead of checking each number.
+
+    If create is given, it is called with the path to reserve it, and must raise FileExistsError
+    if the path was taken in the meantime, then the next free number is tried.
+    """
+    pattern = re.compile(re.escape(os.path.normcase(name)) + r" \(([1-9]\d*)\)"
+                         + re.escape(os.path.normcase(extension)) + "$")
+    taken = set()
+    with os.scandir(parent) as entries:
+        for entry in entries:
+            match = pattern.match(os.path.normcase(entry.name))
+            if match:
+                taken.add(int(match.group(1)))
+    sequential_number = 1
+    while True:
+        while sequential_number in taken:
+            sequential_number += 1
+        new_path = os.path.join(parent, name + f" ({sequential_number})" + extension)
+        if create is None:
+            return new_path
+        try:
+            create(new_path)
+            return new_path
+        except FileExistsError:
+            taken.add(sequential_number)
 
-def get_duplicated_path(path) -> str:
+def _create_empty(path: str) -> None:
+    """
+    Creates an empty file, raises FileExistsError if it exists.
+    """
+    os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    cache.invalidate(path)
+
+def get_duplicated_path(path, reserve: bool = False) -> str:
     """
     Method to get the a path so a file can be duplicated
     without overwriting the original file.
 
     If the new_path exists, add a sequential number to the original name
     , in a Windows style (1), (2), etc.
+    The parent directory is listed once to find the first free number.
+    With reserve, an empty file is created atomically at the new path,
+    so concurrent calls never get the same path.
 
     *Examples:*
 
     >>> get_duplicated_path('C:\\Users\\User\\Desktop\\file.txt') # returns 'C:\\Users\\User\\Desktop\\file (1).txt'
+    >>> get_duplicated_path('C:\\Users\\User\\Desktop\\file.txt', reserve=True) # returns 'C:\\Users\\User\\Desktop\\file (1).txt', created empty
 
     :param path: The path to an existing file.
     :type path: str
+    :param reserve: Whether to create the new file, empty, to reserve its path.
+    :type reserve: bool
     :return: The path to be used as new_path for duplicating the file.
     :rtype: str
     """
@@ -240,13 +730,8 @@ def get_duplicated_path(path) -> str:
         path = os.path.dirname(path1)
         name = get_filename_w_ext(path1)
         extension = '.' + get_extension(path1)
-        sequential_number = 1
-        # If new_path exists, add a sequential number, in a Windows style (1), (2), etc.
-        while os.path.exists(os.path.join(path, name + f" ({sequential_number})" + extension)):
-            sequential_number += 1
-        # Add sequential number to the name
-        new_path = os.path.join(path, name + f" ({sequential_number})" + extension)
-        return new_path
+        # Add the first free sequential number to the name, in a Windows style (1), (2), etc.
+        return _get_free_path(path, name, extension, _create_empty if reserve else None)
 
 def archive(path: str) -> str:
     """
@@ -273,6 +758,7 @@ def archive(path: str) -> str:
         copy(path, new_path)
         # Touch the original file so its modification time is newer than the copy
         os.utime(path, None)
+        cache.invalidate(path)
         if is_file(new_path):
             return new_path
 
@@ -302,6 +788,7 @@ def move(path, new_dir: str, overwrite=False) -> str:
             else:
                 new_path = get_duplicated_path(new_path)
         shutil.move(path, new_path)
+        cache.invalidate(path, new_path)
         return new_path
 
 # Operations about setting attributes
@@ -329,6 +816,7 @@ def set_hidden(path: str) -> bool:
             else:                                 # linux
                 # fusionate dir path + . + dir name
                 os.rename(path, get_parent_dir(path) + "/." + get_filename(path))
+            cache.invalidate(get_parent_dir(path))
             return is_hidden(path)
     return False
 
@@ -354,6 +842,7 @@ def set_visible(path: str) -> bool:
         else:                                 # linux
             # fusionate dir path + . + dir name
             os.rename(path, get_parent_dir(path) + "/" + get_filename(path)[1:])
+        cache.invalidate(get_parent_dir(path))
         return not is_hidden(path)
     return False
 
@@ -372,5 +861,6 @@ def set_readonly(path: str) -> bool:
     """
     if is_file(path) and not is_readonly(path):
         os.chmod(path, S_IREAD)
+        cache.invalidate(path)
         return is_readonly(path)
     return False
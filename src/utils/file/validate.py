@@ -5,27 +5,40 @@ This file contains functions for validate files.
 # Importing the required libraries
 import os
 import sys
+import csv
+import json
+import mmap
 import stat
 import sqlite3
+from typing import Tuple, Union
+from xml.parsers import expat
+import src.utils.cache as cache
 import src.utils.string.validate as stvl 
 
+# Constants
+SNIFF_SIZE = 64 * 1024
+
 # Validations about existence / content
 
-def exists(path: str) -> bool:
+def exists(path: Union[str, os.PathLike]) -> bool:
     """
     Method to check if the given file path points to an existing file.
+    The shape of string paths is validated, path objects (pathlib.Path, os.DirEntry, ...) are used as they are.
 
     *Examples:*
 
     >>> exists('C:\\Users\\User\\Desktop\\file.txt') # returns true if the file exists
+    >>> exists(pathlib.Path('C:\\Users\\User\\Desktop\\file.txt')) # returns true if the file exists
 
     :param path: The path to the file.
-    :type path: str
+    :type path: Union[str, os.PathLike]
     :return: True if the file exists, False otherwise.
     """
-    return stvl.is_path(path) and os.path.exists(path)
+    if isinstance(path, os.PathLike):
+        return cache.stat(path) is not None
+    return stvl.is_path(path) and cache.stat(path) is not None
 
-def is_file(path: str) -> bool:
+def is_file(path: Union[str, os.PathLike]) -> bool:
     """
     Checks if the given file path points to an existing file.
 
@@ -37,7 +50,11 @@ def is_file(path: str) -> bool:
     :type path: str
     :return: True if the file exists, False otherwise.
     """
-    return exists(path) and os.path.isfile(path)
+    # a single stat, the path may disappear between two of them
+    if not isinstance(path, os.PathLike) and not stvl.is_path(path):
+        return False
+    path_stat = cache.stat(path)
+    return path_stat is not None and stat.S_ISREG(path_stat.st_mode)
 
 def is_empty(path: str) -> bool:
     """
@@ -51,7 +68,7 @@ def is_empty(path: str) -> bool:
     :type path: str
     :return: True if the file is empty, False otherwise.
     """
-    return is_file(path) and os.path.getsize(path) == 0
+    return is_file(path) and cache.stat(path).st_size == 0
 
 # Validations about properties
 
@@ -70,7 +87,7 @@ def is_hidden(path: str) -> bool:
     # check if file is hidden for windows
     if sys.platform.startswith('win'):
         return (is_file(path) and
-                bool(os.stat(path).st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN))
+                bool(cache.stat(path).st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN))
     # check if file is hidden for linux
     elif sys.platform.startswith('linux'):
         return (is_file(path) and
@@ -106,11 +123,11 @@ def is_readonly(path: str) -> bool:
     # check if file is readonly for windows
     if sys.platform.startswith('win'):
         return (is_file(path) and
-                bool(os.stat(path).st_file_attributes & stat.FILE_ATTRIBUTE_READONLY))
+                bool(cache.stat(path).st_file_attributes & stat.FILE_ATTRIBUTE_READONLY))
     # check if file is readonly for linux
     elif sys.platform.startswith('linux'):
         return (is_file(path) and
-                not os.access(path, os.W_OK))
+                not cache.access(path, os.W_OK))
 
 # def is_readable(path: str) -> bool:
     """
@@ -167,53 +184,150 @@ def is_readonly(path: str) -> bool:
 
 # Validations about content type
 
-def is_json(path: str) -> bool:
+def _sniff(path: str) -> Tuple[str, str]:
+    """
+    Returns the head and the tail of a file as text, mapping the file in memory
+    so only the pages holding the first and last SNIFF_SIZE bytes are read.
+
+    If the whole file fits in both, it is returned as the head and the tail is empty.
+    Characters cut at the edges of the head and the tail are dropped.
+    """
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return '', ''
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            if size <= 2 * SNIFF_SIZE:
+                return content[:].decode('utf-8-sig', 'ignore'), ''
+            head, tail = content[:SNIFF_SIZE], content[-SNIFF_SIZE:]
+    return head.decode('utf-8-sig', 'ignore'), tail.decode('utf-8', 'ignore')
+
+def _is_json_content(path: str) -> bool:
+    """
+    Parses the whole file as json, returns True if it is an object or an array.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as file:
+            return isinstance(json.load(file), (dict, list))
+    except (ValueError, OverflowError, RecursionError):
+        return False
+
+def _is_csv_content(path: str) -> bool:
+    """
+    Reads the whole file as csv, returns True if it has rows and all of them
+    have the same number of fields.
+    """
+    fields = None
+    try:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+            for row in csv.reader(file, strict=True):
+                if not row:
+                    continue
+                if fields is None:
+                    fields = len(row)
+                elif len(row) != fields:
+                    return False
+    except (csv.Error, ValueError):
+        return False
+    return fields is not None
+
+def _is_xml_content(path: str) -> bool:
+    """
+    Feeds the whole file to an incremental xml parser, returns True if it is well-formed.
+    """
+    parser = expat.ParserCreate()
+    try:
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(SNIFF_SIZE), b''):
+                parser.Parse(chunk, False)
+        parser.Parse(b'', True)
+    except expat.ExpatError:
+        return False
+    return True
+
+def is_json(path: str, full: bool = False) -> bool:
     """
     Checks if the given file path points to a json file.
 
+    Files up to 2 * SNIFF_SIZE bytes are parsed. Only the head and the tail of larger files
+    are read: the content must start with an object or an array and end with it, so a large
+    file that is not valid json in between (eg: '{"a": 1, ... "b":}') still returns True.
+    Set full to parse the whole file.
+
     *Examples:*
 
-    >>> is_json('C:\\Users\\User\\Desktop\\file.txt') # returns true if the file is a json file
+    >>> is_json('C:\\Users\\User\\Desktop\\file.json') # returns true if the file is a json file
+    >>> is_json('C:\\Users\\User\\Desktop\\file.json', full=True) # returns true if the whole file is valid json
 
     :param path: The path to the file.
     :type path: str
+    :param full: If True, parse the whole file instead of its head and tail.
+    :type full: bool
     :return: True if the file is a json file, False otherwise.
     """
-    return (is_file(path)
-            and os.path.splitext(path) == '.json'
-            and stvl.is_json(open(path, 'r+').read()))
-
-def is_csv(path: str) -> bool:
+    if not (is_file(path) and os.path.splitext(path)[1] == '.json'):
+        return False
+    head, tail = _sniff(path)
+    if tail:
+        looks_valid = head.lstrip()[:1] in ('{', '[') and tail.rstrip()[-1:] in ('}', ']')
+    else:
+        looks_valid = stvl.is_json(head)
+    return looks_valid and (not full or _is_json_content(path))
+
+def is_csv(path: str, full: bool = False) -> bool:
     """
     Checks if the given file path points to a csv file.
 
+    Only the first and last lines held in the head and the tail of files larger than
+    2 * SNIFF_SIZE bytes are read, so a large file with a wrong row in between
+    still returns True. Set full to read the whole file and check all the rows have the same
+    number of fields.
+
     *Examples:*
 
-    >>> is_csv('C:\\Users\\User\\Desktop\\file.txt') # returns true if the file is a csv file
+    >>> is_csv('C:\\Users\\User\\Desktop\\file.csv') # returns true if the file is a csv file
+    >>> is_csv('C:\\Users\\User\\Desktop\\file.csv', full=True) # returns true if the whole file is valid csv
 
     :param path: The path to the file.
     :type path: str
+    :param full: If True, read the whole file instead of its head and tail.
+    :type full: bool
     :return: True if the file is a csv file, False otherwise.
     """
-    return (is_file(path)
-            and os.path.splitext(path) == '.csv'
-            and stvl.is_csv(open(path, 'r+').read()))
-
-def is_xml(path: str) -> bool:
+    if not (is_file(path) and os.path.splitext(path)[1] == '.csv'):
+        return False
+    head, tail = _sniff(path)
+    if tail:
+        # Drop the lines cut at the edges
+        end = head.rfind('\n')
+        looks_valid = (stvl.is_csv(head[:end] if end >= 0 else head)
+                       and stvl.is_csv(tail[tail.find('\n') + 1:]))
+    else:
+        looks_valid = stvl.is_csv(head)
+    return looks_valid and (not full or _is_csv_content(path))
+
+def is_xml(path: str, full: bool = False) -> bool:
     """
     Checks if the given file path points to a xml file.
 
+    Only the head of large files is read: the content must start with an element,
+    a comment or a doctype. Set full to parse the whole file and check it is well-formed.
+
     *Examples:*
 
-    >>> is_xml('C:\\Users\\User\\Desktop\\file.txt') # returns true if the file is a xml file
+    >>> is_xml('C:\\Users\\User\\Desktop\\file.xml') # returns true if the file is a xml file
+    >>> is_xml('C:\\Users\\User\\Desktop\\file.xml', full=True) # returns true if the whole file is well-formed xml
 
     :param path: The path to the file.
     :type path: str
+    :param full: If True, parse the whole file instead of its head.
+    :type full: bool
     :return: True if the file is a xml file, False otherwise.
     """
-    return (is_file(path)
-            and os.path.splitext(path) == '.xml'
-            and stvl.is_xml(open(path, 'r+').read()))
+    if not (is_file(path) and os.path.splitext(path)[1] == '.xml'):
+        return False
+    head, _ = _sniff(path)
+    return stvl.is_xml(head) and (not full or _is_xml_content(path))
 
 def is_sqlite(path: str) -> bool:
     """
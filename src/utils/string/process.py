@@ -5,6 +5,10 @@ This file contains functions for text manipulation.
 # Importing the required libraries
 import re
 import json
+import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Iterable, Iterator, Tuple, Callable
 from .._regex import *
 from ..errors import InvalidInputError
 from .validate import is_string
@@ -69,6 +73,50 @@ ACCENTS_MAP = {
     "Ý": "Y"
 }
 
+# Translation tables built from ACCENTS_MAP. All its chars are latin-1, so latin-1 strings are
+# translated as bytes, the rest with str.translate (latin-1 chars are in the table, so they are not misses)
+ACCENTS_BYTES_TABLE = bytes.maketrans("".join(ACCENTS_MAP).encode("latin-1"),
+                                      "".join(ACCENTS_MAP.values()).encode("latin-1"))
+ACCENTS_TABLE = {code: chr(code) for code in range(256)}
+ACCENTS_TABLE.update(str.maketrans(ACCENTS_MAP))
+
+
+class _UnicodeAccentsTable(dict):
+    """
+    Translation table (for str.translate) that removes the accents of any unicode char.
+
+    The NFKD decomposition of a char is computed the first time the char is found and then
+    kept in the table, so each char is decomposed only once. Chars in ACCENTS_MAP keep its value,
+    compatibility chars are replaced with their basic form ("ﬁ" -> "fi", "²" -> "2") and the
+    combining marks are removed.
+    """
+
+    def __missing__(self, code):
+        char = chr(code)
+        if code < 128:
+            folded = char
+        elif char in ACCENTS_MAP:
+            folded = ACCENTS_MAP[char]
+        else:
+            folded = "".join(c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c))
+        self[code] = folded
+        return folded
+
+
+UNICODE_ACCENTS_TABLE = _UnicodeAccentsTable()
+
+
+def _translate_accents(input_string: str, unicode: bool = False) -> str:
+    """
+    Replaces the accented chars of a string, see remove_accents.
+    """
+    if unicode:
+        return input_string.translate(UNICODE_ACCENTS_TABLE)
+    try:
+        return input_string.encode("latin-1").translate(ACCENTS_BYTES_TABLE).decode("latin-1")
+    except UnicodeEncodeError:
+        return input_string.translate(ACCENTS_TABLE)
+
 
 class __StringFormatter:
     """
@@ -102,9 +150,6 @@ class __StringFormatter:
     def __uppercase_first_char(self, regex_match):
         return regex_match.group(0).upper()
 
-    def __remove_duplicates(self, regex_match):
-        return regex_match.group(1)[0]
-
     def __uppercase_first_letter_after_sign(self, regex_match):
         match = regex_match.group(1)
         return match[:-1] + match[2].upper()
@@ -124,38 +169,74 @@ class __StringFormatter:
     def __fix_saxon_genitive(self, regex_match):
         return regex_match.group(1).replace(' ', '') + ' '
 
-    # generates a placeholder to inject temporary into the string, it will be replaced with the original
-    # value at the end of the process
     @staticmethod
-    def __placeholder_key():
-        return '$' + uuid4().hex + '$'
+    def __contains_any(input_string, chars):
+        return any(char in input_string for char in chars)
+
+    # finds the spans of urls and emails, so the formatting rules do not change them
+    @staticmethod
+    def __protected_spans(input_string):
+        spans = [m.span() for m in URLS_RE.finditer(input_string)]
+        if '@' in input_string:
+            # emails overlapping an url are already protected (url spans are sorted and do not overlap)
+            url_starts = [start for start, _ in spans]
+            emails = []
+            for m in EMAILS_RE.finditer(input_string):
+                i = bisect_right(url_starts, m.start())
+                if (i > 0 and spans[i - 1][1] > m.start()) or (i < len(url_starts) and url_starts[i] < m.end()):
+                    continue
+                emails.append(m.span())
+            spans = sorted(spans + emails)
+        return spans
+
+    # gets a char (from the unicode private use area) not found in the string, it marks the protected
+    # spans while formatting: as a "$" it is not a space, a letter or a digit, so the rules handle it
+    # as any other symbol, and its occurrences are never removed or reordered
+    @staticmethod
+    def __placeholder_char(input_string):
+        for code in range(0xE000, 0xF8FF):
+            if chr(code) not in input_string:
+                return chr(code)
+        raise ValueError('No placeholder char available')
 
     def format(self) -> str:
-        # map of temporary placeholders
-        placeholders = {}
         out = self.input_string
 
-        # looks for url or email and updates placeholders map with found values
-        placeholders.update({self.__placeholder_key(): m[0] for m in URLS_RE.findall(out)})
-        placeholders.update({self.__placeholder_key(): m for m in EMAILS_RE.findall(out)})
-
-        # replace original value with the placeholder key
-        for p in placeholders:
-            out = out.replace(placeholders[p], p, 1)
-
+        # replace urls and emails with the placeholder char, in a single pass over the spans
+        spans = self.__protected_spans(out)
+        if spans:
+            placeholder = self.__placeholder_char(out)
+            parts = []
+            position = 0
+            for start, end in spans:
+                parts.append(out[position:start])
+                position = end
+            parts.append(out[position:])
+            out = placeholder.join(parts)
+
+        # each rule runs on the output of the previous one, rules that cannot match
+        # (none of the signs they look for is in the string) are skipped
         out = PRETTIFY_RE['UPPERCASE_FIRST_LETTER'].sub(self.__uppercase_first_char, out)
-        out = PRETTIFY_RE['DUPLICATES'].sub(self.__remove_duplicates, out)
-        out = PRETTIFY_RE['RIGHT_SPACE'].sub(self.__ensure_right_space_only, out)
-        out = PRETTIFY_RE['LEFT_SPACE'].sub(self.__ensure_left_space_only, out)
-        out = PRETTIFY_RE['SPACES_AROUND'].sub(self.__ensure_spaces_around, out)
-        out = PRETTIFY_RE['SPACES_INSIDE'].sub(self.__remove_internal_spaces, out)
-        out = PRETTIFY_RE['UPPERCASE_AFTER_SIGN'].sub(self.__uppercase_first_letter_after_sign, out)
-        out = PRETTIFY_RE['SAXON_GENITIVE'].sub(self.__fix_saxon_genitive, out)
+        out = PRETTIFY_RE['DUPLICATES'].sub(r'\1\2', out)
+        if self.__contains_any(out, ',.;:!?%'):
+            out = PRETTIFY_RE['RIGHT_SPACE'].sub(self.__ensure_right_space_only, out)
+        if self.__contains_any(out, '"('):
+            out = PRETTIFY_RE['LEFT_SPACE'].sub(self.__ensure_left_space_only, out)
+        if self.__contains_any(out, '+-/*="('):
+            out = PRETTIFY_RE['SPACES_AROUND'].sub(self.__ensure_spaces_around, out)
+        if self.__contains_any(out, '"('):
+            out = PRETTIFY_RE['SPACES_INSIDE'].sub(self.__remove_internal_spaces, out)
+        if self.__contains_any(out, '.?!'):
+            out = PRETTIFY_RE['UPPERCASE_AFTER_SIGN'].sub(self.__uppercase_first_letter_after_sign, out)
+        if "'" in out:
+            out = PRETTIFY_RE['SAXON_GENITIVE'].sub(self.__fix_saxon_genitive, out)
         out = out.strip()
 
-        # restore placeholder keys with their associated original value
-        for p in placeholders:
-            out = out.replace(p, placeholders[p], 1)
+        # restore the original urls and emails, in the same order they were found
+        if spans:
+            parts = out.split(placeholder)
+            protected = [self.input_string[start:end] for start, end in spans]
+            out = ''.join(part + value for part, value in zip(parts, protected)) + parts[-1]
 
         return out
 
@@ -177,23 +258,28 @@ def remove_non_ascii(input_string: str) -> str:
     :return: The string without non-ascii characters.
     :rtype: str
     """
-    return "".join(i for i in input_string if ord(i) < 128)
+    # chars that cannot be encoded as ascii are dropped by the codec, without a loop in Python
+    return input_string.encode("ascii", "ignore").decode("ascii")
 
-def remove_accents(input_string: str) -> str:
+def remove_accents(input_string: str, unicode: bool = False) -> str:
     """
     Removes accents from a string.
+    By default only the accented chars of ACCENTS_MAP are replaced, use unicode=True
+    to fold any unicode char to its unaccented form (NFKD decomposition).
 
     *Examples:*
 
     >>> remove_accents('AéBíd') # returns 'AeBid'
+    >>> remove_accents('Ŝtȩp ﬁve', unicode=True) # returns 'Step five'
 
     :param input_string: The string to manipulate.
     :type input_string: str
+    :param unicode: True to remove the accents of any unicode char, False to use ACCENTS_MAP only (default).
+    :type unicode: bool
     :return: The string without accents.
     :rtype: str
     """
-    # return "".join([char for char in input_string if char not in ACCENTS_MAP])
-    return "".join([ACCENTS_MAP.get(char, char) for char in input_string])
+    return _translate_accents(input_string, unicode)
 
 # String manipulations => formatting
 
@@ -313,11 +399,164 @@ def remove_non_alphanumeric(input_string: str) -> str:
     """
     return "".join([char for char in input_string if char.isalnum()])
 
-def replace_accents(input_string: str) -> str:
+def replace_accents(input_string: str, unicode: bool = False) -> str:
     """
     Replaces all accented characters with their non-accented counterparts.
+    See remove_accents.
+    """
+    return _translate_accents(input_string, unicode)
+
+# String manipulations => normalization pipeline
+
+DEFAULT_NORMALIZE_STEPS = ("remove_non_printable", "remove_accents", "remove_whitespace")
+
+# Chars removed by remove_non_printable (same as NON_PRINTABLE_RE)
+NON_PRINTABLE_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), *range(0x7F, 0xA0)])
+
+@lru_cache(maxsize=1)
+def _whitespace_table() -> dict:
+    """
+    Gets the translation table of the chars removed by remove_whitespace (the ones str.split splits on).
+    There are no whitespace chars after U+3000.
+    """
+    return dict.fromkeys(code for code in range(0x3001) if chr(code).isspace())
+
+# Steps that only replace or remove single chars, consecutive ones are merged in a single table
+_TABLE_STEPS = {
+    "remove_non_printable": lambda: NON_PRINTABLE_TABLE,
+    "remove_accents": lambda: ACCENTS_TABLE,
+    "replace_accents": lambda: ACCENTS_TABLE,
+    "remove_whitespace": _whitespace_table,
+}
+
+# Steps applied with their own function
+_FUNCTION_STEPS = {
+    "remove_non_ascii": remove_non_ascii,
+    "remove_non_alphanumeric": remove_non_alphanumeric,
+    "capitalize": capitalize,
+    "capitalize_words": capitalize_words,
+}
+
+def _merge_tables(first: dict, second: dict) -> dict:
+    """
+    Merges two translation tables in one, with the same result as translating with the first and then the second.
+    """
+    table = {}
+    for code, value in first.items():
+        if isinstance(value, int):
+            value = chr(value)
+        table[code] = None if value is None else value.translate(second)
+    for code, value in second.items():
+        table.setdefault(code, chr(value) if isinstance(value, int) else value)
+    return table
+
+def _table_translator(table: dict) -> Callable[[str], str]:
+    """
+    Gets a function to translate strings with the given table.
+    If the table changes latin-1 chars to (at most) one latin-1 char, latin-1 strings are translated as bytes.
     """
-    return "".join([ACCENTS_MAP.get(char, char) for char in input_string])
+    # every latin-1 char in the table, so there are no misses for latin-1 strings
+    table = {**{code: chr(code) for code in range(256)}, **table}
+    latin_1 = {code: value or "" for code, value in table.items() if code < 256}
+
+    if any(len(value) > 1 or (value and ord(value) > 255) for value in latin_1.values()):
+        return lambda input_string: input_string.translate(table)
+
+    bytes_table = bytes(ord(value) if value else code for code, value in sorted(latin_1.items()))
+    bytes_delete = bytes(code for code, value in latin_1.items() if not value)
+
+    def translate(input_string: str) -> str:
+        try:
+            return input_string.encode("latin-1").translate(bytes_table, bytes_delete).decode("latin-1")
+        except UnicodeEncodeError:
+            return input_string.translate(table)
+
+    return translate
+
+@lru_cache(maxsize=32)
+def _compile_steps(steps: Tuple[str, ...]) -> Tuple[Callable[[str], str], ...]:
+    """
+    Compiles normalization steps into as few passes as possible.
+    """
+    passes = []
+    table = None
+    for step in steps:
+        if step in _TABLE_STEPS:
+            table = _TABLE_STEPS[step]() if table is None else _merge_tables(table, _TABLE_STEPS[step]())
+        elif step in _FUNCTION_STEPS:
+            if table is not None:
+                passes.append(_table_translator(table))
+                table = None
+            passes.append(_FUNCTION_STEPS[step])
+        else:
+            raise ValueError('Unknown normalization step "{}"'.format(step))
+    if table is not None:
+        passes.append(_table_translator(table))
+    return tuple(passes)
+
+def _apply_passes(input_string: str, passes: Tuple[Callable[[str], str], ...]) -> str:
+    """
+    Applies the compiled passes to a string.
+    """
+    for step in passes:
+        input_string = step(input_string)
+    return input_string
+
+def normalize(input_string: str, steps: Iterable[str] = DEFAULT_NORMALIZE_STEPS) -> str:
+    """
+    Applies several manipulations to a string, with the same result as calling them one after another.
+
+    The steps are compiled (once) into as few passes as possible: consecutive steps that only
+    replace or remove chars (remove_non_printable, remove_accents, remove_whitespace) are merged
+    in a single translation table.
+
+    Allowed steps: remove_non_printable, remove_accents, replace_accents, remove_whitespace,
+    remove_non_ascii, remove_non_alphanumeric, capitalize, capitalize_words.
+
+    *Examples:*
+
+    >>> normalize('fóo\\x0C bár') # returns 'foobar'
+    >>> normalize('fóo\\x0C bár', ['remove_non_printable', 'remove_accents', 'capitalize_words']) # returns 'Foo Bar'
+
+    :param input_string: The string to manipulate.
+    :type input_string: str
+    :param steps: Names of the functions to apply, in order.
+    :type steps: Iterable[str]
+    :return: The normalized string.
+    :rtype: str
+    """
+    if not is_string(input_string):
+        raise InvalidInputError(input_string)
+
+    return _apply_passes(input_string, _compile_steps(tuple(steps)))
+
+def normalize_many(input_strings: Iterable[str], steps: Iterable[str] = DEFAULT_NORMALIZE_STEPS) -> Iterator[str]:
+    """
+    Normalizes many strings (eg: the lines of a file) with the same steps, see normalize.
+    The steps are compiled once for all the strings, and each string is checked as in normalize.
+
+    *Examples:*
+
+    >>> list(normalize_many(['fóo', ' bár '])) # returns ['foo', 'bar']
+
+    :param input_strings: The strings to manipulate.
+    :type input_strings: Iterable[str]
+    :param steps: Names of the functions to apply, in order.
+    :type steps: Iterable[str]
+    :return: The normalized strings.
+    :rtype: Iterator[str]
+    """
+    return _normalize_each(input_strings, _compile_steps(tuple(steps)))
+
+def _normalize_each(input_strings: Iterable[str], passes: Tuple[Callable[[str], str], ...]) -> Iterator[str]:
+    """
+    Checks each string and applies the compiled passes to it, see normalize_many.
+    """
+    for input_string in input_strings:
+        if not is_string(input_string):
+            raise InvalidInputError(input_string)
+
+        yield _apply_passes(input_string, passes)
 
 # String manipulations => JSON
 
@@ -412,3 +651,46 @@ def prettify(input_string: str) -> str:
     """
     formatted = __StringFormatter(input_string).format()
     return formatted
+
+def prettify_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Reformat a text received in chunks (eg: read from a big file) with the same rules as prettify,
+    paragraph by paragraph, so only the current paragraph is kept in memory.
+
+    Unlike prettify, where the blank lines between paragraphs are merged as any other repeated space,
+    every paragraph (text between blank lines) is prettified on its own and yielded as soon as it is complete.
+
+    *Examples:*
+
+    >>> list(prettify_stream(['foo ,bar.\\n', '\\nbaz  !'])) # returns ['Foo, bar.', 'Baz!']
+    >>> '\\n\\n'.join(prettify_stream(open('document.txt'))) # returns the prettified document
+
+    :param chunks: Strings to manipulate, as a continuous text.
+    :return: Prettified paragraphs.
+    """
+    # the incomplete paragraph, without its trailing spaces, and the trailing spaces,
+    # the only place where a separator started in the previous chunks can go on
+    parts = []
+    tail = ''
+    for chunk in chunks:
+        if not is_string(chunk):
+            raise InvalidInputError(chunk)
+
+        paragraphs = PARAGRAPH_SEPARATOR_RE.split(tail + chunk)
+        if len(paragraphs) > 1:
+            parts.append(paragraphs[0])
+            for paragraph in [''.join(parts)] + paragraphs[1:-1]:
+                if paragraph.strip() != '':
+                    yield prettify(paragraph)
+            parts = []
+
+        # the last part may be an incomplete paragraph, wait for the next chunk
+        last = paragraphs[-1]
+        text = last.rstrip()
+        if text != '':
+            parts.append(text)
+        tail = last[len(text):]
+
+    pending = ''.join(parts) + tail
+    if pending.strip() != '':
+        yield prettify(pending)
@@ -3,10 +3,32 @@ This file contains the test cases for the datetime module
 """
 
 # Importing the required libraries
-from datetime import datetime, timedelta, timezone
-from unittest import TestCase
+import warnings
+from datetime import date, datetime, timedelta, timezone
+from unittest import TestCase, skipIf
 import src.utils.datetime.validate as dtvl
 import src.utils.datetime.info as dtin
+import src.utils.datetime.process as dtpr
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NOW = datetime(2023, 8, 4, 12, 0, 0)
+# zoneinfo needs python 3.9 or later, and the tz database (system or tzdata package)
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    ZoneInfo('Europe/Madrid')
+    HAS_TZDATA = True
+except (ImportError, KeyError):
+    HAS_TZDATA = False
+
+# timestamps around the DST transitions of 2023 in Madrid (2023-03-26 01:00 UTC and 2023-10-29 01:00 UTC)
+DST_TIMESTAMPS = [transition + seconds for transition in (1679792400, 1698541200)
+                  for seconds in (-3601, -3600, -1, -0.5, 0, 0.5, 1, 1800, 3599, 3600)]
+
+HOLIDAYS = [date(2023, 8, 15), date(2023, 12, 25), date(2023, 12, 26), date(2024, 1, 1)]
 
 
 class TestDateTimeCase(TestCase):
@@ -35,6 +57,71 @@ class TestDateTimeCase(TestCase):
         self.assertEqual(dtvl.parse("20030925T1049"), datetime(2003, 9, 25, 10, 49))
         self.assertEqual(dtvl.parse("20030925T10"), datetime(2003, 9, 25, 10, 0))
         self.assertEqual(dtvl.parse("20030925"), datetime(2003, 9, 25, 0, 0))
+        # ISO 8601 / RFC 3339 strings, parsed without dateutil
+        self.assertEqual(dtvl.parse("2003-09-25T10:49:41.5-03:00"), datetime(2003, 9, 25, 10,
+                         49, 41, 500000, tzinfo=timezone(timedelta(seconds=-10800))))
+        self.assertEqual(dtvl.parse("2003-09-25 10:49:41.1234567Z"), datetime(2003, 9, 25, 10,
+                         49, 41, 123456, tzinfo=timezone.utc))
+        self.assertEqual(dtvl.parse("2003-09-25T10:49"), datetime(2003, 9, 25, 10, 49))
+        self.assertEqual(dtvl.parse("2003-09-25"), datetime(2003, 9, 25))
+        self.assertRaises(ValueError, dtvl.parse, "2003-02-30")
+        self.assertRaises(ValueError, dtvl.parse, "2003-09-25T24:00:00")
+
+    def test_parse_with_column(self):
+        """
+        Method to test parse function remembering the format of a column
+
+        *Examples*:
+
+        >>> parse("25/09/2003 10:49", column="created_at") # returns datetime(2003, 9, 25, 10, 49)
+        >>> parse("10/09/2003 08:15", column="created_at") # returns datetime(2003, 9, 10, 8, 15)
+        >>> parse("10/09/2003 08:15") # returns datetime(2003, 10, 9, 8, 15)
+        """
+        dtvl.forget_formats()
+        self.assertEqual(dtvl.parse("25/09/2003 10:49", column="created_at"), datetime(2003, 9, 25, 10, 49))
+        # the column is day first, dateutil alone reads the month first
+        self.assertEqual(dtvl.parse("10/09/2003 08:15", column="created_at"), datetime(2003, 9, 10, 8, 15))
+        self.assertEqual(dtvl.parse("10/09/2003 08:15"), datetime(2003, 10, 9, 8, 15))
+        # a string with another format is parsed by dateutil and its format is remembered
+        self.assertEqual(dtvl.parse("Sep-26-2003", column="created_at"), datetime(2003, 9, 26))
+        self.assertEqual(dtvl.parse("Oct-01-2003", column="created_at"), datetime(2003, 10, 1))
+        self.assertEqual(dtvl.parse("Thu, 25 Sep 2003 10:49:41 -0300", column="sent_at"), datetime(2003, 9, 25, 10,
+                         49, 41, tzinfo=timezone(timedelta(seconds=-10800))))
+        self.assertTrue(dtvl.is_parseable("Fri, 26 Sep 2003 10:49:41 +0000", column="sent_at"))
+        self.assertFalse(dtvl.is_parseable("invalid_datetime", column="sent_at"))
+        dtvl.forget_formats("created_at")
+        self.assertEqual(dtvl.parse("10/09/2003 08:15", column="created_at"), datetime(2003, 10, 9, 8, 15))
+        dtvl.forget_formats()
+
+    def test_parse_column(self):
+        """
+        Method to test parse_column function
+
+        *Examples*:
+
+        >>> parse_column(["25/09/2003 10:49", "10/09/2003 08:15", "invalid"]) # returns ParsedColumn(values=[datetime(2003, 9, 25, 10, 49), datetime(2003, 9, 10, 8, 15), None], errors=[False, False, True], format='%d/%m/%Y %H:%M')
+        >>> parse_column(["2003-09-25T10:49:41Z", "2003-09-25"]).format # returns 'ISO 8601'
+        """
+        # ambiguous strings are read with the format of the column
+        column = dtvl.parse_column(["10/09/2003 08:15", "25/09/2003 10:49", "invalid", None, "Sep-26-2003"])
+        self.assertEqual(column.format, '%d/%m/%Y %H:%M')
+        self.assertEqual(column.values, [datetime(2003, 9, 10, 8, 15), datetime(2003, 9, 25, 10, 49), None, None,
+                                         datetime(2003, 9, 26)])
+        self.assertEqual(column.errors, [False, False, True, True, False])
+        column = dtvl.parse_column(["2003-09-25T10:49:41.5-03:00", "2003-09-25", "20030925T1049"])
+        self.assertEqual(column.format, dtvl.ISO_FORMAT)
+        self.assertEqual(column.values, [datetime(2003, 9, 25, 10, 49, 41, 500000, tzinfo=timezone(timedelta(hours=-3))),
+                                         datetime(2003, 9, 25), datetime(2003, 9, 25, 10, 49)])
+        column = dtvl.parse_column(["Thu, 25 Sep 2003 10:49:41 -0300", "Fri, 26 Sep 2003 10:49:41 +0000"])
+        self.assertEqual(column.format, '%a, %d %b %Y %H:%M:%S %z')
+        self.assertEqual(column.values[1], datetime(2003, 9, 26, 10, 49, 41, tzinfo=timezone.utc))
+        # the format is inferred from the sample only
+        strings = ["2003/09/{:02d}".format(day) for day in range(1, 31)]
+        column = dtvl.parse_column(["invalid"] * 5 + strings, sample_size=5)
+        self.assertIsNone(column.format)
+        self.assertEqual(column.values[5:], [datetime(2003, 9, day) for day in range(1, 31)])
+        self.assertEqual(column.errors, [True] * 5 + [False] * 30)
+        self.assertEqual(dtvl.parse_column([]), dtvl.ParsedColumn([], [], None))
 
     def test_is_parseable(self):
         """
@@ -84,6 +171,23 @@ class TestDateTimeCase(TestCase):
         self.assertFalse(dtvl.is_past(datetime(2090, 12, 31, 23, 59, 59)))
         self.assertTrue(dtvl.is_past(datetime(2000, 12, 31, 23, 59, 59)))
 
+    @skipIf(np is None, 'numpy is not installed')
+    def test_is_future_many(self):
+        """
+        Method to test is_future_many and is_past_many functions
+
+        *Examples*:
+
+        >>> is_future_many([datetime(2090, 12, 31, 23, 59, 59), datetime(2000, 12, 31, 23, 59, 59), None]) # returns array([ True, False, False])
+        >>> is_past_many([datetime(2090, 12, 31, 23, 59, 59), datetime(2000, 12, 31, 23, 59, 59), None]) # returns array([False,  True, False])
+        """
+        dates = [datetime(2090, 12, 31, 23, 59, 59), datetime(2000, 12, 31, 23, 59, 59), NOW, None]
+        self.assertEqual(dtvl.is_future_many(dates).tolist(), [True, False, False, False])
+        self.assertEqual(dtvl.is_past_many(dates).tolist(), [False, True, True, False])
+        self.assertEqual(dtvl.is_future_many(dates, now=datetime(2095, 1, 1)).tolist(), [False, False, False, False])
+        self.assertEqual(dtvl.is_past_many(np.array(dates, dtype='datetime64[s]'), now=NOW).tolist(),
+                         [False, True, False, False])
+
     def test_is_today(self):
         """
         Method to test is_today function
@@ -96,6 +200,25 @@ class TestDateTimeCase(TestCase):
         self.assertFalse(dtvl.is_today(datetime(2090, 12, 31, 23, 59, 59)))
         self.assertTrue(dtvl.is_today(datetime.now()))
 
+    @skipIf(np is None, 'numpy is not installed')
+    def test_is_today_many(self):
+        """
+        Method to test is_today_many function
+
+        *Examples*:
+
+        >>> is_today_many([datetime(2090, 12, 31, 23, 59, 59), datetime.now()]) # returns array([False,  True])
+        """
+        self.assertEqual(dtvl.is_today_many([datetime(2090, 12, 31, 23, 59, 59), datetime.now()]).tolist(), [False, True])
+        dates = [datetime(2023, 8, 4), datetime(2023, 8, 4, 23, 59, 59), datetime(2023, 8, 5), None]
+        self.assertEqual(dtvl.is_today_many(dates, now=NOW).tolist(), [True, True, False, False])
+        # Test aware datetimes are compared in UTC, without the numpy timezone warning
+        aware = [datetime(2023, 8, 5, 1, 30, tzinfo=timezone(timedelta(hours=2))), datetime(2023, 8, 5, tzinfo=timezone.utc)]
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(dtvl.is_today_many(aware, now=NOW).tolist(), [True, False])
+            self.assertEqual(dtvl.is_today_many(aware, now=NOW.replace(tzinfo=timezone.utc)).tolist(), [True, False])
+
     def test_is_business_day(self):
         """
         Method to test is_business_day function
@@ -107,6 +230,19 @@ class TestDateTimeCase(TestCase):
         """
         self.assertFalse(dtvl.is_business_day(datetime(2023, 9, 3, 23, 59, 59)))
 
+    @skipIf(np is None, 'numpy is not installed')
+    def test_is_business_day_many(self):
+        """
+        Method to test is_business_day_many function
+
+        *Examples*:
+
+        >>> is_business_day_many([datetime(2023, 8, 4), datetime(2023, 8, 5), datetime(2023, 8, 7)]) # returns array([ True, False,  True])
+        """
+        dates = [datetime(2023, 8, 4), datetime(2023, 8, 5), datetime(2023, 8, 6), datetime(2023, 8, 7), None]
+        self.assertEqual(dtvl.is_business_day_many(dates).tolist(), [True, False, False, True, False])
+        self.assertEqual(dtvl.is_business_day_many(dates[:-1]).tolist(), [dtvl.is_business_day(date) for date in dates[:-1]])
+
     def test_is_same_day(self):
         """
         Method to test is_same_day function
@@ -142,6 +278,21 @@ class TestDateTimeCase(TestCase):
         self.assertFalse(dtvl.is_same_week(datetime(2022, 12, 30, 23, 59, 59),
                                            datetime(2022, 12, 15, 23, 59, 59)))
 
+    @skipIf(np is None, 'numpy is not installed')
+    def test_is_same_week_many(self):
+        """
+        Method to test is_same_week_many function
+
+        *Examples*:
+
+        >>> is_same_week_many([datetime(2023, 8, 7), datetime(2023, 8, 7)], [datetime(2023, 8, 13), datetime(2023, 8, 14)]) # returns array([ True, False])
+        """
+        dates1 = [datetime(2023, 8, 7), datetime(2023, 8, 7), datetime(2020, 12, 31), datetime(2021, 1, 3), None]
+        dates2 = [datetime(2023, 8, 13), datetime(2023, 8, 14), datetime(2021, 1, 1), datetime(2021, 1, 4), NOW]
+        self.assertEqual(dtvl.is_same_week_many(dates1, dates2).tolist(), [True, False, True, False, False])
+        self.assertEqual(dtvl.is_same_week_many(dates1[:-1], dates2[:-1]).tolist(),
+                         [dtvl.is_same_week(date1, date2) for date1, date2 in zip(dates1[:-1], dates2[:-1])])
+
     def test_is_same_month(self):
         """
         Method to test is_same_month function
@@ -225,8 +376,14 @@ class TestDateTimeCase(TestCase):
         *Examples*:
 
         >>> get_time(datetime(2020, 1, 1)) # returns '00:00:00'
+        >>> get_time(datetime(2020, 1, 1, 9, 5, 30), '%I:%M %p') # returns '09:05 AM'
         """
         self.assertEqual(dtin.get_time(datetime(2020, 1, 1)), '00:00:00')
+        self.assertEqual(dtin.get_time(datetime(2020, 1, 1, 9, 5, 30), '%H:%M'), '09:05')
+        self.assertEqual(dtin.get_time(datetime(2020, 1, 1, 9, 5, 30, 1500), '%H:%M:%S.%f'), '09:05:30.001500')
+        self.assertEqual(dtin.get_time(datetime(2020, 1, 1, 21, 5, 30), '%I:%M %p'), '09:05 PM')
+        self.assertEqual(dtin.get_time(datetime(2020, 1, 1, 9, 5, tzinfo=timezone.utc), '%H:%M %z'), '09:05 +0000')
+        self.assertIsNone(dtin.get_time('2020-01-01'))
 
     def test_get_date(self):
         """
@@ -235,8 +392,20 @@ class TestDateTimeCase(TestCase):
         *Examples*:
 
         >>> get_date(datetime(2020, 1, 1)) # returns '2020-01-01'
+        >>> get_date(datetime(2020, 1, 1), '%d/%m/%Y') # returns '01/01/2020'
         """
         self.assertEqual(dtin.get_date(datetime(2020, 1, 1)), '2020-01-01')
+        self.assertEqual(dtin.get_date(datetime(2020, 1, 1, 23, 59), '%d/%m/%Y'), '01/01/2020')
+        self.assertEqual(dtin.get_date(datetime(2020, 1, 1), '%Y%m%d'), '20200101')
+        self.assertEqual(dtin.get_date(datetime(2020, 1, 1), '%d %%Y'), '01 %Y')
+        self.assertEqual(dtin.get_date(datetime(2020, 1, 1, 10, 30), '%Y-%m-%d %H:%M:%S'), '2020-01-01 10:30:00')
+        # years before 1000 are rendered by strftime
+        self.assertEqual(dtin.get_date(datetime(999, 1, 1)), datetime(999, 1, 1).strftime('%Y-%m-%d'))
+        # the datetimes of a day share the rendered date
+        dtin.render_cache_clear()
+        for hour in range(24):
+            self.assertEqual(dtin.get_date(datetime(2020, 1, 2, hour), '%d/%m/%Y'), '02/01/2020')
+        self.assertEqual(dtin._render_cached.cache_info().misses, 1)
 
     def test_get_timezone(self):
         """
@@ -250,6 +419,89 @@ class TestDateTimeCase(TestCase):
         self.assertEqual(dtin.get_timezone(datetime(2020, 1, 1)), None)
         self.assertEqual(dtin.get_timezone(datetime(2020, 1, 1, 0, 0, 0, tzinfo=timezone(timedelta(hours=1)))), 'UTC+01:00')
 
+    @skipIf(not HAS_TZDATA, 'tzdata is not available')
+    def test_get_timezone_zone(self):
+        """
+        Method to test get_timezone and get_timestamp functions with a zone
+
+        *Examples*:
+
+        >>> get_timezone(datetime(2020, 7, 1), 'Europe/Madrid') # returns 'CEST'
+        >>> get_timestamp(datetime(2020, 1, 1), 'Europe/Madrid') # returns 1577833200
+        """
+        self.assertEqual(dtin.get_timezone(datetime(2020, 7, 1), 'Europe/Madrid'), 'CEST')
+        self.assertEqual(dtin.get_timezone(datetime(2020, 1, 1), 'Europe/Madrid'), 'CET')
+        self.assertEqual(dtin.get_timezone(datetime(2020, 7, 1, tzinfo=timezone.utc), 'America/New_York'), 'EDT')
+        self.assertEqual(dtin.get_timestamp(datetime(2020, 1, 1), 'Europe/Madrid'), 1577833200)
+        self.assertEqual(dtin.get_timestamp(datetime(2020, 1, 1, tzinfo=timezone.utc), 'Europe/Madrid'), 1577836800)
+        # 02:30 happens twice on 2023-10-29, once on CEST and once on CET (fold=1)
+        self.assertEqual(dtin.get_timestamp(datetime(2023, 10, 29, 2, 30), 'Europe/Madrid'), 1698539400)
+        self.assertEqual(dtin.get_timestamp(datetime(2023, 10, 29, 2, 30, fold=1), 'Europe/Madrid'), 1698543000)
+        self.assertEqual(dtin.get_timezone(datetime(2023, 10, 29, 2, 30, fold=1), 'Europe/Madrid'), 'CET')
+        zone = ZoneInfo('Europe/Madrid')
+        for timestamp in DST_TIMESTAMPS:
+            for fold in (0, 1):
+                wall = datetime.fromtimestamp(timestamp, zone).replace(tzinfo=None, fold=fold)
+                self.assertEqual(dtin.get_timestamp(wall, 'Europe/Madrid'), int(wall.replace(tzinfo=zone).timestamp()))
+                self.assertEqual(dtin.get_timezone(wall, 'Europe/Madrid'), wall.replace(tzinfo=zone).tzname())
+        # 02:30 does not exist on 2023-03-26, it is read with the offset before (fold=0) or after (fold=1)
+        gap = datetime(2023, 3, 26, 2, 30)
+        self.assertEqual(dtin.get_timestamp(gap, 'Europe/Madrid'), int(gap.replace(tzinfo=zone).timestamp()))
+        self.assertEqual(dtin.get_timestamp(gap.replace(fold=1), 'Europe/Madrid'),
+                         int(gap.replace(tzinfo=zone, fold=1).timestamp()))
+
+    @skipIf(not HAS_TZDATA, 'tzdata is not available')
+    def test_get_zone_year(self):
+        """
+        Method to test get_zone_year function
+
+        *Examples*:
+
+        >>> get_zone_year('Europe/Madrid', 2023).offsets # returns [3600, 7200, 3600]
+        >>> get_zone_year('Europe/Madrid', 2023).names # returns ['CET', 'CEST', 'CET']
+        """
+        zone_year = dtin.get_zone_year('Europe/Madrid', 2023)
+        self.assertEqual(zone_year.starts[1:], [1679792400, 1698541200])
+        self.assertEqual(zone_year.offsets, [3600, 7200, 3600])
+        self.assertEqual(zone_year.names, ['CET', 'CEST', 'CET'])
+        self.assertIs(dtin.get_zone_year('Europe/Madrid', 2023), zone_year)
+        self.assertIs(dtin.get_zone('Europe/Madrid'), ZoneInfo('Europe/Madrid'))
+        self.assertEqual(dtin.get_zone_year('Asia/Kolkata', 2023).offsets, [19800])
+        self.assertRaises(ZoneInfoNotFoundError, dtin.get_zone, 'Not/A_Zone')
+
+    @skipIf(not HAS_TZDATA, 'tzdata is not available')
+    def test_from_timestamp(self):
+        """
+        Method to test from_timestamp function
+
+        *Examples*:
+
+        >>> from_timestamp(1698541200, 'Europe/Madrid') # returns datetime(2023, 10, 29, 2, 0, fold=1, tzinfo=ZoneInfo('Europe/Madrid'))
+        """
+        zone = ZoneInfo('Europe/Madrid')
+        for timestamp in DST_TIMESTAMPS:
+            expected = datetime.fromtimestamp(timestamp, zone)
+            date = dtin.from_timestamp(timestamp, 'Europe/Madrid')
+            self.assertEqual((date.replace(tzinfo=None), date.fold, date.tzname()),
+                             (expected.replace(tzinfo=None), expected.fold, expected.tzname()))
+
+    @skipIf(not HAS_TZDATA or np is None, 'tzdata or numpy is not available')
+    def test_from_timestamp_many(self):
+        """
+        Method to test from_timestamp_many function
+
+        *Examples*:
+
+        >>> from_timestamp_many([1688169600, 1704067200], 'Europe/Madrid') # returns array(['2023-07-01T02:00:00.000000', '2024-01-01T01:00:00.000000'], dtype='datetime64[us]')
+        """
+        # around the transitions and the new year, in years with and without DST
+        timestamps = DST_TIMESTAMPS + [1704067199.999999, 1704067200, 1704070800, 1e9, 2e9]
+        for name in ('Europe/Madrid', 'America/New_York', 'Australia/Lord_Howe', 'Asia/Kolkata', 'UTC'):
+            zone = ZoneInfo(name)
+            expected = [datetime.fromtimestamp(timestamp, zone).replace(tzinfo=None) for timestamp in timestamps]
+            self.assertEqual(dtin.from_timestamp_many(timestamps, name).tolist(), expected)
+        self.assertEqual(dtin.from_timestamp_many([], 'UTC').tolist(), [])
+
     def test_get_age(self):
         """
         Method to test get_age function
@@ -272,6 +524,19 @@ class TestDateTimeCase(TestCase):
         """
         self.assertEqual(dtin.get_season(datetime(2020, 1, 1)), 'winter')
 
+    @skipIf(np is None, 'numpy is not installed')
+    def test_get_season_many(self):
+        """
+        Method to test get_season_many function
+
+        *Examples*:
+
+        >>> get_season_many([datetime(2020, 1, 1), datetime(2020, 7, 1)]) # returns array(['winter', 'summer'], dtype=object)
+        """
+        dates = [datetime(2020, month, 1) for month in range(1, 13)]
+        self.assertEqual(dtin.get_season_many(dates).tolist(), [dtin.get_season(date) for date in dates])
+        self.assertEqual(dtin.get_season_many([None]).tolist(), [None])
+
     def test_get_quarter(self):
         """
         Method to test get_quarter function
@@ -282,6 +547,19 @@ class TestDateTimeCase(TestCase):
         """
         self.assertEqual(dtin.get_quarter(datetime(2020, 1, 1)), 1)
 
+    @skipIf(np is None, 'numpy is not installed')
+    def test_get_quarter_many(self):
+        """
+        Method to test get_quarter_many function
+
+        *Examples*:
+
+        >>> get_quarter_many([datetime(2020, 1, 1), datetime(2020, 12, 31)]) # returns array([1, 4])
+        """
+        dates = [datetime(2020, month, 1) for month in range(1, 13)]
+        self.assertEqual(dtin.get_quarter_many(dates).tolist(), [dtin.get_quarter(date) for date in dates])
+        self.assertEqual(dtin.get_quarter_many([None]).tolist(), [0])
+
     def test_get_dat_of_year(self):
         """
         Method to test get_of_year function
@@ -292,4 +570,80 @@ class TestDateTimeCase(TestCase):
         """
         self.assertEqual(dtin.get_day_of_year(datetime(2020, 1, 1)), 1)
 
+    @skipIf(np is None, 'numpy is not installed')
+    def test_get_day_of_year_many(self):
+        """
+        Method to test get_day_of_year_many function
+
+        *Examples*:
+
+        >>> get_day_of_year_many([datetime(2020, 1, 1), datetime(2020, 12, 31)]) # returns array([  1, 366])
+        """
+        dates = [datetime(2020, 1, 1), datetime(2020, 12, 31, 23, 59, 59), datetime(2021, 12, 31), datetime(1900, 3, 1)]
+        self.assertEqual(dtin.get_day_of_year_many(dates).tolist(), [1, 366, 365, 60])
+        self.assertEqual(dtin.get_day_of_year_many([None]).tolist(), [0])
+
     # Processing functions
+
+    def test_business_calendar(self):
+        """
+        Method to test BusinessCalendar class
+
+        *Examples*:
+
+        >>> calendar = BusinessCalendar([date(2023, 8, 15)])
+        >>> calendar.count(date(2023, 8, 14), date(2023, 8, 21)) # returns 4
+        >>> calendar.add(date(2023, 8, 14), 1) # returns date(2023, 8, 16)
+        >>> calendar.next_business_day(date(2023, 8, 18)) # returns date(2023, 8, 21)
+        >>> calendar.previous_business_day(date(2023, 8, 16)) # returns date(2023, 8, 14)
+        """
+        calendar = dtpr.BusinessCalendar(HOLIDAYS)
+        self.assertTrue(calendar.is_business_day(date(2023, 8, 14)))
+        self.assertFalse(calendar.is_business_day(date(2023, 8, 15)))
+        self.assertFalse(calendar.is_business_day(date(2023, 8, 19)))
+        self.assertFalse(dtvl.is_business_day(datetime(2023, 8, 15), calendar))
+        self.assertTrue(dtvl.is_business_day(datetime(2023, 8, 15)))
+        self.assertEqual(calendar.count(date(2023, 8, 14), date(2023, 8, 21)), 4)
+        self.assertEqual(calendar.count(date(2023, 8, 21), date(2023, 8, 14)), -4)
+        self.assertEqual(calendar.count(date(2023, 1, 1), date(2024, 1, 1)), 260 - 3)
+        self.assertEqual(calendar.add(date(2023, 8, 14), 1), date(2023, 8, 16))
+        self.assertEqual(calendar.add(date(2023, 8, 19), 0), date(2023, 8, 21))
+        self.assertEqual(calendar.add(date(2023, 8, 19), -1), date(2023, 8, 18))
+        self.assertEqual(calendar.add(datetime(2023, 12, 22, 9, 30), 1), datetime(2023, 12, 27, 9, 30))
+        self.assertEqual(calendar.add(date(2023, 12, 27), -3), date(2023, 12, 20))
+        self.assertEqual(calendar.next_business_day(date(2023, 12, 22)), date(2023, 12, 27))
+        self.assertEqual(calendar.previous_business_day(date(2024, 1, 2)), date(2023, 12, 29))
+        # weekends only
+        calendar = dtpr.BusinessCalendar(weekdays=(5, 6))
+        self.assertEqual(calendar.next_business_day(date(2023, 8, 14)), date(2023, 8, 19))
+        self.assertEqual(calendar.count(date(2023, 8, 1), date(2023, 9, 1)), 8)
+        self.assertRaises(ValueError, dtpr.BusinessCalendar, weekdays=(7,))
+
+    @skipIf(np is None, 'numpy is not installed')
+    def test_business_calendar_many(self):
+        """
+        Method to test BusinessCalendar batch functions
+
+        *Examples*:
+
+        >>> calendar = BusinessCalendar([date(2023, 8, 15)])
+        >>> calendar.count_many([date(2023, 8, 14)], [date(2023, 8, 21)]) # returns array([4])
+        >>> calendar.add_many([date(2023, 8, 14), date(2023, 8, 19)], 1) # returns array(['2023-08-16', '2023-08-22'], dtype='datetime64[D]')
+        """
+        calendar = dtpr.BusinessCalendar(HOLIDAYS)
+        starts = [date(2023, 8, 14) + timedelta(days=days) for days in range(0, 200, 7)]
+        ends = [date(2023, 12, 31) - timedelta(days=days) for days in range(0, 400, 14)]
+        counts = list(range(-14, 15))
+        self.assertEqual(calendar.count_many(starts, ends).tolist(),
+                         [calendar.count(start, end) for start, end in zip(starts, ends)])
+        self.assertEqual(calendar.add_many(starts, counts).tolist(),
+                         [calendar.add(start, count) for start, count in zip(starts, counts)])
+        times = [datetime(2023, 8, 14, 10, 30) + timedelta(days=days, seconds=days * 997) for days in range(0, 200, 7)]
+        self.assertEqual(calendar.add_many(times, counts).tolist(),
+                         [calendar.add(time, count) for time, count in zip(times, counts)])
+        self.assertEqual(calendar.add_many(np.array(times, dtype='datetime64[m]'), 1)[0],
+                         np.datetime64('2023-08-16T10:30'))
+        self.assertEqual(calendar.is_business_day_many(starts + [None]).tolist(),
+                         [calendar.is_business_day(start) for start in starts] + [False])
+        self.assertEqual(dtvl.is_business_day_many([datetime(2023, 8, 14), datetime(2023, 8, 15)], calendar).tolist(),
+                         [True, False])
@@ -4,8 +4,9 @@ This file for testing the utility functions at utils\directory\
 
 # Importing the required libraries
 import os
+import shutil
 import datetime as dt
-from unittest import TestCase
+from unittest import TestCase, mock
 import src.utils.file.process as flpr
 import src.utils.directory.info as drin
 import src.utils.directory.validate as drvl
@@ -152,7 +153,9 @@ class TestDirCase(TestCase):
         >>> get_size('C:\\Users\\User\\Desktop\\directory') # returns 0 if the directory is empty
         >>> get_size('C:\\Users\\User\\Desktop\\directory') # returns 1024 if the directory is not empty
         """
-        self.assertEqual(drin.get_size(test_dir), 8)
+        self.assertEqual(drin.get_size(test_dir), 16)
+        self.assertEqual(drin.get_size(test_dir, workers=2), 16)
+        self.assertEqual(drin.get_size(test_dir_inside), 4)
 
     def test_get_name(self):
         """
@@ -220,6 +223,35 @@ class TestDirCase(TestCase):
             os.path.join(os.path.relpath(test_dir), "test_hidden_dir_inside\\test_hidden_file_inside.txt")
         ])
 
+    def test_iter_contents(self):
+        """
+        Method to test iter_contents function
+
+        *Examples:*
+
+        >>> iter_contents('C:\\Users\\User\\Desktop\\', hidden=True) # yields the entries of the directory
+        """
+        # Test iter_contents gives the same paths as get_contents
+        paths = [entry.path for entry in drin.iter_contents(os.path.relpath(test_dir), True)]
+        self.assertEqual(paths, drin.get_contents(test_dir, True))
+
+        # Test the type, size and modification time of the entries
+        entries = {entry.path: entry for entry in drin.iter_contents(test_dir, True)}
+        self.assertEqual(entries[test_dir_inside].type, "dir")
+        self.assertEqual(entries[test_file_inside].type, "file")
+        self.assertEqual(entries[test_file_inside].size, 4)
+        self.assertEqual(entries[test_file_inside].mtime, os.path.getmtime(test_file_inside))
+
+        # Test the depth limit, the filters and the pruning callback
+        self.assertEqual(len(list(drin.iter_contents(test_dir, True, max_depth=1))), 4)
+        self.assertEqual([entry.path for entry in drin.iter_contents(test_dir, True, pattern="test_file_*")],
+                         [test_file_inside, test_file_inside_inside])
+        self.assertEqual([entry.path for entry in drin.iter_contents(test_dir, True, regex=r"^test_dir_inside.")],
+                         [test_file_inside_inside])
+        self.assertNotIn(test_file_inside_inside,
+                         [entry.path for entry in drin.iter_contents(test_dir, True,
+                                                                     prune=lambda entry: entry.path == test_dir_inside)])
+
     def test_get_creation_datetime(self):
         """
         Method to test get_creation_datetime function
@@ -327,6 +359,75 @@ class TestDirCase(TestCase):
         self.assertTrue(drpr.copy(test_dir_inside, test_dir_inside.replace(
             "\\test_dir_inside", "\\test_dir_inside_copied")))
 
+    def test_copy_tree(self):
+        """
+        Method to test copy_tree function
+
+        *Examples:*
+
+        >>> copy_tree('C:\\Users\\User\\Desktop\\directory', 'C:\\Users\\User\\Desktop\\new_directory') # returns CopyReport(files=1, bytes=4, dirs=1)
+        """
+        # Test copy_tree function, in parallel and in the current thread
+        new_path = os.path.join(test_dir, "test_dir_copied")
+        progress = []
+        report = drpr.copy_tree(test_dir_inside, new_path, workers=4,
+                                progress=lambda files, copied: progress.append((files, copied)))
+        self.assertEqual(report, drpr.CopyReport(files=1, bytes=4, dirs=1))
+        self.assertEqual(progress, [(1, 4)])
+        self.assertEqual(flpr.read(os.path.join(new_path, "test_file_inside.txt")), "test")
+        drpr.delete(new_path)
+        self.assertEqual(drpr.copy_tree(test_dir_inside, new_path, workers=1),
+                         drpr.CopyReport(files=1, bytes=4, dirs=1))
+
+    def test_copy_tree_special_files(self):
+        """
+        Method to test copy_tree function raises on special files, as named pipes
+
+        *Examples:*
+
+        >>> copy_tree('/home/user/directory', '/home/user/new_directory') # raises shutil.SpecialFileError if there is a named pipe
+        """
+        if not hasattr(os, "mkfifo"):
+            self.skipTest("named pipes are not available")
+        os.mkfifo(os.path.join(test_dir_inside, "test_fifo"))
+        new_path = os.path.join(test_dir, "test_dir_copied")
+        self.assertRaises(shutil.SpecialFileError, drpr.copy_tree, test_dir_inside, new_path)
+
+    def test_copy_tree_symlinks(self):
+        """
+        Method to test copy_tree function with symlinks, followed by default or copied as symlinks
+
+        *Examples:*
+
+        >>> copy_tree('C:\\Users\\User\\Desktop\\directory', 'C:\\Users\\User\\Desktop\\new_directory', symlinks=True) # returns CopyReport(files=2, bytes=4, dirs=1)
+        """
+        linked_dir = os.path.join(test_dir, "test_dir_linked")
+        try:
+            os.symlink(test_file_inside_inside, linked_dir + "_file")
+        except (OSError, NotImplementedError):
+            self.skipTest("symlinks are not available")
+        os.remove(linked_dir + "_file")
+        os.mkdir(linked_dir)
+        os.symlink(test_file_inside_inside, os.path.join(linked_dir, "file_link"))
+        os.symlink(test_dir_inside, os.path.join(linked_dir, "dir_link"), target_is_directory=True)
+        os.symlink(linked_dir, os.path.join(linked_dir, "loop_link"), target_is_directory=True)
+        # Test the symlinks are followed, the loop is kept as a symlink
+        new_path = os.path.join(test_dir, "test_dir_copied")
+        self.assertEqual(drpr.copy_tree(linked_dir, new_path), drpr.CopyReport(files=3, bytes=8, dirs=2))
+        self.assertFalse(os.path.islink(os.path.join(new_path, "file_link")))
+        self.assertFalse(os.path.islink(os.path.join(new_path, "dir_link")))
+        self.assertEqual(flpr.read(os.path.join(new_path, "dir_link", "test_file_inside.txt")), "test")
+        self.assertTrue(os.path.islink(os.path.join(new_path, "loop_link")))
+        drpr.delete(new_path)
+        # Test the symlinks are copied as symlinks
+        self.assertEqual(drpr.copy_tree(linked_dir, new_path, symlinks=True),
+                         drpr.CopyReport(files=3, bytes=0, dirs=1))
+        self.assertEqual(os.readlink(os.path.join(new_path, "dir_link")), test_dir_inside)
+        for path in (new_path, linked_dir):
+            for name in ("file_link", "dir_link", "loop_link"):
+                os.remove(os.path.join(path, name))
+            os.rmdir(path)
+
     def test_duplicate(self):
         """
         Method to test duplicate function
@@ -337,10 +438,73 @@ class TestDirCase(TestCase):
         >>> duplicate('C:\\Users\\User\\Desktop\\directory') # returns False if not duplicated successfully
         """
         # Test duplicate function
-        self.assertTrue(drpr.duplicate(test_dir_inside))
-        self.assertTrue(drpr.duplicate(test_dir_inside))
+        self.assertEqual(drpr.duplicate(test_dir_inside), test_dir_inside + " (1)")
+        self.assertEqual(drpr.duplicate(test_dir_inside), test_dir_inside + " (2)")
+
+        # Test concurrent duplicates reserve different paths, and each one gets a full copy
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            new_paths = list(executor.map(lambda _: drpr.duplicate(test_dir_inside), range(4)))
+        self.assertEqual(sorted(new_paths), [test_dir_inside + " ({})".format(n) for n in range(3, 7)])
+        for new_path in new_paths:
+            self.assertEqual(flpr.read(os.path.join(new_path, "test_file_inside.txt")), "test")
+
+    def test_copy_tree_reserved(self):
+        """
+        Method to test copy_tree function into a reserved (empty) directory
+
+        *Examples:*
+
+        >>> copy_tree('C:\\Users\\User\\Desktop\\directory', get_duplicated_path('C:\\Users\\User\\Desktop\\directory', reserve=True))
+        """
+        new_path = drpr.get_duplicated_path(test_dir_inside, reserve=True)
+        self.assertEqual(drpr.copy_tree(test_dir_inside, new_path), drpr.CopyReport(files=1, bytes=4, dirs=1))
+        self.assertEqual(flpr.read(os.path.join(new_path, "test_file_inside.txt")), "test")
+        # Test a directory with contents is not overwritten
+        self.assertRaises(FileExistsError, drpr.copy_tree, test_dir_inside, new_path)
+
+    def test_move(self):
+        """
+        Method to test move function
+
+        *Examples:*
+
+        >>> move('C:\\Users\\User\\Desktop\\directory', 'C:\\Users\\User\\Desktop\\new_directory') # returns True if moved successfully
+        """
+        # Test move function, renaming in the same device
+        new_path = os.path.join(test_dir, "test_dir_moved", "test_dir_inside")
+        self.assertTrue(drpr.move(test_dir_inside, new_path))
+        self.assertFalse(drvl.is_dir(test_dir_inside))
+        self.assertEqual(flpr.read(os.path.join(new_path, "test_file_inside.txt")), "test")
+
+        # Test move function does not overwrite an existing directory
+        self.assertFalse(drpr.move(new_path, test_hidden_dir_inside))
+
+    def test_move_across_devices(self):
+        """
+        Method to test move function across devices, copying the directory and deleting it
+
+        *Examples:*
 
-    # def test_move(self):
+        >>> move('C:\\Users\\User\\Desktop\\directory', 'D:\\directory') # returns True if moved successfully
+        """
+        link = os.path.join(test_dir_inside, "file_link")
+        try:
+            os.symlink(test_file_inside, link)
+        except (OSError, NotImplementedError):
+            self.skipTest("symlinks are not available")
+        new_path = os.path.join(test_dir, "test_dir_moved")
+        with mock.patch.object(drpr, "_same_device", return_value=False):
+            # Test the original and the copy are kept apart when the copy is not complete
+            with mock.patch.object(drpr, "_is_copied", return_value=False):
+                self.assertFalse(drpr.move(test_dir_inside, new_path))
+            self.assertTrue(drvl.is_dir(test_dir_inside))
+            self.assertFalse(os.path.exists(new_path))
+            # Test the symlinks are moved as symlinks
+            self.assertTrue(drpr.move(test_dir_inside, new_path))
+        self.assertFalse(os.path.exists(test_dir_inside))
+        self.assertEqual(os.readlink(os.path.join(new_path, "file_link")), test_file_inside)
+        self.assertEqual(flpr.read(os.path.join(new_path, "test_file_inside.txt")), "test")
 
     def test_set_hidden(self):
         """
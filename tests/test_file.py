@@ -4,8 +4,11 @@ This file for testing the utility class at utils\file\
 
 # Importing the required libraries
 import os
+import time
+import pathlib
 import datetime as dt
-from unittest import TestCase
+from unittest import TestCase, mock
+import src.utils.cache as cache
 import src.utils.file.validate as flvl
 import src.utils.file.info as flin
 import src.utils.file.process as flpr
@@ -103,6 +106,21 @@ class TestFileCase(TestCase):
         """
         self.assertTrue(flvl.is_file(test_file_inside))
         self.assertFalse(flvl.is_file(test_dir))
+        # Test the path is checked with a single stat, a path that disappears after it is not an error
+        stat = os.stat(test_file_inside)
+        with mock.patch("os.stat", side_effect=[stat, FileNotFoundError()]):
+            self.assertTrue(flvl.is_file(test_file_inside))
+        with mock.patch("os.stat", side_effect=[os.stat(test_dir), FileNotFoundError()]):
+            self.assertTrue(drvl.is_dir(test_dir))
+        with mock.patch("os.stat", side_effect=FileNotFoundError()):
+            self.assertFalse(flvl.is_file(test_file_inside))
+            self.assertFalse(drvl.is_dir(test_dir))
+        # Test path objects are accepted
+        self.assertTrue(flvl.is_file(pathlib.Path(test_file_inside)))
+        self.assertFalse(flvl.is_file(pathlib.Path(test_new_file_inside)))
+        with os.scandir(test_dir) as entries:
+            entry = next(entry for entry in entries if entry.path == test_file_inside)
+            self.assertTrue(flvl.is_file(entry))
 
     def test_is_empty(self):
         """
@@ -141,6 +159,137 @@ class TestFileCase(TestCase):
         self.assertFalse(flvl.is_readonly(test_file_inside))
         self.assertTrue(flvl.is_readonly(test_file_inside_readonly))
 
+    def test_is_json(self):
+        """
+        Method to test is_json function
+
+        *Examples:*
+
+        >>> is_json('C:\\Users\\User\\Desktop\\file.json') # returns true if the file is a json file
+        """
+        path = os.path.join(test_dir, "test_file_inside.json")
+        flpr.create(path)
+        flpr.write(path, '{"foo": [' + ", ".join(["1"] * 50000) + ']}')
+        self.assertTrue(flvl.is_json(path))
+        self.assertTrue(flvl.is_json(path, full=True))
+        flpr.write(path, '{"foo": [' + ", ".join(["1"] * 50000) + ', ]}')
+        self.assertTrue(flvl.is_json(path))
+        self.assertFalse(flvl.is_json(path, full=True))
+        flpr.write(path, '{nope}')
+        self.assertFalse(flvl.is_json(path))
+        self.assertFalse(flvl.is_json(test_file_inside))
+
+    def test_is_csv(self):
+        """
+        Method to test is_csv function
+
+        *Examples:*
+
+        >>> is_csv('C:\\Users\\User\\Desktop\\file.csv') # returns true if the file is a csv file
+        """
+        path = os.path.join(test_dir, "test_file_inside.csv")
+        flpr.create(path)
+        flpr.write(path, "foo,bar\n" + "1,2\n" * 50000)
+        self.assertTrue(flvl.is_csv(path))
+        self.assertTrue(flvl.is_csv(path, full=True))
+        flpr.write(path, "foo,bar\n" + "1,2\n" * 25000 + "1,2,3\n" + "1,2\n" * 25000)
+        self.assertTrue(flvl.is_csv(path))
+        self.assertFalse(flvl.is_csv(path, full=True))
+        flpr.write(path, ",")
+        self.assertFalse(flvl.is_csv(path))
+        self.assertFalse(flvl.is_csv(test_file_inside))
+
+    def test_is_json_csv_sniff(self):
+        """
+        Method to test is_json and is_csv only read the head and tail of large files, unless full
+
+        *Examples:*
+
+        >>> is_json('C:\\Users\\User\\Desktop\\file.json') # returns true if the head and tail look like json
+        >>> is_json('C:\\Users\\User\\Desktop\\file.json', full=True) # returns false if the file is not valid json
+        """
+        # A large invalid file passes the sniff mode and fails with full
+        path = os.path.join(test_dir, "test_file_inside.json")
+        flpr.create(path)
+        flpr.write(path, '{"a": "' + "x" * (2 * flvl.SNIFF_SIZE) + '", "b":}')
+        self.assertTrue(flvl.is_json(path))
+        self.assertFalse(flvl.is_json(path, full=True))
+        path = os.path.join(test_dir, "test_file_inside.csv")
+        flpr.create(path)
+        flpr.write(path, "foo,bar\n" + "1,2\n" * flvl.SNIFF_SIZE + "1\n" + "1,2\n" * flvl.SNIFF_SIZE)
+        self.assertTrue(flvl.is_csv(path))
+        self.assertFalse(flvl.is_csv(path, full=True))
+        # A large single line file is not cut at the end of its head
+        flpr.write(path, ",".join(["11"] * flvl.SNIFF_SIZE))
+        self.assertTrue(flvl.is_csv(path))
+        # The same json in a small file is parsed whole
+        path = os.path.join(test_dir, "test_file_inside.json")
+        flpr.write(path, '{"a": "x", "b":}')
+        self.assertFalse(flvl.is_json(path))
+
+    def test_is_xml(self):
+        """
+        Method to test is_xml function
+
+        *Examples:*
+
+        >>> is_xml('C:\\Users\\User\\Desktop\\file.xml') # returns true if the file is a xml file
+        """
+        path = os.path.join(test_dir, "test_file_inside.xml")
+        flpr.create(path)
+        flpr.write(path, "<foo>" + "<bar>1</bar>" * 20000 + "</foo>")
+        self.assertTrue(flvl.is_xml(path))
+        self.assertTrue(flvl.is_xml(path, full=True))
+        flpr.write(path, "<foo>" + "<bar>1</bar>" * 20000 + "</bar>")
+        self.assertTrue(flvl.is_xml(path))
+        self.assertFalse(flvl.is_xml(path, full=True))
+        flpr.write(path, "foo")
+        self.assertFalse(flvl.is_xml(path))
+        self.assertFalse(flvl.is_xml(test_file_inside))
+
+    def test_stat_cache(self):
+        """
+        Method to test stat_cache function
+
+        *Examples:*
+
+        >>> with stat_cache() as cache: # caches the stat calls of the file functions inside the block
+        """
+        with cache.stat_cache() as stat_cache:
+            self.assertTrue(flvl.is_file(test_file_inside))
+            self.assertFalse(flvl.is_empty(test_file_inside))
+            self.assertEqual(flin.get_size(test_file_inside), 4)
+            self.assertEqual(stat_cache.misses, 1)
+            self.assertEqual(stat_cache.saved, 4)
+            # Test the process functions invalidate the cache
+            self.assertTrue(flpr.empty(test_file_inside))
+            self.assertTrue(flvl.is_empty(test_file_inside))
+            self.assertTrue(flpr.delete(test_file_inside))
+            self.assertFalse(flvl.exists(test_file_inside))
+            self.assertTrue(flpr.create(test_file_inside))
+            self.assertTrue(flvl.is_file(test_file_inside))
+        self.assertIsNone(cache.get_active())
+
+        # Test the results expire after the ttl
+        with cache.stat_cache(ttl=0) as stat_cache:
+            flvl.is_file(test_file_inside)
+            flvl.is_file(test_file_inside)
+            self.assertEqual(stat_cache.saved, 0)
+
+        # Test the spellings of a path share their results, and are invalidated together
+        spellings = (test_file_inside, os.path.join(test_dir, ".", "test_file_inside.txt"),
+                     test_dir + os.sep + os.sep + "test_file_inside.txt",
+                     os.path.relpath(test_file_inside))
+        with cache.stat_cache() as stat_cache:
+            for spelling in spellings:
+                self.assertIsNotNone(cache.stat(spelling))
+            self.assertEqual(stat_cache.misses, 1)
+            os.remove(test_file_inside)
+            cache.invalidate(spellings[1])
+            for spelling in spellings:
+                self.assertIsNone(cache.stat(spelling))
+            self.assertEqual(stat_cache.misses, 2)
+
     # def test_is_readable(self):
         """
         Method to test if the given file path points to a readable file
@@ -294,7 +443,22 @@ class TestFileCase(TestCase):
         """
         self.assertEqual(flin.get_group(test_file_inside), os.getlogin())
 
-    # def test_get_encoding(self):
+    def test_get_encoding(self):
+        """
+        Method to test get_encoding function
+
+        *Examples:*
+
+        >>> get_encoding('C:\\Users\\User\\Desktop\\file.txt') # returns the encoding of the file
+        """
+        self.assertEqual(flin.get_encoding(test_file_inside), "ascii")
+        with open(test_file_inside, "wb") as file:
+            file.write("tést".encode("utf-16"))
+        self.assertEqual(flin.get_encoding(test_file_inside), "UTF-16")
+        with open(test_file_inside, "wb") as file:
+            file.write(("tést " * 1000).encode("utf-8"))
+        self.assertEqual(flin.get_encoding(test_file_inside).lower(), "utf-8")
+        self.assertIsNone(flin.get_encoding(test_new_file_inside))
 
     # Processing functions
 
@@ -341,6 +505,50 @@ class TestFileCase(TestCase):
         """
         self.assertEqual(flpr.read(test_file_inside), "test")
 
+    def test_read_lines(self):
+        """
+        Method to test read_lines function
+
+        *Examples:*
+
+        >>> list(read_lines('C:\\Users\\User\\Desktop\\file.txt')) # returns the lines of the file
+        """
+        flpr.write(test_file_inside, "test\ntest2\n")
+        self.assertEqual(list(flpr.read_lines(test_file_inside)), ["test\n", "test2\n"])
+        self.assertEqual(list(flpr.read_lines(test_file_inside, binary=True)), [b"test\n", b"test2\n"])
+        self.assertEqual(list(flpr.read_lines(test_new_file_inside)), [])
+
+    def test_read_chunks(self):
+        """
+        Method to test read_chunks function
+
+        *Examples:*
+
+        >>> list(read_chunks('C:\\Users\\User\\Desktop\\file.txt', 3)) # returns the content of the file in chunks of 3 characters
+        """
+        flpr.write(test_file_inside, "tést2")
+        self.assertEqual(list(flpr.read_chunks(test_file_inside, 3)), ["tés", "t2"])
+        self.assertEqual(list(flpr.read_chunks(test_file_inside, 3, binary=True)), [b"t\xc3\xa9", b"st2"])
+        self.assertEqual(list(flpr.read_chunks(test_new_file_inside, 3)), [])
+        self.assertRaises(ValueError, list, flpr.read_chunks(test_file_inside, 0))
+
+    def test_read_mmap(self):
+        """
+        Method to test read_mmap function
+
+        *Examples:*
+
+        >>> with read_mmap('C:\\Users\\User\\Desktop\\file.txt') as content: # gives the content of the file as bytes
+        """
+        with flpr.read_mmap(test_file_inside) as content:
+            self.assertEqual(content[:], b"test")
+            self.assertEqual(content.find(b"st"), 2)
+        flpr.empty(test_file_inside)
+        with flpr.read_mmap(test_file_inside) as content:
+            self.assertEqual(content, b"")
+        with flpr.read_mmap(test_new_file_inside) as content:
+            self.assertIsNone(content)
+
     def test_write(self):
         """
         Method to test write function
@@ -353,6 +561,108 @@ class TestFileCase(TestCase):
         flpr.write(test_file_inside, "test2")
         self.assertEqual(flpr.read(test_file_inside), "test2")
 
+        # Test atomic writes and durability levels, no temporary file is left
+        for durability in flpr.DURABILITY_LEVELS:
+            self.assertTrue(flpr.write(test_file_inside, "test3", durability=durability))
+            self.assertTrue(flpr.write(test_file_inside, "test4", atomic=True, durability=durability))
+            self.assertEqual(flpr.read(test_file_inside), "test4")
+        self.assertEqual(len(os.listdir(test_dir)), 3)
+        self.assertFalse(flpr.write(test_new_file_inside, "test", atomic=True))
+        self.assertRaises(ValueError, flpr.write, test_file_inside, "test", durability="foo")
+
+    def test_write_symlink(self):
+        """
+        Method to test write function through a symlink, atomic or not
+
+        *Examples:*
+
+        >>> write('C:\\Users\\User\\Desktop\\link.txt', 'test', atomic=True) # writes the target of the link
+        """
+        link = os.path.join(test_dir, "test_link.txt")
+        try:
+            os.symlink(test_file_inside, link)
+        except (OSError, NotImplementedError):
+            self.skipTest("symlinks are not available")
+        # Test the atomic write replaces the target, and the link stays a link
+        for atomic in (False, True):
+            self.assertTrue(flpr.write(link, "test" + str(atomic), atomic=atomic))
+            self.assertTrue(os.path.islink(link))
+            self.assertEqual(flpr.read(test_file_inside), "test" + str(atomic))
+        self.assertTrue(flpr.append(link, "2", atomic=True))
+        self.assertTrue(os.path.islink(link))
+        self.assertEqual(flpr.read(test_file_inside), "testTrue2")
+        os.remove(link)
+
+    def test_append(self):
+        """
+        Method to test append function
+
+        *Examples:*
+
+        >>> append('C:\\Users\\User\\Desktop\\file.txt', 'test') # returns True if the content was appended successfully
+        """
+        self.assertTrue(flpr.append(test_file_inside, "2"))
+        self.assertTrue(flpr.append(test_file_inside, "3", atomic=True))
+        self.assertTrue(flpr.append(test_file_inside, "4", atomic=True, durability="full"))
+        self.assertEqual(flpr.read(test_file_inside), "test234")
+        self.assertEqual(len(os.listdir(test_dir)), 3)
+
+    def test_appender(self):
+        """
+        Method to test Appender class
+
+        *Examples:*
+
+        >>> with Appender('C:\\Users\\User\\Desktop\\file.txt') as appender: # appends the content written to the file
+        """
+        with flpr.Appender(test_file_inside, buffer_size=8) as appender:
+            appender.write("2")
+            self.assertEqual(flpr.read(test_file_inside), "test")
+            appender.write("3\n4\n5678")
+            self.assertEqual(flpr.read(test_file_inside), "test23\n4\n5678")
+            appender.write("9")
+            appender.flush()
+            self.assertEqual(flpr.read(test_file_inside), "test23\n4\n56789")
+            appender.write("0")
+        self.assertEqual(flpr.read(test_file_inside), "test23\n4\n567890")
+        self.assertRaises(ValueError, appender.write, "1")
+
+        # Test the background flush
+        with flpr.Appender(test_file_inside, flush_interval=0.01) as appender:
+            appender.write("1")
+            time.sleep(0.5)
+            self.assertEqual(flpr.read(test_file_inside), "test23\n4\n5678901")
+
+        # Test a failed write keeps the buffer, to write it on the next flush
+        write, failures = os.write, [OSError("disk full")]
+        def failing_write(fd, data):
+            if failures:
+                raise failures.pop()
+            return write(fd, data)
+        with mock.patch("os.write", side_effect=failing_write):
+            appender = flpr.Appender(test_file_inside).open()
+            appender.write("2")
+            self.assertRaises(OSError, appender.flush)
+            appender.write("3")
+            appender.close()
+        self.assertEqual(flpr.read(test_file_inside), "test23\n4\n567890123")
+
+        # Test a failed background flush is raised on close, after writing the buffer
+        failures.append(OSError("disk full"))
+        with mock.patch("os.write", side_effect=failing_write):
+            appender = flpr.Appender(test_file_inside, flush_interval=0.01).open()
+            appender.write("4")
+            for _ in range(500):
+                if not failures:
+                    break
+                time.sleep(0.01)
+            appender.write("5")
+            self.assertRaises(OSError, appender.close)
+        self.assertEqual(flpr.read(test_file_inside), "test23\n4\n56789012345")
+
+        # Test the file is checked when opened
+        self.assertRaises(FileNotFoundError, flpr.Appender(test_new_file_inside).open)
+
     def test_rename(self):
         """
         Method to test rename function
@@ -376,6 +686,32 @@ class TestFileCase(TestCase):
         """
         new_file_path = flpr.copy(test_file_inside, os.path.join(test_dir, "test_file_inside2.txt"))
         self.assertEqual(new_file_path, os.path.join(test_dir, "test_file_inside2.txt"))
+        # Test copy into a directory, with the same name, duplicated if it exists there
+        copy_dir = os.path.join(test_dir, "test_copy_dir")
+        os.mkdir(copy_dir)
+        self.assertEqual(flpr.copy(test_file_inside, copy_dir), os.path.join(copy_dir, "test_file_inside.txt"))
+        self.assertEqual(flpr.read(os.path.join(copy_dir, "test_file_inside.txt")), "test")
+        self.assertEqual(flpr.copy(test_file_inside, copy_dir), os.path.join(copy_dir, "test_file_inside (1).txt"))
+
+    def test_copy_content(self):
+        """
+        Method to test copy_content function
+
+        *Examples:*
+
+        >>> copy_content('C:\\Users\\User\\Desktop\\file.txt', 'C:\\Users\\User\\Desktop\\file2.txt') # returns the number of bytes copied
+        """
+        self.assertEqual(flpr.copy_content(test_file_inside, test_new_file_inside), 4)
+        self.assertEqual(flpr.read(test_new_file_inside), "test")
+        content = os.urandom(3 * flpr.COPY_BLOCK_SIZE // 2)
+        with open(test_file_inside, "wb") as file:
+            file.write(content)
+        self.assertEqual(flpr.copy_content(test_file_inside, test_new_file_inside, reflink=False), len(content))
+        with open(test_new_file_inside, "rb") as file:
+            self.assertEqual(file.read(), content)
+        flpr.empty(test_file_inside)
+        self.assertEqual(flpr.copy_content(test_file_inside, test_new_file_inside), 0)
+        self.assertTrue(flvl.is_empty(test_new_file_inside))
 
     def test_duplicate(self):
         """
@@ -391,6 +727,25 @@ class TestFileCase(TestCase):
         new_file_path = flpr.duplicate(test_file_inside)
         self.assertEqual(new_file_path, os.path.join(test_dir, "test_file_inside (2).txt"))
 
+    def test_get_duplicated_path(self):
+        """
+        Method to test get_duplicated_path function
+
+        *Examples:*
+
+        >>> get_duplicated_path('C:\\Users\\User\\Desktop\\file.txt') # returns 'C:\\Users\\User\\Desktop\\file (1).txt'
+        """
+        self.assertEqual(flpr.get_duplicated_path(test_file_inside), os.path.join(test_dir, "test_file_inside (1).txt"))
+        # Test the first free number is used
+        flpr.create(os.path.join(test_dir, "test_file_inside (1).txt"))
+        flpr.create(os.path.join(test_dir, "test_file_inside (3).txt"))
+        self.assertEqual(flpr.get_duplicated_path(test_file_inside), os.path.join(test_dir, "test_file_inside (2).txt"))
+        # Test the new path is reserved
+        new_file_path = flpr.get_duplicated_path(test_file_inside, reserve=True)
+        self.assertEqual(new_file_path, os.path.join(test_dir, "test_file_inside (2).txt"))
+        self.assertTrue(flvl.is_empty(new_file_path))
+        self.assertEqual(flpr.get_duplicated_path(test_file_inside), os.path.join(test_dir, "test_file_inside (4).txt"))
+
     # def test_move(self):
 
     def test_set_hidden(self):
@@ -6,11 +6,14 @@ This file contains functions for testing the utility functions at utils\string\
 import os
 import sys
 import shutil
+import re
 from unittest import TestCase
 import src.utils.string.validate as stvl
 import src.utils.string.info as stin
 import src.utils.string.process as stpr
 import src.utils.datetime.validate as dtvl
+import src.utils._regex as rgx
+from src.utils.errors import InvalidInputError
 
 class TestStringCase(TestCase):
     """
@@ -260,6 +263,11 @@ class TestStringCase(TestCase):
         self.assertFalse(stvl.is_path("file.txt"))
         self.assertFalse(stvl.is_path("file"))
         self.assertFalse(stvl.is_path("123"))
+        self.assertFalse(stvl.is_path("   "))
+        self.assertFalse(stvl.is_path(None))
+        # Test cached results are the same
+        self.assertTrue(stvl.is_path("/Documents/file.txt"))
+        self.assertFalse(stvl.is_path("file.txt"))
 
     def test_is_filename(self):
         """
@@ -497,6 +505,35 @@ class TestStringCase(TestCase):
         self.assertTrue(stvl.is_xml('<foo>bar</foo><bar attr="asdf">foo</bar>'))
         self.assertTrue(stvl.is_xml('<foo>bar</bar>'))
 
+    # Batch validations
+
+    def test_validate_many(self):
+        """
+        Test method to check many strings at once
+
+        *Examples:*
+
+        >>> validate_many('email', ['example@example.com', 'example']) # returns bytearray(b'\\x01\\x00')
+        >>> validate_many('is_ip', ['192.168.15.1', '']) # returns bytearray(b'\\x01\\x00')
+        """
+        self.assertEqual(stvl.validate_many('email', ['example@example.com', 'example']), bytearray(b'\x01\x00'))
+        self.assertEqual(stvl.validate_many('is_ip', ['192.168.15.1', '']), bytearray(b'\x01\x00'))
+
+        # Test results are identical to the scalar functions
+        samples = ["example@example.com", "http://www.google.com", "192.168.15.1", "www.google.com",
+                   "C:/Users/file.txt", "file.txt", "42", "19,99", "true", "", " ", None, '{"foo": "bar"}']
+        for kind in ('email', 'url', 'ip', 'hostname', 'domain', 'path', 'filename', 'bool', 'json'):
+            expected = bytearray(bool(getattr(stvl, 'is_' + kind)(s)) for s in samples)
+            self.assertEqual(stvl.validate_many(kind, samples), expected)
+            self.assertEqual(stvl.validate_many(kind, samples, workers=2, chunk_size=4), expected)
+
+        # Test a stream with more chunks than the ones sent ahead keeps the order
+        expected = bytearray(bool(stvl.is_email(s)) for s in samples) * 10
+        self.assertEqual(stvl.validate_many('email', (s for s in samples * 10), workers=2, chunk_size=3), expected)
+
+        # Test unknown validation
+        self.assertRaises(ValueError, stvl.validate_many, 'foo', samples)
+
     # Information about a string
 
     def test_get_length(self):
@@ -604,11 +641,18 @@ class TestStringCase(TestCase):
         >>> remove_accents('AéBíd') # returns 'AeBid'
         >>> remove_accents('AéBíd 你好') # returns 'AeBid 你好'
         >>> remove_accents('AéBíd 你好 123') # returns 'AeBid 你好 123'
+        >>> remove_accents('Ŝtȩp ﬁve', unicode=True) # returns 'Step five'
         """
         self.assertEqual(stpr.remove_accents("AéBíd"), "AeBid")
         self.assertEqual(stpr.remove_accents("AéBíd 你好"), "AeBid 你好")
         self.assertEqual(stpr.remove_accents("AéBíd 你好 123"), "AeBid 你好 123")
 
+        # Test any unicode char
+        self.assertEqual(stpr.remove_accents("Ŝtȩp ﬁve", unicode=True), "Step five")
+        self.assertEqual(stpr.remove_accents("Crème brûlée ß", unicode=True), "Creme brulee s")
+        self.assertEqual(stpr.remove_accents("e\u0301 你好 x²", unicode=True), "e 你好 x2")
+        self.assertEqual(stpr.remove_accents("Ŝtȩp"), "Ŝtȩp")
+
     def test_capitalize(self):
         """
         Test method to capitalize a string
@@ -697,3 +741,98 @@ class TestStringCase(TestCase):
         self.assertEqual(stpr.remove_non_printable("foo bar 123"), "foo bar 123")
         self.assertEqual(stpr.remove_non_printable("foo bar 123 \x0C"), "foo bar 123 ")
         self.assertEqual(stpr.remove_non_printable("foo bar 123 \x0B"), "foo bar 123 ")
+
+    def test_normalize(self):
+        """
+        Test method to apply several manipulations to a string at once
+
+        *Examples:*
+
+        >>> normalize('fóo\\x0C bár') # returns 'foobar'
+        >>> normalize('fóo\\x0C bár', ['remove_non_printable', 'remove_accents', 'capitalize_words']) # returns 'Foo Bar'
+        >>> list(normalize_many(['fóo', ' bár '])) # returns ['foo', 'bar']
+        """
+        self.assertEqual(stpr.normalize("fóo\x0C bár"), "foobar")
+        self.assertEqual(stpr.normalize("fóo\x0C bár", ["remove_non_printable", "remove_accents", "capitalize_words"]),
+                         "Foo Bar")
+        self.assertEqual(list(stpr.normalize_many(["fóo", " bár "])), ["foo", "bar"])
+
+        # Test the result is the same as calling the functions one after another
+        text = "  fóo\x0C bár 你好\u3000ŝ 123\x85 "
+        steps = ["remove_accents", "remove_non_printable", "capitalize_words", "remove_whitespace", "remove_non_ascii"]
+        expected = text
+        for step in steps:
+            expected = getattr(stpr, step)(expected)
+        self.assertEqual(stpr.normalize(text, steps), expected)
+        self.assertEqual(list(stpr.normalize_many([text, text], steps)), [expected, expected])
+
+        # Test unknown step
+        self.assertRaises(ValueError, stpr.normalize, text, ["foo"])
+
+        # Test each string is checked, as in normalize
+        self.assertRaises(InvalidInputError, stpr.normalize, b"foo")
+        self.assertRaises(InvalidInputError, list, stpr.normalize_many(["foo", b"bar"]))
+        self.assertRaises(InvalidInputError, list, stpr.normalize_many(["foo", None], ["remove_accents"]))
+
+    def test_prettify(self):
+        """
+        Test method to reformat a string with basic grammar and formatting rules
+
+        *Examples:*
+
+        >>> prettify(' unprettified string ,, like this one,will be"prettified" .it\\' s awesome! ')
+        >>> # -> 'Unprettified string, like this one, will be "prettified". It\\'s awesome!'
+        >>> prettify('100 % sure(or not )really') # returns '100% sure (or not) really'
+        >>> prettify('visit http://www.foo.com/a?b=1,or write to me@mail.com ,thanks')
+        >>> # -> 'Visit http://www.foo.com/a?b=1,or write to me@mail.com, thanks'
+        """
+        self.assertEqual(stpr.prettify(' unprettified string ,, like this one,will be"prettified" .it\' s awesome! '),
+                         'Unprettified string, like this one, will be "prettified". It\'s awesome!')
+        self.assertEqual(stpr.prettify('100 % sure(or not )really'), '100% sure (or not) really')
+        self.assertEqual(stpr.prettify('foo  bar ((baz))'), 'Foo bar (baz)')
+        self.assertEqual(stpr.prettify('2+2=4 ; ok ?yes'), '2 + 2 = 4; ok? Yes')
+        self.assertEqual(stpr.prettify(''), '')
+
+        # Test urls and emails are not changed
+        self.assertEqual(stpr.prettify('visit http://www.foo.com/a?b=1,or write to me@mail.com ,thanks'),
+                         'Visit http://www.foo.com/a?b=1,or write to me@mail.com, thanks')
+        self.assertEqual(stpr.prettify('http://www.foo.com http://www.foo.com .ok'),
+                         'http://www.foo.com http://www.foo.com. Ok')
+
+    def test_prettify_stream(self):
+        """
+        Test method to reformat a text received in chunks, paragraph by paragraph
+
+        *Examples:*
+
+        >>> list(prettify_stream(['foo ,bar.\\n', '\\nbaz  !'])) # returns ['Foo, bar.', 'Baz!']
+        """
+        self.assertEqual(list(stpr.prettify_stream(['foo ,bar.\n', '\nbaz  !'])), ['Foo, bar.', 'Baz!'])
+        self.assertEqual(list(stpr.prettify_stream(['foo ,bar.\n \r\n\n', 'baz  !\n\n\n'])), ['Foo, bar.', 'Baz!'])
+        self.assertEqual(list(stpr.prettify_stream(['foo', ' bar'])), ['Foo bar'])
+        self.assertEqual(list(stpr.prettify_stream([])), [])
+        # many small chunks (eg: the lines of a file) in one long paragraph
+        lines = ['foo ,bar  baz.\n'] * 20000
+        self.assertEqual(list(stpr.prettify_stream(lines)), [stpr.prettify(''.join(lines))])
+        self.assertEqual(list(stpr.prettify_stream(lines + ['\n'] + lines)), [stpr.prettify(''.join(lines))] * 2)
+        self.assertEqual(list(stpr.prettify_stream(['foo\n', ' ', ' \n', 'bar'])), ['Foo', 'Bar'])
+
+    # Internal regex
+
+    def test_lazy_regex(self):
+        """
+        Test method to check that patterns are compiled on first use
+
+        *Examples:*
+
+        >>> _compile(r'^foo$').match('foo') # compiles the pattern and returns the match
+        """
+        pattern = rgx._compile(r'^foo$', re.IGNORECASE)
+        # the pattern is registered with the module ones, remove it after the test
+        self.addCleanup(rgx._PATTERNS.remove, pattern)
+        self.assertIsNone(pattern._compiled)
+        self.assertIsNotNone(pattern.match("FOO"))
+        self.assertIsNotNone(pattern._compiled)
+        self.assertIsNone(pattern.search("bar"))
+        self.assertEqual(pattern.pattern, r'^foo$')
+        self.assertIs(pattern.compile(), pattern.compile())